@@ -1,19 +1,34 @@
+import asyncio
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from datetime import datetime
 import sqlite3
 from config import THEME, BUTTON_COLORS
-from components import BaseModal  # Add this import
+from components import BackgroundTaskRunner, BaseModal, LoadingIndicator, VirtualTreeview
 
 class AdminDashboard:
-    def __init__(self, master, db_manager, logout_callback):
+    PAGE_SIZE = 200  # rows fetched per table page
+
+    def __init__(self, master, db_manager, logout_callback, async_bridge):
+        """
+        Args:
+            async_bridge: TkAsyncBridge every table page, analysis and
+                re-score runs through; nothing is read on the Tk thread
+        """
         self.master = master
         self.db_manager = db_manager
         self.logout_callback = logout_callback
+        self.task_runner = BackgroundTaskRunner(async_bridge)
         self.current_tab = "trainers"
         self.selected_record_id = None
 
+        # Keyset cursors of the visible table's pages, as far as they are
+        # known: page -> cursor, filled in as pages load
+        self._page_token = 0
+        self._page_cursors = {0: None}
+        self._failure_reported = None  # token of the load whose error was shown
+
         # Create main container with light theme
         self.main_container = ctk.CTkFrame(master, fg_color="#f5f5f5")  # Light gray background
         self.main_container.pack(expand=True, fill="both")
@@ -65,6 +80,21 @@ class AdminDashboard:
         )
         logout_button.pack(side="bottom", pady=20)
 
+        # Query statistics, only when instrumentation is switched on
+        if self.db_manager.get_query_stats() is not None:
+            stats_button = ctk.CTkButton(
+                self.sidebar,
+                text="Query Stats",
+                command=self.open_query_stats_modal,
+                width=180,
+                height=40,
+                corner_radius=0,
+                fg_color="transparent",
+                text_color="white",
+                hover_color=("gray70", "gray30")
+            )
+            stats_button.pack(side="bottom", pady=5)
+
         # Main content area
         self.content_frame = ctk.CTkFrame(
             self.main_container,
@@ -139,6 +169,7 @@ class AdminDashboard:
                 ("Add Exam", lambda: self.open_exam_details_modal("add")),
                 ("Edit Details", lambda: self.open_exam_details_modal("update")),
                 ("Manage Questions", self.open_questions_modal),
+                ("Item Analysis", self.open_item_analysis_modal),
                 ("Delete", self.delete_record)
             ]
         else:
@@ -214,13 +245,19 @@ class AdminDashboard:
             width=12                  # Slightly wider scrollbar
         )
 
+        # Only the rows in view exist as Treeview items; pages load as it scrolls
         columns = self.get_columns(tab_type)
-        table = ttk.Treeview(
+        view = VirtualTreeview(
             table_frame,
-            columns=columns,
-            show='headings',
-            style="Custom.Treeview"
+            columns,
+            self._load_table_page,
+            block_size=self.PAGE_SIZE,
+            row_height=30,
+            style="Custom.Treeview",
+            scrollbar_style="Custom.Vertical.TScrollbar"
         )
+        view.pack(expand=True, fill="both")
+        table = view.tree
 
         # Configure columns
         for col in columns:
@@ -234,28 +271,9 @@ class AdminDashboard:
             corner_radius=6
         )
 
-        # Add scrollbars
-        y_scrollbar = ttk.Scrollbar(
-            table_frame,
-            orient=tk.VERTICAL,
-            command=table.yview,
-            style="Custom.Vertical.TScrollbar"
-        )
-        x_scrollbar = ttk.Scrollbar(
-            table_frame,
-            orient=tk.HORIZONTAL,
-            command=table.xview,
-            style="Custom.Vertical.TScrollbar"
-        )
-        table.configure(yscroll=y_scrollbar.set, xscroll=x_scrollbar.set)
-
-        # Pack table and scrollbars
-        table.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
-        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-
         table.bind('<Double-1>', self.on_table_select)
         setattr(self, f"{tab_type}_table", table)
+        setattr(self, f"{tab_type}_view", view)
 
     def on_table_select(self, event):
         table = getattr(self, f"{self.current_tab}_table")
@@ -271,16 +289,131 @@ class AdminDashboard:
             self.open_exam_details_modal(mode="update")
 
     def refresh_table(self):
-        table = getattr(self, f"{self.current_tab}_table")
-        table.delete(*table.get_children())
-        records = self.db_manager.get_all_records(self.current_tab)
+        """Reload the current table: its row count, then the rows in view"""
+        tab = self.current_tab
+        # A new token makes pages still in flight for the old view be dropped
+        self._page_token += 1
+        token = self._page_token
+        # Query off the Tk thread so the window keeps repainting
+        self.task_runner.run(
+            lambda task: self.db_manager.count_records(tab),
+            on_done=lambda total: self._show_table(tab, token, total),
+            on_error=lambda e: self._page_failed(tab, e)
+        )
 
-        # Ensure column order matches the database schema
-        column_order = self.get_columns(self.current_tab)
-        for record in records:
-            # Reorder record fields to match column order
-            reordered_record = [record[column_order.index(col)] for col in column_order]
-            table.insert('', 'end', values=reordered_record)
+    def _show_table(self, tab, token, total):
+        view = self._current_view(tab, token)
+        if view is None:
+            return
+        self._page_cursors = {0: None}
+        view.reset(total)
+
+    def refresh_record(self, record_id, change):
+        """Update the current table for one record instead of reloading it
+
+        Only that record is read back (or, for a deletion, the page cursors
+        after it are moved on); the scroll position and selection are kept.
+
+        Args:
+            record_id: The record that changed
+            change: 'added', 'edited' or 'deleted'
+        """
+        tab, token = self.current_tab, self._page_token
+        if change == 'deleted':
+            # Cursors at or past the deleted row now point one row short
+            stale = [page for page, cursor in self._page_cursors.items()
+                     if cursor is not None and cursor[1] >= record_id]
+            ids = [self._page_cursors[index][1] for index in stale]
+            self.task_runner.run(
+                lambda task: self.db_manager.get_following_ids(tab, ids),
+                on_done=lambda following: self._remove_record(tab, token, record_id, stale, following),
+                on_error=lambda e: self._page_failed(tab, e)
+            )
+        else:
+            self.task_runner.run(
+                lambda task: self.db_manager.get_record_by_id(tab, record_id),
+                on_done=lambda record: self._apply_record(tab, token, record, change),
+                on_error=lambda e: self._page_failed(tab, e)
+            )
+
+    def _current_view(self, tab, token):
+        # None if the user switched tabs or refreshed since the call started
+        view = getattr(self, f"{tab}_view", None)
+        if token != self._page_token or tab != self.current_tab or view is None or not view.winfo_exists():
+            return None
+        return view
+
+    def _apply_record(self, tab, token, record, change):
+        view = self._current_view(tab, token)
+        if view is None or record is None:
+            return
+        row = self._table_rows(tab, [record])[0]
+        if change == 'added':
+            # New ids are the highest, so the row goes last
+            view.append_row(row)
+        else:
+            view.replace_row(row)
+
+    def _remove_record(self, tab, token, record_id, stale, following):
+        view = self._current_view(tab, token)
+        if view is None:
+            return
+        # A new dict, so pages loaded before the deletion keep their
+        # now-stale cursors to themselves
+        self._page_cursors = dict(self._page_cursors)
+        for page, next_id in zip(stale, following):
+            if next_id is None:
+                # The page now starts past the last row
+                del self._page_cursors[page]
+            else:
+                self._page_cursors[page] = (next_id, next_id)
+        if not view.remove_row(record_id):
+            self.refresh_table()
+
+    def _load_table_page(self, page, done):
+        """VirtualTreeview loader: fetch one page of the current table
+
+        A page scrolled to in order starts at the cursor its predecessor
+        returned; one jumped to is found by seeking from the nearest known
+        cursor before it.
+        """
+        tab, token, cursors = self.current_tab, self._page_token, self._page_cursors
+        known = max(known for known in cursors if known <= page)
+        start, skip = cursors[known], (page - known) * self.PAGE_SIZE
+
+        def load(task):
+            after = start
+            if skip:
+                after = self.db_manager.get_page_cursor(tab, start, skip)
+                if after is None:
+                    return None, [], None  # The table shrank
+            return (after, *self.db_manager.get_records_page(tab, after, self.PAGE_SIZE))
+
+        def loaded(result):
+            after, records, next_cursor = result
+            if cursors is self._page_cursors:
+                if skip and after is not None:
+                    cursors[page] = after
+                if next_cursor is not None:
+                    cursors.setdefault(page + 1, next_cursor)
+            done(self._table_rows(tab, records))
+
+        def failed(error):
+            done(None)
+            # Every page of a broken load fails alike; say so once
+            if self._failure_reported != token:
+                self._failure_reported = token
+                self._page_failed(tab, error)
+
+        self.task_runner.run(load, on_done=loaded, on_error=failed)
+
+    def _table_rows(self, tab, records):
+        # Pick record fields in the table's column order
+        column_order = self.get_columns(tab)
+        return [[getattr(record, col) for col in column_order] for record in records]
+
+    def _page_failed(self, tab, error):
+        messagebox.showerror("Error", f"Failed to load {tab}: {error}")
 
     def open_exam_details_modal(self, mode="add"):
         modal = BaseModal(
@@ -395,12 +528,38 @@ class AdminDashboard:
             )
             inactive_radio.pack(side="left")
 
+        # How the exam's questions are presented to trainees
+        delivery_var = tk.StringVar(value="scroll")
+        delivery_container = ctk.CTkFrame(form_frame, fg_color="transparent")
+        delivery_container.pack(fill="x", pady=10)
+
+        delivery_label = ctk.CTkLabel(
+            delivery_container,
+            text="Delivery Mode",
+            font=("Helvetica", 12, "bold"),
+            text_color="#333333"
+        )
+        delivery_label.pack(anchor="w", padx=5, pady=(0, 5))
+
+        delivery_frame = ctk.CTkFrame(delivery_container, fg_color="transparent")
+        delivery_frame.pack(fill="x", padx=5)
+
+        for text, value in (("All questions on one page", "scroll"),
+                            ("One question at a time", "paged")):
+            ctk.CTkRadioButton(
+                delivery_frame,
+                text=text,
+                variable=delivery_var,
+                value=value,
+                fg_color="#2d5a9e",
+                font=("Helvetica", 11)
+            ).pack(side="left", padx=(0, 20))
+
         # Populate fields if updating
         if mode == "update" and self.selected_record_id:
             record = self.db_manager.get_record_by_id('exams', self.selected_record_id)
             if record:
-                columns = ['id', 'title', 'module_no', 'num_items', 'time_limit', 'batch_id', 'created_at', 'status']
-                record_dict = dict(zip(columns, record))
+                record_dict = record._asdict()
                 
                 # Update each field with its corresponding value
                 for field_name, entry in input_fields.items():
@@ -411,6 +570,7 @@ class AdminDashboard:
                 # Set status if available
                 if 'status' in record_dict and record_dict['status']:
                     status_var.set(record_dict['status'])
+                delivery_var.set(record_dict['delivery_mode'])
 
         # Action button container
         action_container = ctk.CTkFrame(main_container, fg_color="transparent")
@@ -426,32 +586,29 @@ class AdminDashboard:
                 
                 data = {field_name: entry.get().strip() 
                        for field_name, entry in input_fields.items()}
+                data['delivery_mode'] = delivery_var.get()
                 
                 # Add status if in update mode
                 if mode == "update":
                     data['status'] = status_var.get()
                 
                 if mode == "add":
-                    self.db_manager.insert_record('exams', data)
+                    new_exam_id = self.db_manager.insert_record('exams', data)
+                    self.refresh_record(new_exam_id, 'added')
                     result_message = "Exam created successfully!"
                 else:
                     self.db_manager.update_record('exams', self.selected_record_id, data)
+                    self.refresh_record(self.selected_record_id, 'edited')
                     result_message = "Exam updated successfully!"
                 
                 modal.destroy()
-                self.refresh_table()
                 
                 messagebox.showinfo("Success", result_message)
                 
                 # If creating a new exam, offer to add questions
                 if mode == "add" and messagebox.askyesno("Add Questions", "Would you like to add questions to this exam now?"):
-                    # Get the id of the newly created exam
-                    exams = self.db_manager.get_all_records('exams')
-                    for exam in exams:
-                        if exam[1] == data['title']:  # Match by title
-                            self.selected_record_id = exam[0]
-                            self.open_questions_modal()
-                            break
+                    self.selected_record_id = new_exam_id
+                    self.open_questions_modal()
                     
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -499,7 +656,7 @@ class AdminDashboard:
 
         # Get exam details for title
         exam_details = self.db_manager.get_record_by_id('exams', self.selected_record_id)
-        exam_title = exam_details[1] if exam_details else "Unknown Exam"
+        exam_title = exam_details.title if exam_details else "Unknown Exam"
 
         modal = BaseModal(
             self.master,
@@ -524,7 +681,7 @@ class AdminDashboard:
 
         # Add exam info in the panel
         if exam_details:
-            exam_info_text = f"Module {exam_details[2]} • {exam_details[3]} Items • {exam_details[4]} Minutes"
+            exam_info_text = f"Module {exam_details.module_no} • {exam_details.num_items} Items • {exam_details.time_limit} Minutes"
 
             info_title = ctk.CTkLabel(
                 info_panel,
@@ -772,21 +929,14 @@ class AdminDashboard:
             if question_data:
                 q_text.insert("1.0", question_data['question_text'])
                 
-                # Parse correct_answer string and populate options
-                options_data = question_data['correct_answer'].split('|')
-                for option_str in options_data:
-                    if option_str.startswith('*'):
-                        letter = option_str[1]
-                        text = option_str[3:]
-                        correct_var.set(letter)
-                    else:
-                        letter = option_str[0]
-                        text = option_str[2:]
-                    
+                # Populate options from their question_options rows
+                for option in question_data['options']:
+                    if option.is_correct:
+                        correct_var.set(option.label)
                     for opt in options:
-                        if opt['letter'] == letter:
+                        if opt['letter'] == option.label:
                             opt['entry'].delete(0, tk.END)
-                            opt['entry'].insert(0, text)
+                            opt['entry'].insert(0, option.text)
                             break
                 
                 points_entry.delete(0, tk.END)
@@ -794,7 +944,7 @@ class AdminDashboard:
 
             return question_dict
 
-        def save_single_question(question_dict):
+        def save_single_question(question_dict, offer_rescore=True):
             try:
                 # Get and validate question data
                 question_text = question_dict['text'].get("1.0", "end-1c").strip()
@@ -814,30 +964,28 @@ class AdminDashboard:
                     messagebox.showerror("Error", "Points must be a valid number")
                     return
 
-                # Build the correct_answer string
-                options_data = []
+                # Collect the option texts
+                options_data = {}
                 for opt in question_dict['options']:
                     option_text = opt['entry'].get().strip()
                     if not option_text:
                         messagebox.showerror("Error", "All options must be filled")
                         return
-                    prefix = '*' if opt['letter'] == correct_letter else ''
-                    options_data.append(f"{prefix}{opt['letter']}:{option_text}")
-
-                # Prepare question data
-                question_data = {
-                    'exam_id': self.selected_record_id,
-                    'question_text': question_text,
-                    'correct_answer': '|'.join(options_data),
-                    'points': points
-                }
-
-                if question_dict['id']:  # Update existing question
-                    self.db_manager.update_record('questions', question_dict['id'], question_data)
-                else:  # Insert new question
-                    question_dict['id'] = self.db_manager.insert_record('questions', question_data)
+                    options_data[opt['letter']] = option_text
+
+                # Insert or update the question and its options together
+                question_dict['id'] = self.db_manager.save_question(
+                    self.selected_record_id,
+                    question_text,
+                    options_data,
+                    correct_letter,
+                    points,
+                    question_dict['id']
+                )
 
                 messagebox.showinfo("Success", "Question saved successfully!")
+                if offer_rescore:
+                    self.offer_rescore(self.selected_record_id)
                 
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -872,14 +1020,9 @@ class AdminDashboard:
         add_btn.configure(command=lambda: add_question())
 
         # Load existing questions
-        existing_questions = self.db_manager.get_exam_questions(self.selected_record_id)
+        existing_questions = self.db_manager.get_exam_questions_with_options(self.selected_record_id)
         for question in existing_questions:
-            add_question({
-                'id': question[0],
-                'question_text': question[1],
-                'correct_answer': question[2],
-                'points': question[3]
-            })
+            add_question(question._asdict())
 
         # If no questions, add one blank question
         if not questions_list:
@@ -917,7 +1060,9 @@ class AdminDashboard:
             try:
                 # Save each question
                 for q in questions_list:
-                    save_single_question(q)
+                    save_single_question(q, offer_rescore=False)
+                # Ask once for the whole batch of edits
+                self.offer_rescore(self.selected_record_id)
                 modal.destroy()
             except Exception as e:
                 messagebox.showerror("Error", str(e))
@@ -926,6 +1071,147 @@ class AdminDashboard:
         save_all_btn.configure(command=save_all_questions)
         cancel_btn.configure(command=modal.destroy)
 
+    def offer_rescore(self, exam_id):
+        """Offer to regrade an exam's recorded results after its key changed"""
+        attempts = self.db_manager.count_exam_results(exam_id)
+        if not attempts:
+            return
+        if not messagebox.askyesno(
+            "Re-score Results",
+            f"This exam has {attempts} recorded result(s). "
+            "Re-score them against the updated answer key?"
+        ):
+            return
+        # Regrading a large exam takes a few seconds; keep the window responsive.
+        # It runs in one transaction, so it is not offered for cancellation.
+        self.task_runner.run(
+            lambda task: self.db_manager.rescore_exam(exam_id),
+            loading=LoadingIndicator(self.content_frame, "Re-scoring results..."),
+            cancellable=False,
+            on_done=self._show_rescore_report,
+            on_error=lambda e: messagebox.showerror("Error", f"Re-scoring failed: {e}")
+        )
+
+    def _show_rescore_report(self, report):
+        messagebox.showinfo(
+            "Re-score Complete",
+            f"Results checked: {report['results_checked']}\n"
+            f"Results changed: {report['results_changed']}\n"
+            f"Answers regraded: {report['responses_changed']}\n"
+            f"Now passing: {report['now_passed']}\n"
+            f"Now failing: {report['now_failed']}"
+        )
+
+    def open_item_analysis_modal(self):
+        if not self.selected_record_id:
+            messagebox.showerror("Error", "Please select an exam first")
+            return
+
+        exam_id = self.selected_record_id
+        modal = BaseModal(self.master, "Item Analysis", "1100x650")
+
+        summary_label = ctk.CTkLabel(
+            modal.scrollable_frame,
+            text="Analyzing responses...",
+            font=THEME["fonts"]["body"],
+            text_color=THEME["colors"]["text_secondary"]
+        )
+        summary_label.pack(anchor="w", padx=10, pady=(10, 5))
+
+        table = ttk.Treeview(
+            modal.scrollable_frame,
+            show='headings',
+            style="Custom.Treeview",
+            height=14
+        )
+        table.pack(fill="both", expand=True, padx=10, pady=5)
+
+        def show(loaded):
+            analysis, questions = loaded
+            if not modal.winfo_exists():
+                return
+            # One count column per option label used by any question
+            labels = sorted({label for item in analysis.items for label in item.option_labels})
+            columns = ("no", "question", "responses", "difficulty", "discrimination",
+                       *(f"option_{label}" for label in labels), "omitted")
+            headings = ("#", "Question", "Responses", "Difficulty (p)", "Discrimination",
+                        *labels, "Omitted")
+            widths = (40, 380, 80, 100, 110, *(60 for _ in labels), 70)
+            table.configure(columns=columns)
+            for col, heading, width in zip(columns, headings, widths):
+                table.heading(col, text=heading, anchor="w")
+                table.column(col, width=width, minwidth=40, anchor="w")
+
+            texts = {q.id: q.question_text for q in questions}
+            kr20 = "n/a" if analysis.kr20 is None else f"{analysis.kr20:.3f}"
+            mean = "n/a" if analysis.mean_score is None else f"{analysis.mean_score:.2f}"
+            summary_label.configure(
+                text=f"{analysis.attempts} attempts • Mean score {mean} • KR-20 {kr20}"
+            )
+            for number, item in enumerate(analysis.items, 1):
+                counts = dict(zip(item.option_labels, item.option_counts))
+                marked = []
+                for label in labels:
+                    if label not in counts:
+                        marked.append("")  # The question has no such option
+                    elif label == item.correct_label:
+                        marked.append(f"{counts[label]}*")
+                    else:
+                        marked.append(counts[label])
+                table.insert('', 'end', values=(
+                    number,
+                    texts.get(item.question_id, ""),
+                    item.responses,
+                    "-" if item.difficulty is None else f"{item.difficulty:.2f}",
+                    "-" if item.discrimination is None else f"{item.discrimination:.2f}",
+                    *marked,
+                    item.omitted
+                ))
+
+        # A cold analysis of a large cohort reads every stored response
+        db = self.task_runner.db
+
+        async def load():
+            return await asyncio.gather(
+                db.get_item_analysis(exam_id),
+                db.get_exam_questions(exam_id)
+            )
+
+        self.task_runner.run(
+            load(),
+            on_done=show,
+            on_error=lambda e: messagebox.showerror("Error", f"Item analysis failed: {e}")
+        )
+
+        modal.create_button_group([
+            ("Close", modal.destroy, BUTTON_COLORS["secondary"])
+        ])
+
+    def open_query_stats_modal(self):
+        modal = BaseModal(self.master, "Query Statistics", "1100x600")
+
+        stats_text = ctk.CTkTextbox(
+            modal.scrollable_frame,
+            height=420,
+            font=("Courier", 11),
+            fg_color=THEME["colors"]["surface"],
+            text_color=THEME["colors"]["text"],
+            wrap="none"
+        )
+        stats_text.pack(fill="both", expand=True, padx=10, pady=10)
+
+        def refresh():
+            stats_text.configure(state="normal")
+            stats_text.delete("1.0", "end")
+            stats_text.insert("1.0", self.db_manager.format_query_stats())
+            stats_text.configure(state="disabled")
+
+        refresh()
+        modal.create_button_group([
+            ("Refresh", refresh, BUTTON_COLORS["primary"]),
+            ("Close", modal.destroy, BUTTON_COLORS["secondary"])
+        ])
+
     def open_modal(self, mode="add"):
         modal = BaseModal(
             self.master,
@@ -1006,9 +1292,9 @@ class AdminDashboard:
         if mode == "update":
             record = self.db_manager.get_record_by_id(self.current_tab, self.selected_record_id)
             if record:
-                for idx, col in enumerate(fields):
+                for col in fields:
                     if col != 'id':
-                        value = record[fields.index(col)]
+                        value = getattr(record, col)
                         if value is not None:
                             input_fields[col].delete(0, tk.END)
                             input_fields[col].insert(0, str(value))
@@ -1023,14 +1309,15 @@ class AdminDashboard:
                     raise ValueError(f"Please fill in all required fields: {', '.join(empty_fields)}")
                 
                 if mode == "add":
-                    self.db_manager.insert_record(self.current_tab, data)
+                    record_id = self.db_manager.insert_record(self.current_tab, data)
                     messagebox.showinfo("Success", "Record added successfully!")
                 else:
-                    self.db_manager.update_record(self.current_tab, self.selected_record_id, data)
+                    record_id = self.selected_record_id
+                    self.db_manager.update_record(self.current_tab, record_id, data)
                     messagebox.showinfo("Success", "Record updated successfully!")
                 
                 modal.destroy()
-                self.refresh_table()
+                self.refresh_record(record_id, 'added' if mode == "add" else 'edited')
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
@@ -1055,9 +1342,13 @@ class AdminDashboard:
             return
         confirm = messagebox.askyesno("Confirm", "Are you sure you want to delete this record?")
         if confirm:
-            self.db_manager.delete_record(self.current_tab, self.selected_record_id)
+            record_id = self.selected_record_id
+            if not self.db_manager.delete_record(self.current_tab, record_id):
+                messagebox.showerror("Error", "Failed to delete the record")
+                return
+            self.selected_record_id = None
             messagebox.showinfo("Success", "Record deleted successfully!")
-            self.refresh_table()
+            self.refresh_record(record_id, 'deleted')
 
     def get_columns(self, tab_type):
         # Ensure column names match the database schema
@@ -1065,7 +1356,7 @@ class AdminDashboard:
             "trainers": ["id", "name", "class_assigned", "contact_email", "hire_date"],
             "batches": ["id", "batch_year", "num_trainees", "training_duration", "training_location", "trainer_id"],
             "trainees": ["id", "name", "id_no", "uli", "batch_id", "batch_year", "exams_taken", "status", "remarks"],
-            "exams": ["id", "title", "module_no", "num_items", "time_limit", "batch_id", "created_at", "status"],
+            "exams": ["id", "title", "module_no", "num_items", "time_limit", "batch_id", "created_at", "status", "delivery_mode"],
             "results": ["id", "trainee_id", "exam_id", "score", "total_items", "time_spent", "date_taken", "status"]
         }
         return columns_map.get(tab_type, [])
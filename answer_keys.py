@@ -0,0 +1,136 @@
+"""Compiled answer keys for exam scoring.
+
+An exam's questions are compiled once into an AnswerKey: parallel arrays of
+question ids, correct option positions and points, plus each question's
+option labels by position. Scoring a submission is then a walk over those
+arrays instead of re-reading every question.
+
+Keys are cached per exam and tagged with the exam's key_version, which
+triggers on questions and question_options bump whenever a question of the
+exam or its correct option changes. A stale key is recompiled on its next
+use.
+"""
+import threading
+from array import array
+from collections import OrderedDict
+
+NO_ANSWER = -1
+
+
+class AnswerKey:
+    """The compiled answer key of one exam"""
+    __slots__ = ('exam_id', 'version', 'question_ids', 'correct', 'points', 'labels',
+                 'positions', 'total_points')
+
+    def __init__(self, exam_id, version, rows, labels):
+        """
+        Args:
+            exam_id: The exam the key belongs to
+            version: exams.key_version the key was compiled from
+            rows: (question id, correct option position or None, points)
+                for each question
+            labels: {question id: option labels in position order}; a
+                question's options need not be lettered contiguously
+        """
+        self.exam_id = exam_id
+        self.version = version
+        self.question_ids = array('q', (row[0] for row in rows))
+        self.correct = array('b', (NO_ANSWER if row[1] is None else row[1] for row in rows))
+        self.points = array('l', (row[2] for row in rows))
+        self.labels = [tuple(labels.get(row[0], ())) for row in rows]
+        # Per question, the stored position of each option label
+        self.positions = [
+            {label: position for position, label in enumerate(question_labels)}
+            for question_labels in self.labels
+        ]
+        self.total_points = sum(self.points)
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def grade(self, answers):
+        """Grade answers ({question id: option letter}) against the key
+
+        Returns (score, responses) where responses holds a
+        (question id, chosen position or None, is_correct, points awarded)
+        row for every question, ready for the responses table.
+        """
+        get = answers.get
+        score = 0
+        responses = []
+        for question_id, correct, points, positions in zip(
+            self.question_ids, self.correct, self.points, self.positions
+        ):
+            chosen = positions.get(get(question_id), NO_ANSWER)
+            is_correct = chosen == correct != NO_ANSWER
+            awarded = points if is_correct else 0
+            score += awarded
+            responses.append((
+                question_id,
+                None if chosen == NO_ANSWER else chosen,
+                int(is_correct),
+                awarded
+            ))
+        return score, responses
+
+
+class AnswerKeyCache:
+    def __init__(self, max_exams=512):
+        """
+        Args:
+            max_exams: Most exams whose keys are kept; least recently used go first
+        """
+        self.max_exams = max_exams
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cursor, exam_id):
+        """Return the current AnswerKey for an exam, compiling it if needed
+
+        Reads the exam's key_version on every call, so keys compiled before
+        a question edit (from any connection) are never used.
+        """
+        cursor.execute("SELECT key_version FROM exams WHERE id = ?", (exam_id,))
+        row = cursor.fetchone()
+        version = row[0] if row else None
+
+        with self._lock:
+            key = self._keys.get(exam_id)
+            if key is not None and key.version == version:
+                self._keys.move_to_end(exam_id)
+                return key
+
+        cursor.execute("""
+            SELECT q.id, o.position, q.points
+            FROM questions q
+            LEFT JOIN question_options o ON o.question_id = q.id AND o.is_correct = 1
+            WHERE q.exam_id = ?
+            ORDER BY q.id
+        """, (exam_id,))
+        rows = cursor.fetchall()
+        cursor.execute("""
+            SELECT o.question_id, o.label
+            FROM questions q
+            JOIN question_options o ON o.question_id = q.id
+            WHERE q.exam_id = ?
+            ORDER BY o.question_id, o.position
+        """, (exam_id,))
+        labels = {}
+        for question_id, label in cursor.fetchall():
+            labels.setdefault(question_id, []).append(label)
+        key = AnswerKey(exam_id, version, rows, labels)
+
+        with self._lock:
+            self._keys[exam_id] = key
+            self._keys.move_to_end(exam_id)
+            while len(self._keys) > self.max_exams:
+                self._keys.popitem(last=False)
+        return key
+
+    def invalidate(self, exam_id=None):
+        """Drop one exam's key, or every key"""
+        with self._lock:
+            if exam_id is None:
+                self._keys.clear()
+            else:
+                self._keys.pop(exam_id, None)
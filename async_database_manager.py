@@ -0,0 +1,162 @@
+"""Asyncio access to DatabaseManager for the Tk user interface.
+
+AsyncDatabaseManager exposes every public DatabaseManager method as a
+coroutine that runs on a bounded pool of worker threads. Each worker gets its
+own SQLite connection from DatabaseManager's per-thread connections.
+
+TkAsyncBridge runs an asyncio event loop on a background thread next to the
+Tk mainloop and hands finished results back to the Tk thread, so dashboards
+keep repainting while queries run. components.BackgroundTaskRunner builds
+the dashboards' long-running actions, with progress and cancellation, on it.
+"""
+import asyncio
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncDatabaseManager:
+    # Methods tied to the calling thread's cursor; they make no sense off-thread
+    THREAD_BOUND_METHODS = {
+        'connect', 'close', 'close_all', 'connection', 'transaction',
+        'enable_write_queue', 'disable_write_queue'
+    }
+
+    def __init__(self, db_manager, max_workers=4):
+        self.db_manager = db_manager
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="db-worker"
+        )
+
+    def __getattr__(self, name):
+        """Mirror DatabaseManager.<name> as a coroutine function"""
+        if name.startswith('_') or name in self.THREAD_BOUND_METHODS:
+            raise AttributeError(name)
+        method = getattr(self.db_manager, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        @functools.wraps(method)
+        async def coroutine(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                functools.partial(method, *args, **kwargs)
+            )
+
+        # Cache so later lookups skip __getattr__
+        setattr(self, name, coroutine)
+        return coroutine
+
+    async def call(self, function, *args):
+        """Run any callable on the database workers
+
+        For work that spans several DatabaseManager calls, or writes files,
+        without a method of its own.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(function, *args)
+        )
+
+    def shutdown(self):
+        """Wait for running queries and stop the worker threads"""
+        self._executor.shutdown(wait=True)
+
+
+class TkAsyncBridge:
+    POLL_INTERVAL = 30  # ms between checks for finished coroutines
+
+    def __init__(self, root, db_manager, max_workers=4):
+        """
+        Args:
+            root: The Tk root whose mainloop receives results
+            db_manager: DatabaseManager to expose as self.db
+            max_workers: Size of the database worker pool
+        """
+        self.root = root
+        self.db = AsyncDatabaseManager(db_manager, max_workers)
+        self.loop = asyncio.new_event_loop()
+        self._finished = queue.Queue()
+        self._outstanding = 0  # scheduled futures not yet delivered
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="asyncio-loop",
+            daemon=True
+        )
+        self._thread.start()
+        # Polling only runs while coroutines are outstanding
+        self._poll_id = None
+
+    def run(self, coro, on_done=None, on_error=None):
+        """Schedule a coroutine; its callbacks run later on the Tk thread
+
+        Must be called on the Tk thread. Returns the
+        concurrent.futures.Future for the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self._outstanding += 1
+        future.add_done_callback(
+            lambda f: self._finished.put((f, on_done, on_error))
+        )
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_INTERVAL, self._poll)
+        return future
+
+    def post(self, callback, *args):
+        """Call callback(*args) on the Tk thread at the next poll
+
+        Safe from any thread, for progress from work started with run();
+        calls posted while nothing is outstanding wait for the next run().
+        """
+        self._finished.put((None, callback, args))
+
+    def _poll(self):
+        """Deliver finished coroutines to their callbacks (Tk thread)"""
+        while True:
+            try:
+                entry = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            if entry[0] is None:
+                _, callback, args = entry
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"Error in posted callback: {e}")
+                continue
+            future, on_done, on_error = entry
+            self._outstanding -= 1
+            if future.cancelled():
+                continue
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Background database call failed: {error}")
+                elif on_done:
+                    on_done(future.result())
+            except Exception as e:
+                print(f"Error in background callback: {e}")
+        if self._outstanding:
+            self._poll_id = self.root.after(self.POLL_INTERVAL, self._poll)
+        else:
+            self._poll_id = None
+
+    def close(self):
+        """Stop the event loop and the database workers"""
+        if self._poll_id:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.db.shutdown()
@@ -0,0 +1,90 @@
+"""Debounced autosave of in-progress exam answers.
+
+Answer changes are collected in memory and written to attempt_drafts at
+most once per interval, as one UPSERT of the whole answer set, so a burst
+of clicks costs a single small write. Flushes are scheduled on the Tk
+event loop of the exam window; no extra thread is involved.
+"""
+import time
+
+
+class AnswerAutosaver:
+    def __init__(self, widget, db_manager, trainee_id, exam_id, elapsed,
+                 interval=5.0, answers=None):
+        """
+        Args:
+            widget: Tk widget whose event loop runs the flushes
+            db_manager: DatabaseManager the drafts are saved with
+            trainee_id: The trainee taking the exam
+            exam_id: The exam being taken
+            elapsed: Callable returning the seconds spent on the attempt
+            interval: Least seconds between two draft writes
+            answers: {question id: option label} already saved, when resuming
+        """
+        self.widget = widget
+        self.db_manager = db_manager
+        self.trainee_id = trainee_id
+        self.exam_id = exam_id
+        self.elapsed = elapsed
+        self.interval = interval
+        self._answers = dict(answers or {})
+        self._dirty = False
+        self._last_flush = float('-inf')
+        self._after_id = None
+
+    def record(self, question_id, label):
+        """Note an answer change; it is written by the next flush"""
+        if (self._answers.get(question_id) or '') == (label or ''):
+            return
+        if label:
+            self._answers[question_id] = label
+        else:
+            self._answers.pop(question_id, None)
+        self._dirty = True
+        self._schedule()
+
+    def _schedule(self):
+        if self._after_id is not None:
+            return
+        delay = max(0.0, self._last_flush + self.interval - time.monotonic())
+        self._after_id = self.widget.after(int(delay * 1000), self._scheduled_flush)
+
+    def _scheduled_flush(self):
+        self._after_id = None
+        self.flush()
+
+    def flush(self):
+        """Write the answers now if they changed since the last write
+
+        Returns False if the write failed; the change is retried on the
+        next interval.
+        """
+        self._cancel()
+        if not self._dirty:
+            return True
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        try:
+            self.db_manager.save_attempt_draft(
+                self.trainee_id, self.exam_id, self._answers, int(self.elapsed())
+            )
+        except Exception as e:
+            # Autosave must never interrupt the exam itself
+            print(f"Error autosaving answers: {e}")
+            self._dirty = True
+            self._schedule()
+            return False
+        return True
+
+    def stop(self):
+        """Cancel any pending flush without writing it"""
+        self._cancel()
+        self._dirty = False
+
+    def _cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # The window is already gone
+            self._after_id = None
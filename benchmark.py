@@ -0,0 +1,596 @@
+"""Benchmark suite for DatabaseManager.
+
+Builds seeded synthetic databases at several scales, times every
+DatabaseManager read and write method against each of them and prints a
+comparison with a saved baseline, so regressions show up before a build is
+rolled out to the test center.
+
+Usage:
+    python benchmark.py [--scale small medium large] [--repeat 5]
+                        [--baseline benchmark_baseline.json]
+                        [--save-baseline] [--fail-on-regression]
+
+Generated databases are cached in .benchmark_cache/ keyed by scale, seed and
+schema version; each run works on a fresh copy, so the write benchmarks never
+change the cached data.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database_manager import DatabaseManager
+from migrations import LATEST_VERSION
+
+CACHE_DIR = '.benchmark_cache'
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+DEFAULT_SEED = 20240101
+# Bump when the generated data changes so cached databases are rebuilt
+GENERATOR_VERSION = 3
+
+# Row counts per table for each scale; the last graded_results results
+# also get a responses row per question
+SCALES = {
+    'small': {
+        'trainers': 10, 'batches': 10, 'trainees': 200,
+        'exams': 40, 'questions': 2_000, 'results': 5_000,
+        'graded_results': 5_000,
+    },
+    'medium': {
+        'trainers': 50, 'batches': 100, 'trainees': 2_000,
+        'exams': 400, 'questions': 20_000, 'results': 100_000,
+        'graded_results': 20_000,
+    },
+    'large': {
+        'trainers': 100, 'batches': 500, 'trainees': 10_000,
+        'exams': 2_000, 'questions': 100_000, 'results': 1_000_000,
+        'graded_results': 50_000,
+    },
+}
+
+# A case is flagged when it is this much slower than its baseline...
+REGRESSION_THRESHOLD = 0.20
+# ...and the difference is larger than timer noise
+NOISE_FLOOR = 0.0002  # seconds
+
+INSERT_CHUNK = 50_000
+LETTERS = ('A', 'B', 'C', 'D')
+EPOCH = datetime(2024, 1, 1, 8, 0, 0)
+
+
+def _chunks(rows, size=INSERT_CHUNK):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _batch_of(trainee_id, counts):
+    """Batch a generated trainee belongs to"""
+    return (trainee_id - 1) % counts['batches'] + 1
+
+
+def _exams_of(batch_id, counts):
+    """Exam ids generated for a batch"""
+    return range(batch_id, counts['exams'] + 1, counts['batches'])
+
+
+def _questions_per_exam(counts):
+    return max(1, counts['questions'] // counts['exams'])
+
+
+def populate(conn, counts, seed):
+    """Fill an empty, migrated database with seeded synthetic data
+
+    Ids are assigned densely from 1, trainees and exams are spread evenly
+    over the batches and every result belongs to an exam of the trainee's
+    own batch, so the benchmark cases can pick valid ids arithmetically.
+    """
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+
+    cursor.executemany("""
+        INSERT INTO trainers (id, name, class_assigned, contact_email, hire_date)
+        VALUES (?, ?, ?, ?, ?)
+    """, (
+        (i, f"Trainer {i}", f"Class {i % 12 + 1}", f"trainer{i}@example.com",
+         (EPOCH - timedelta(days=rng.randint(30, 3000))).strftime('%Y-%m-%d'))
+        for i in range(1, counts['trainers'] + 1)
+    ))
+
+    cursor.executemany("""
+        INSERT INTO batches (id, batch_year, num_trainees, training_duration,
+                             training_location, trainer_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (
+        (i, str(2020 + i % 5), counts['trainees'] // counts['batches'] + 10,
+         f"{rng.choice((3, 6, 12))} months", f"Room {i % 20 + 1}",
+         (i - 1) % counts['trainers'] + 1)
+        for i in range(1, counts['batches'] + 1)
+    ))
+
+    for chunk in _chunks(
+        (i, f"Trainee {i}", f"ID-{i:07d}", f"ULI-{i:07d}", _batch_of(i, counts),
+         2020 + _batch_of(i, counts) % 5, 0,
+         rng.choices(('Active', 'Inactive', 'Completed'), (8, 1, 1))[0], None)
+        for i in range(1, counts['trainees'] + 1)
+    ):
+        cursor.executemany("""
+            INSERT INTO trainees (id, name, id_no, uli, batch_id, batch_year,
+                                  exams_taken, status, remarks)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, chunk)
+
+    per_exam = _questions_per_exam(counts)
+    cursor.executemany("""
+        INSERT INTO exams (id, title, module_no, num_items, time_limit,
+                           batch_id, created_at, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        (i, f"Exam {i}", f"M{(i - 1) // counts['batches'] + 1:02d}", per_exam,
+         rng.choice((30, 45, 60, 90)), (i - 1) % counts['batches'] + 1,
+         EPOCH.strftime('%Y-%m-%d %H:%M:%S'),
+         'Active' if rng.random() < 0.95 else 'Inactive')
+        for i in range(1, counts['exams'] + 1)
+    ))
+
+    # Questions store the correct label; their options go to question_options
+    points = {}
+    correct_labels = {}
+    exam_questions = {}
+
+    def questions():
+        for i in range(1, counts['questions'] + 1):
+            exam_id = (i - 1) // per_exam % counts['exams'] + 1
+            correct_labels[i] = rng.choice(LETTERS)
+            points[exam_id] = points.get(exam_id, 0) + 1
+            exam_questions.setdefault(exam_id, []).append(i)
+            yield (i, exam_id, f"Question {i} text", correct_labels[i], 1, 'multiple_choice')
+
+    for chunk in _chunks(questions()):
+        cursor.executemany("""
+            INSERT INTO questions (id, exam_id, question_text, correct_answer,
+                                   points, question_type)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, chunk)
+
+    for chunk in _chunks(
+        (question_id, position, letter, f"Option {letter} of question {question_id}",
+         int(letter == correct))
+        for question_id, correct in correct_labels.items()
+        for position, letter in enumerate(LETTERS)
+    ):
+        cursor.executemany("""
+            INSERT INTO question_options (question_id, position, label, text, is_correct)
+            VALUES (?, ?, ?, ?, ?)
+        """, chunk)
+
+    attempts = {}
+    taken = {}
+    first_graded = counts['results'] - counts['graded_results'] + 1
+    result_rows, response_rows = [], []
+
+    def flush():
+        cursor.executemany("""
+            INSERT INTO results (id, trainee_id, exam_id, score, total_items,
+                                 percentage, time_spent, date_taken, status,
+                                 attempt_number)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, result_rows)
+        cursor.executemany("""
+            INSERT INTO responses (result_id, question_id, chosen_option,
+                                   is_correct, points_awarded)
+            VALUES (?, ?, ?, ?, ?)
+        """, response_rows)
+        del result_rows[:], response_rows[:]
+
+    for i in range(1, counts['results'] + 1):
+        trainee_id = rng.randint(1, counts['trainees'])
+        exam_id = rng.choice(_exams_of(_batch_of(trainee_id, counts), counts))
+        total = points.get(exam_id, per_exam)
+        if i >= first_graded:
+            # Answer each question, right with a per-attempt probability
+            ability = rng.uniform(0.3, 1.0)
+            score = 0
+            for question_id in exam_questions.get(exam_id, ()):
+                correct = LETTERS.index(correct_labels[question_id])
+                if rng.random() < 0.03:
+                    chosen = None
+                elif rng.random() < ability:
+                    chosen = correct
+                else:
+                    chosen = rng.choice([p for p in range(len(LETTERS)) if p != correct])
+                is_correct = int(chosen == correct)
+                score += is_correct
+                response_rows.append((i, question_id, chosen, is_correct, is_correct))
+        else:
+            score = rng.randint(total // 3, total)
+        percentage = score / total * 100
+        key = (trainee_id, exam_id)
+        attempts[key] = attempts.get(key, 0) + 1
+        if attempts[key] == 1:
+            taken[trainee_id] = taken.get(trainee_id, 0) + 1
+        date_taken = EPOCH + timedelta(seconds=rng.randint(0, 365 * 86400))
+        result_rows.append((
+            i, trainee_id, exam_id, score, total, percentage,
+            rng.randint(300, 3600), date_taken.strftime('%Y-%m-%d %H:%M:%S'),
+            'Passed' if percentage >= 75 else 'Failed', attempts[key]
+        ))
+        if len(result_rows) >= INSERT_CHUNK or len(response_rows) >= INSERT_CHUNK:
+            flush()
+    flush()
+
+    cursor.executemany(
+        "UPDATE trainees SET exams_taken = ? WHERE id = ?",
+        ((count, trainee_id) for trainee_id, count in taken.items())
+    )
+    conn.commit()
+
+
+def build_database(scale, seed):
+    """Return the path of the cached database for a scale, generating it if needed"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(
+        CACHE_DIR, f"{scale}-seed{seed}-schema{LATEST_VERSION}-gen{GENERATOR_VERSION}.db"
+    )
+    if os.path.exists(path):
+        return path
+
+    print(f"Generating {scale} database (seed {seed})...")
+    start = time.perf_counter()
+    building = path + '.building'
+    if os.path.exists(building):
+        os.remove(building)
+
+    # Let DatabaseManager create the current schema, then bulk load
+    DatabaseManager(building).close_all()
+    conn = sqlite3.connect(building)
+    conn.execute("PRAGMA synchronous = OFF")
+    try:
+        populate(conn, SCALES[scale], seed)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(building, path)
+    print(f"  generated in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def _benchmark_cases(db, counts, seed):
+    """(label, method name, call, prepare) for every DatabaseManager method
+
+    prepare() runs untimed before each call and returns the call's
+    arguments, drawn from a random stream seeded per case.
+    """
+    cases = []
+    unique = iter(range(1, 10 ** 9))
+
+    def case(label, method, call, prepare):
+        rng = random.Random(f"{seed}:{label}")
+        cases.append((label, method, call, lambda: prepare(rng)))
+
+    def trainee(rng):
+        return rng.randint(1, counts['trainees'])
+
+    def exam(rng):
+        return rng.randint(1, counts['exams'])
+
+    def batch(rng):
+        return rng.randint(1, counts['batches'])
+
+    def taken_exam(rng):
+        """A trainee and an exam of their batch"""
+        trainee_id = trainee(rng)
+        return trainee_id, rng.choice(_exams_of(_batch_of(trainee_id, counts), counts))
+
+    def submission(rng):
+        trainee_id, exam_id = taken_exam(rng)
+        answers = {q.id: rng.choice(LETTERS) for q in db.get_exam_questions(exam_id)}
+        # Loading an exam compiles its answer key, as ExamManager does
+        db.get_answer_key(exam_id)
+        return trainee_id, exam_id, answers, rng.randint(300, 3600)
+
+    # Reads
+    for table in ('trainers', 'batches', 'trainees', 'exams', 'questions', 'results'):
+        case(f"get_all_records({table})", 'get_all_records', db.get_all_records,
+             lambda rng, t=table: (t,))
+    case("get_records_page(results, first)", 'get_records_page', db.get_records_page,
+         lambda rng: ('results', None, 200))
+    case("get_records_page(results, deep)", 'get_records_page', db.get_records_page,
+         lambda rng: (lambda n: ('results', (n, n), 200))(rng.randint(1, counts['results'])))
+    case("count_records(results)", 'count_records', db.count_records,
+         lambda rng: ('results',))
+    case("get_page_cursor(results, jump)", 'get_page_cursor', db.get_page_cursor,
+         lambda rng: ('results', None, rng.randint(1, counts['results'])))
+    case("get_following_ids(results)", 'get_following_ids', db.get_following_ids,
+         lambda rng: ('results', [rng.randint(1, counts['results']) for _ in range(50)]))
+    case("get_record_by_id", 'get_record_by_id', db.get_record_by_id,
+         lambda rng: ('trainees', trainee(rng)))
+    case("get_available_exams_for_batch", 'get_available_exams_for_batch',
+         db.get_available_exams_for_batch, lambda rng: (batch(rng),))
+    case("get_exam_questions", 'get_exam_questions', db.get_exam_questions,
+         lambda rng: (exam(rng),))
+    case("get_exam_questions_with_options", 'get_exam_questions_with_options',
+         db.get_exam_questions_with_options, lambda rng: (exam(rng),))
+    case("get_answer_key", 'get_answer_key', db.get_answer_key, lambda rng: (exam(rng),))
+    case("count_exam_results", 'count_exam_results', db.count_exam_results,
+         lambda rng: (exam(rng),))
+    case("get_item_analysis", 'get_item_analysis', db.get_item_analysis,
+         lambda rng: (exam(rng),))
+    case("get_batch_item_analysis", 'get_batch_item_analysis', db.get_batch_item_analysis,
+         lambda rng: (batch(rng),))
+    case("get_available_exams", 'get_available_exams', db.get_available_exams,
+         lambda rng: (trainee(rng),))
+    case("get_exam_details", 'get_exam_details', db.get_exam_details,
+         lambda rng: (exam(rng),))
+    case("has_taken_exam", 'has_taken_exam', db.has_taken_exam, taken_exam)
+    case("get_trainee_results", 'get_trainee_results', db.get_trainee_results,
+         lambda rng: (trainee(rng),))
+    case("get_trainee_progress", 'get_trainee_progress', db.get_trainee_progress,
+         lambda rng: (trainee(rng),))
+    case("validate_batch_assignment", 'validate_batch_assignment',
+         db.validate_batch_assignment,
+         lambda rng: (lambda b: (b, rng.choice(_exams_of(b, counts))))(batch(rng)))
+    case("get_batch_statistics", 'get_batch_statistics', db.get_batch_statistics,
+         lambda rng: (batch(rng),))
+    case("validate_exam_attempt", 'validate_exam_attempt', db.validate_exam_attempt,
+         taken_exam)
+    case("get_exam_summary", 'get_exam_summary', db.get_exam_summary,
+         lambda rng: (exam(rng),))
+    case("get_trainee_exam_history", 'get_trainee_exam_history',
+         db.get_trainee_exam_history, lambda rng: (trainee(rng),))
+    case("get_batch_completion_status", 'get_batch_completion_status',
+         db.get_batch_completion_status, lambda rng: (batch(rng),))
+    case("export_trainee_results(csv)", 'export_trainee_results',
+         db.export_trainee_results, lambda rng: (trainee(rng), 'csv'))
+    case("export_trainee_results(json)", 'export_trainee_results',
+         db.export_trainee_results, lambda rng: (trainee(rng), 'json'))
+    case("export_batch_report", 'export_batch_report', db.export_batch_report,
+         lambda rng: (batch(rng),))
+
+    # Writes
+    case("insert_trainer", 'insert_trainer', db.insert_trainer,
+         lambda rng: (lambda n: (f"Bench Trainer {n}", "Class 1",
+                                 f"bench{n}@example.com", "2024-01-01"))(next(unique)))
+    case("insert_batch", 'insert_batch', db.insert_batch,
+         lambda rng: ("2024", 30, "6 months", "Room 1",
+                      rng.randint(1, counts['trainers'])))
+    case("insert_trainee", 'insert_trainee', db.insert_trainee,
+         lambda rng: (lambda n, b: (f"Bench Trainee {n}", f"BENCH-{n}", f"BENCH-ULI-{n}",
+                                    2024, b, 'Active'))(next(unique), batch(rng)))
+    case("insert_exam", 'insert_exam', db.insert_exam,
+         lambda rng: (f"Bench Exam {next(unique)}", "M99", 50, 60, batch(rng)))
+    case("insert_result", 'insert_result', db.insert_result,
+         lambda rng: (lambda t, e: (t, e, rng.randint(0, 50), 50, 1800, "2024-06-01"))(*taken_exam(rng)))
+    case("insert_record", 'insert_record', db.insert_record,
+         lambda rng: ('trainers', {
+             'name': f"Bench Trainer {next(unique)}",
+             'class_assigned': "Class 2",
+             'hire_date': "2024-01-01",
+         }))
+    case("update_record", 'update_record', db.update_record,
+         lambda rng: ('trainees', trainee(rng), {'remarks': f"Benchmark {next(unique)}"}))
+    case("delete_record", 'delete_record', db.delete_record,
+         lambda rng: ('trainers', db.insert_record('trainers', {
+             'name': f"Bench Trainer {next(unique)}",
+             'class_assigned': "Class 3",
+             'hire_date': "2024-01-01",
+         })))
+    case("add_question", 'add_question', db.add_question,
+         lambda rng: (exam(rng), "Benchmark question",
+                      {letter: f"Option {letter}" for letter in LETTERS},
+                      rng.choice(LETTERS)))
+    case("save_question", 'save_question', db.save_question,
+         lambda rng: (lambda q: (q.exam_id, "Edited question",
+                                 {letter: f"Edited option {letter}" for letter in LETTERS},
+                                 rng.choice(LETTERS), q.points, q.id))(
+             db.get_record_by_id('questions', rng.randint(1, counts['questions']))))
+    case("submit_exam_result", 'submit_exam_result', db.submit_exam_result, submission)
+    case("finalize_attempt", 'finalize_attempt', db.finalize_attempt, submission)
+    case("save_attempt_draft", 'save_attempt_draft', db.save_attempt_draft,
+         lambda rng: submission(rng)[:3] + (rng.randint(0, 3600),))
+    case("get_attempt_draft", 'get_attempt_draft', db.get_attempt_draft, taken_exam)
+    case("start_attempt", 'start_attempt', db.start_attempt, taken_exam)
+    case("rescore_exam(dry run)", 'rescore_exam', db.rescore_exam,
+         lambda rng: (exam(rng), True))
+    case("rescore_exam", 'rescore_exam', db.rescore_exam, lambda rng: (exam(rng),))
+
+    def burst(rng):
+        # Every submission from here on goes through the group commit
+        db.enable_write_queue()
+        return tuple(submission(rng) for _ in range(16))
+
+    case("submit_exam_result_async x16 (write queue)", 'submit_exam_result_async',
+         lambda *submissions: _submit_burst(db, submissions), burst)
+    case("update_trainee_status", 'update_trainee_status', db.update_trainee_status,
+         lambda rng: (trainee(rng),))
+    case("rebuild_statistics", 'rebuild_statistics', db.rebuild_statistics, lambda rng: ())
+    return cases
+
+
+def _submit_burst(db, submissions):
+    """Queue a burst of submissions and wait for their group commits"""
+    futures = [db.submit_exam_result_async(*submission) for submission in submissions]
+    return [future.result() for future in futures]
+
+
+def _unbenchmarked_methods(cases):
+    covered = {method for _, method, _, _ in cases}
+    return sorted(
+        name for name in dir(DatabaseManager)
+        if not name.startswith('_')
+        and name not in DatabaseManager.UNINSTRUMENTED_METHODS
+        and callable(getattr(DatabaseManager, name))
+        and name not in covered
+    )
+
+
+def run_scale(scale, seed, repeat):
+    """Time every case against a fresh copy of the scale's database"""
+    template = build_database(scale, seed)
+    work_dir = tempfile.mkdtemp()
+    work_db = os.path.join(work_dir, 'benchmark.db')
+    shutil.copyfile(template, work_db)
+
+    db = DatabaseManager(work_db)
+    results = {}
+    try:
+        cases = _benchmark_cases(db, SCALES[scale], seed)
+        missing = _unbenchmarked_methods(cases)
+        if missing:
+            print(f"Warning: no benchmark for {', '.join(missing)}")
+
+        for label, _, call, prepare in cases:
+            timings = []
+            output = io.StringIO()
+            error = None
+            # One untimed warm-up call, then the timed repetitions
+            for iteration in range(repeat + 1):
+                args = prepare()
+                try:
+                    with contextlib.redirect_stdout(output):
+                        start = time.perf_counter()
+                        call(*args)
+                        elapsed = time.perf_counter() - start
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    break
+                if iteration:
+                    timings.append(elapsed)
+
+            printed = output.getvalue().strip()
+            if error is None and printed:
+                error = printed.splitlines()[0]
+            results[label] = {
+                'median': statistics.median(timings) if timings else None,
+                'p95': _percentile(timings, 95) if timings else None,
+                'runs': len(timings),
+                'error': error,
+            }
+            print(f"  {scale:<7} {label:<46} "
+                  f"{_format_ms(results[label]['median'])}")
+    finally:
+        db.close_all()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _format_ms(seconds):
+    return f"{seconds * 1000:>10.2f}" if seconds is not None else f"{'-':>10}"
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results, seed, repeat):
+    """Write results into the baseline file, keeping other scales' entries"""
+    baseline = load_baseline(path) or {'scales': {}}
+    baseline['scales'].update(results)
+    baseline.update({
+        'seed': seed,
+        'repeat': repeat,
+        'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+    })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline):
+    """Print current timings next to the baseline; return the regressions"""
+    base_scales = (baseline or {}).get('scales', {})
+    header = (f"{'Scale':<7} {'Method':<46} {'Median ms':>10} {'p95 ms':>10} "
+              f"{'Base ms':>10} {'Change':>8}")
+    print()
+    print(header)
+    print('-' * len(header))
+
+    regressions = []
+    for scale, cases in results.items():
+        for label, current in cases.items():
+            base = base_scales.get(scale, {}).get(label)
+            change = ''
+            flag = ''
+            if current['error']:
+                flag = f"  ERROR: {current['error'][:60]}"
+            elif base and base.get('median'):
+                ratio = current['median'] / base['median'] - 1
+                change = f"{ratio:+.1%}"
+                if (ratio > REGRESSION_THRESHOLD
+                        and current['median'] - base['median'] > NOISE_FLOOR):
+                    flag = '  REGRESSION'
+                    regressions.append((scale, label, ratio))
+            print(f"{scale:<7} {label:<46} {_format_ms(current['median'])} "
+                  f"{_format_ms(current['p95'])} "
+                  f"{_format_ms(base.get('median') if base else None)} "
+                  f"{change:>8}{flag}")
+
+    print()
+    if baseline is None:
+        print("No baseline to compare against; run with --save-baseline to record one.")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) over {REGRESSION_THRESHOLD:.0%}:")
+        for scale, label, ratio in regressions:
+            print(f"    {scale} {label}: {ratio:+.1%}")
+    else:
+        print("No regressions against the baseline.")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager methods")
+    parser.add_argument('--scale', nargs='+', choices=list(SCALES), default=list(SCALES),
+                        help="scales to benchmark (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls per method")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="data generator seed")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="record this run as the new baseline")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 if any method regressed")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scale in args.scale:
+        results[scale] = run_scale(scale, args.seed, max(1, args.repeat))
+
+    baseline = load_baseline(args.baseline)
+    if baseline is not None and baseline.get('seed') != args.seed:
+        print(f"Warning: baseline was recorded with seed {baseline.get('seed')}")
+    regressions = compare(results, baseline)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, args.seed, args.repeat)
+        print(f"Baseline saved to {args.baseline}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
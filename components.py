@@ -1,5 +1,8 @@
+import asyncio
 import customtkinter as ctk
+import threading
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk
 from config import THEME
 
@@ -147,6 +150,7 @@ class LoadingIndicator:
         )
         
         self.spinner = self._create_spinner()
+        self._animation_id = None
         
     def _create_spinner(self):
         """Create an animated loading spinner"""
@@ -170,8 +174,11 @@ class LoadingIndicator:
         
         return canvas
         
-    def show(self):
-        """Display the loading indicator"""
+    def show(self, on_cancel=None):
+        """Display the loading indicator
+
+        With on_cancel, a Cancel button is shown that calls it.
+        """
         # Position overlay to cover parent
         self.overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
         
@@ -181,12 +188,25 @@ class LoadingIndicator:
         # Add components
         self.spinner.pack(pady=10)
         self.label.pack(pady=(0, 10))
+        if on_cancel:
+            ctk.CTkButton(
+                self.container,
+                text="Cancel",
+                width=90,
+                fg_color=THEME["colors"]["secondary"],
+                hover_color=THEME["colors"]["secondary_hover"],
+                command=lambda: self._cancel(on_cancel)
+            ).pack(pady=(0, 10))
         
         # Start animation
-        self._animate()
+        if self._animation_id is None:
+            self._animate()
         
     def hide(self):
-        """Hide the loading indicator"""
+        """Hide the loading indicator and stop its animation"""
+        if self._animation_id is not None:
+            self.container.after_cancel(self._animation_id)
+            self._animation_id = None
         self.overlay.place_forget()
         
     def _animate(self):
@@ -198,8 +218,409 @@ class LoadingIndicator:
         )
         
         # Schedule next frame
-        self.container.after(50, self._animate)
+        self._animation_id = self.container.after(50, self._animate)
+        
+    def _cancel(self, on_cancel):
+        self.update_text("Cancelling...")
+        on_cancel()
         
     def update_text(self, text):
         """Update the loading text"""
-        self.label.configure(text=text)
\ No newline at end of file
+        self.label.configure(text=text)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task to stop it after cancel() was called"""
+
+
+class BackgroundTask:
+    """Handle of a task started by BackgroundTaskRunner
+
+    A task function receives it as its first argument, to report progress
+    and to check whether it has been cancelled; the caller gets it back from
+    run() to cancel the task.
+    """
+
+    def __init__(self, bridge, loading=None, on_cancel=None):
+        self._bridge = bridge
+        self._loading = loading
+        self._on_cancel = on_cancel
+        self._cancelled = threading.Event()
+        self.finished = False
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop the task and drop its outcome (Tk thread)
+
+        A task already running on a worker stops at its next check().
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+        self._hide()
+        if self._on_cancel:
+            self._on_cancel()
+
+    def check(self):
+        """Raise TaskCancelled if the task has been cancelled (worker thread)"""
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def report(self, text):
+        """Show a progress message in the task's LoadingIndicator (worker thread)"""
+        if self._loading:
+            self._bridge.post(self._show_progress, text)
+
+    def _show_progress(self, text):
+        if not self.finished:
+            self._loading.update_text(text)
+
+    def _hide(self):
+        if self._loading:
+            try:
+                self._loading.hide()
+            except tk.TclError:
+                pass  # Its parent was destroyed while the task ran
+
+
+class BackgroundTaskRunner:
+    """Runs the dashboards' slow actions off the Tk thread
+
+    Tasks go through the app's TkAsyncBridge, so there is one worker pool
+    and one polled queue for all background work: a plain callable runs on
+    the database workers, each with its own SQLite connection, and a
+    coroutine on the bridge's event loop. Outcomes, and progress reported
+    by callables, are delivered on the Tk thread. The runner holds no
+    resources of its own; closing the bridge stops it.
+    """
+
+    def __init__(self, bridge):
+        """
+        Args:
+            bridge: TkAsyncBridge the tasks run through
+        """
+        self.bridge = bridge
+        self.db = bridge.db
+
+    def run(self, task, *args, loading=None, cancellable=True,
+            on_done=None, on_error=None, on_cancel=None):
+        """Start a task (Tk thread)
+
+        Args:
+            task: Callable taking a BackgroundTask handle and args, or a
+                coroutine (which cannot report progress or check for
+                cancellation)
+            loading: LoadingIndicator shown while the task runs
+            cancellable: Whether the indicator offers a Cancel button
+            on_done: Called with the task's result
+            on_error: Called with the exception the task raised
+            on_cancel: Called when the task is cancelled
+
+        Returns the BackgroundTask handle.
+        """
+        handle = BackgroundTask(self.bridge, loading, on_cancel)
+        if asyncio.iscoroutine(task):
+            work = task
+        else:
+            work = self.db.call(self._call, handle, task, args)
+        if loading:
+            loading.show(handle.cancel if cancellable else None)
+        handle.future = self.bridge.run(
+            work,
+            lambda result: self._finish(handle, on_done, result),
+            lambda error: self._finish(handle, on_error, error, failed=True)
+        )
+        return handle
+
+    @staticmethod
+    def _call(handle, task, args):
+        """Run one task on a database worker"""
+        handle.check()
+        return task(handle, *args)
+
+    @staticmethod
+    def _finish(handle, callback, value, failed=False):
+        if handle.finished:
+            return  # Cancelled after it had already finished
+        handle.finished = True
+        handle._hide()
+        if callback:
+            callback(value)
+        elif failed:
+            print(f"Background task failed: {value}")
+
+
+class VirtualTreeview(ctk.CTkFrame):
+    """A Treeview that only holds the rows in view
+
+    Rows are loaded in blocks as they scroll into view and kept in a small
+    LRU cache. A fixed set of Treeview items, one per visible row, is
+    reused for whichever rows are shown, and the scrollbar spans every row
+    of the table.
+    """
+
+    def __init__(self, parent, columns, load_block, block_size=200, max_blocks=16,
+                 row_height=30, style="Treeview", scrollbar_style="Vertical.TScrollbar"):
+        """
+        Args:
+            parent: Widget the table is created in
+            columns: Column names
+            load_block: Called with (block, done) to load rows
+                block * block_size onwards; it calls done(rows), on the Tk
+                thread, with up to block_size value lists, or done(None) if
+                loading failed; a failed block stays empty and is not
+                requested again until reset()
+            block_size: Rows per block
+            max_blocks: Blocks kept in memory
+            row_height: Treeview row height in pixels, as set in its style
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.load_block = load_block
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.row_height = row_height
+
+        self.total = 0
+        self.first = 0  # row shown in the top item
+        self._blocks = OrderedDict()  # block -> row value lists
+        self._pending = set()
+        self._failed = set()
+        self._generation = 0
+        self._items = []
+        self._selected_key = None  # first value of the selected row
+        self._render_pending = None
+
+        self.tree = ttk.Treeview(
+            self, columns=columns, show='headings', style=style, selectmode='browse'
+        )
+        self.scrollbar = ttk.Scrollbar(
+            self, orient=tk.VERTICAL, command=self._on_scrollbar, style=scrollbar_style
+        )
+        x_scrollbar = ttk.Scrollbar(
+            self, orient=tk.HORIZONTAL, command=self.tree.xview, style=scrollbar_style
+        )
+        self.tree.configure(xscroll=x_scrollbar.set)
+
+        self.tree.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.tree.bind("<Configure>", lambda e: self._schedule_render())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+    def reset(self, total):
+        """Show a table of total rows from the top, dropping loaded rows"""
+        self._generation += 1
+        self._blocks.clear()
+        self._pending.clear()
+        self._failed.clear()
+        self.total = total
+        self.first = 0
+        self._selected_key = None
+        self._render()
+
+    def scroll(self, rows):
+        """Scroll by a number of rows; negative scrolls up"""
+        self._scroll_to(self.first + rows)
+        return "break"
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas of
+        # a few units; either way at least one step goes the delta's way
+        if not event.delta:
+            return "break"
+        steps = max(1, abs(event.delta) // 120)
+        return self.scroll(-3 * steps if event.delta > 0 else 3 * steps)
+
+    def replace_row(self, values):
+        """Show new values for the loaded row with the same key (first value)
+
+        Returns False if that row is not loaded; it is read fresh when it
+        scrolls into view.
+        """
+        found = self._find(values[0])
+        if found is None:
+            return False
+        block, offset = found
+        self._blocks[block][offset] = list(values)
+        self._schedule_render()
+        return True
+
+    def append_row(self, values):
+        """Add a row after the last one"""
+        block, offset = divmod(self.total, self.block_size)
+        self.total += 1
+        rows = self._blocks.get(block)
+        if rows is not None and len(rows) == offset:
+            rows.append(list(values))
+        elif offset == 0 and block not in self._pending:
+            self._blocks[block] = [list(values)]
+        else:
+            self._blocks.pop(block, None)
+        self._schedule_render()
+
+    def remove_row(self, key):
+        """Remove the loaded row with this key; the rows after it move up
+
+        Returns False if that row is not loaded, in which case the caller
+        should reset() the table.
+        """
+        found = self._find(key)
+        if found is None:
+            return False
+        block, offset = found
+        del self._blocks[block][offset]
+        self.total -= 1
+
+        # Blocks after the row now start one row earlier: shift rows along
+        # the loaded blocks that follow on, and drop the others
+        current = block
+        for later in sorted(b for b in self._blocks if b > block):
+            if later != current + 1 or not self._blocks[later]:
+                break
+            self._blocks[current].append(self._blocks[later].pop(0))
+            current = later
+        for stale in [b for b in self._blocks if b > current]:
+            del self._blocks[stale]
+        rows = self._blocks[current]
+        if len(rows) < self.block_size and current * self.block_size + len(rows) < self.total:
+            del self._blocks[current]
+
+        # Loads in flight, and failures, were for the old row positions
+        self._generation += 1
+        self._pending.clear()
+        self._failed.clear()
+        if self._selected_key == key:
+            self._selected_key = None
+        self._schedule_render()
+        return True
+
+    def _find(self, key):
+        """(block, offset) of the loaded row with this key, or None"""
+        for block, rows in self._blocks.items():
+            for offset, row in enumerate(rows):
+                if row[0] == key:
+                    return block, offset
+        return None
+
+    def _visible_rows(self):
+        # The heading takes about one row
+        return max(self.tree.winfo_height() // self.row_height - 1, 1)
+
+    def _scroll_to(self, first):
+        first = max(min(first, self.total - self._visible_rows()), 0)
+        if first != self.first:
+            self.first = first
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self._scroll_to(int(float(amount) * self.total))
+        elif unit == 'pages':
+            self.scroll(int(amount) * self._visible_rows())
+        else:
+            self.scroll(int(amount))
+
+    def _on_arrow(self, step):
+        """Move the selection, scrolling when it would leave the view"""
+        selection = self.tree.selection()
+        if not selection or not self._items:
+            return None  # Let the Treeview handle it
+        position = self._items.index(selection[0])
+        if 0 <= position + step < len(self._items):
+            return None
+        self.scroll(step)
+        # The edge item now shows the next row; move the selection onto it
+        index = max(min(position, len(self._items) - 1), 0)
+        self.tree.selection_set(self._items[index])
+        self.tree.focus(self._items[index])
+        return "break"
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            values = self.tree.item(selection[0], 'values')
+            self._selected_key = values[0] if values else None
+
+    def _schedule_render(self):
+        if self._render_pending is None:
+            self._render_pending = self.after_idle(self._render)
+
+    def _render(self):
+        """Point the Treeview items at the rows in view"""
+        if self._render_pending is not None:
+            self.after_cancel(self._render_pending)
+            self._render_pending = None
+        if not self.winfo_exists():
+            return
+
+        visible = self._visible_rows()
+        self.first = max(min(self.first, self.total - visible), 0)
+        count = min(visible, self.total - self.first)
+
+        # Keep exactly one item per visible row
+        while len(self._items) < count:
+            self._items.append(self.tree.insert('', 'end', values=()))
+        while len(self._items) > count:
+            self.tree.delete(self._items.pop())
+
+        selected = None
+        for offset, item in enumerate(self._items):
+            row = self._row(self.first + offset)
+            self.tree.item(item, values=row if row is not None else ())
+            if row is not None and self._selected_key is not None and str(row[0]) == str(self._selected_key):
+                selected = item
+        if selected is not None:
+            self.tree.selection_set(selected)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        # Load the blocks in view and the screen below it
+        for position in (self.first, self.first + count - 1, self.first + count + visible):
+            if 0 <= position < self.total:
+                self._request(position // self.block_size)
+
+        if self.total:
+            self.scrollbar.set(self.first / self.total, (self.first + count) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _row(self, position):
+        rows = self._blocks.get(position // self.block_size)
+        if rows is None:
+            return None
+        self._blocks.move_to_end(position // self.block_size)
+        offset = position % self.block_size
+        return rows[offset] if offset < len(rows) else None
+
+    def _request(self, block):
+        if block in self._blocks or block in self._pending or block in self._failed:
+            return
+        self._pending.add(block)
+        generation = self._generation
+
+        def done(rows):
+            if generation != self._generation or not self.winfo_exists():
+                return  # Reset or destroyed while loading
+            self._pending.discard(block)
+            if rows is None:
+                self._failed.add(block)
+                return
+            self._blocks[block] = rows
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+            self._schedule_render()
+
+        self.load_block(block, done)
@@ -7,6 +7,7 @@ THEME = {
         "secondary": "#6c757d",
         "secondary_hover": "#495057",
         "danger": "#dc3545",
+        "warning": "#ffc107",
         "success": "#28a745",  # Added success color
         "success_hover": "#218838",  # Added success hover color
         "background": "#f5f5f5",
@@ -32,4 +33,30 @@ BUTTON_COLORS = {
     "secondary": ("#6c757d", "#495057"),
     "danger": ("#dc3545", "#c82333"),
     "success": (THEME["colors"]["success"], THEME["colors"]["success_hover"])
-}
\ No newline at end of file
+}
+
+# Database settings
+DATABASE = {
+    "path": "exam_management.db",
+    # Commit concurrent exam submissions together in small groups. The
+    # queue is per process, so it only helps when one process takes many
+    # submissions at once; writes made through it wait for their group
+    "write_queue": {
+        "enabled": False,
+        "max_batch": 32,
+        "max_delay": 0.005  # seconds
+    },
+    # Least seconds between two autosaves of an in-progress attempt's answers
+    "autosave_interval": 5.0,
+    # Seconds a submission may arrive after its attempt's deadline
+    "deadline_grace": 30,
+    # Per-method query statistics and slow-query log
+    "instrumentation": {
+        "enabled": False,
+        "slow_query_threshold": 0.1,  # seconds
+        "slow_query_log": "slow_queries.log",
+        "max_log_bytes": 1048576,
+        "log_backups": 3,
+        "stats_file": "query_stats.json"  # written on exit
+    }
+}
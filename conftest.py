@@ -0,0 +1,74 @@
+"""Shared pytest fixtures
+
+Every test works on its own database in a temporary directory; the
+shipped exam_management.db is only ever copied.
+"""
+import sqlite3
+
+import pytest
+
+from database_manager import DatabaseManager
+
+TIME_LIMIT = 30  # minutes
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'exam.db')
+
+
+@pytest.fixture
+def db(db_path):
+    manager = DatabaseManager(db_path)
+    yield manager
+    manager.close_all()
+
+
+@pytest.fixture
+def rows(db_path):
+    """rows(sql, params=()) -> every row of a query, read on a fresh connection"""
+    def query(sql, params=()):
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+    return query
+
+
+@pytest.fixture
+def execute(db_path):
+    """execute(sql, params=()) -> run and commit a statement behind the manager's back"""
+    def run(sql, params=()):
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+    return run
+
+
+@pytest.fixture
+def exam(db):
+    """A batch of three trainees with one three-question exam keyed A, B, C"""
+    trainer_id = db.insert_record('trainers', {'name': 'Trainer', 'hire_date': '2024-01-01'})
+    batch_id = db.insert_record('batches', {
+        'batch_year': '2024', 'num_trainees': 3, 'training_duration': '3 months', 'trainer_id': trainer_id
+    })
+    trainees = [
+        db.insert_record('trainees', {
+            'name': f'Trainee {n}', 'id_no': f'ID-{n}', 'uli': f'ULI-{n}',
+            'batch_id': batch_id, 'batch_year': 2024, 'status': 'Active'
+        })
+        for n in range(3)
+    ]
+    exam_id = db.insert_exam('Module 1', 'M1', 3, TIME_LIMIT, batch_id)
+    questions = [
+        db.save_question(exam_id, f'Question {n}', {'A': 'a', 'B': 'b', 'C': 'c', 'D': 'd'}, correct)
+        for n, correct in enumerate('ABC')
+    ]
+    return {
+        'batch_id': batch_id, 'exam_id': exam_id, 'time_limit': TIME_LIMIT,
+        'trainees': trainees, 'questions': questions
+    }
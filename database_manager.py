@@ -1,151 +1,233 @@
+import json
+import math
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from answer_keys import NO_ANSWER, AnswerKeyCache
+from item_analysis import ItemAnalysisCache, analyze_matrix, response_matrix
+from migrations import apply_migrations, rebuild_statistics, rebuild_trainee_progress
+from records import (
+    TABLE_RECORDS, AttemptDraft, AvailableExam, Exam, ExamQuestion, Question,
+    QuestionOption, TraineeResult, columns, record_factory
+)
+from query_stats import InstrumentedCursor, QueryStats, format_summary
+from write_queue import GroupCommitQueue
 
 class DatabaseManager:
-    def __init__(self, db_name='exam_management.db'):
+    # Connection settings applied once per connection
+    BUSY_TIMEOUT = 30  # seconds to wait for a write lock before failing
+    STATEMENT_CACHE_SIZE = 256
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -16000",  # 16 MB page cache
+        "PRAGMA mmap_size = 268435456",  # 256 MB memory-mapped I/O
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA foreign_keys = ON",
+    )
+    # Infrastructure methods left out of query instrumentation
+    UNINSTRUMENTED_METHODS = {
+        'connect', 'close', 'close_all', 'connection', 'transaction',
+        'migrate_schema', 'explain_query_plan', 'enable_write_queue',
+        'disable_write_queue', 'enable_instrumentation', 'get_query_stats',
+        'format_query_stats', 'dump_query_stats'
+    }
+
+    def __init__(self, db_name='exam_management.db', deadline_grace=30):
         """
-        Initialize the database connection and create tables if they don't exist
+        Initialize the database connection and apply any pending schema migrations
+
+        Args:
+            db_name: Path of the SQLite database
+            deadline_grace: Seconds a submission may arrive after its
+                attempt's deadline and still be accepted
         """
         self.db_name = db_name
-        self.conn = None
-        self.cursor = None
-        self.create_tables()
+        self.deadline_grace = deadline_grace
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._write_queue = None
+        self._stats = None
+        self._answer_keys = AnswerKeyCache()
+        self._item_analysis = ItemAnalysisCache()
         self.migrate_schema()  # Ensure schema is up-to-date
 
+    @property
+    def conn(self):
+        """The calling thread's long-lived connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+        return conn
+
+    @property
+    def cursor(self):
+        """The cursor of the innermost connect() on the calling thread"""
+        cursors = getattr(self._local, 'cursors', None)
+        return cursors[-1] if cursors else None
+
+    def _open_connection(self):
+        """Open a new connection and apply the connection PRAGMAs"""
+        # Each connection is only used by the thread that opened it;
+        # check_same_thread is off so close_all() can close them all
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=self.BUSY_TIMEOUT,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            check_same_thread=False
+        )
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
     def connect(self):
-        """Establish a database connection"""
+        """Acquire a cursor on the calling thread's persistent connection"""
         try:
-            self.conn = sqlite3.connect(self.db_name)
-            self.cursor = self.conn.cursor()
+            if self._stats is not None:
+                cursor = self.conn.cursor(InstrumentedCursor)
+                cursor.stats = self._stats
+            else:
+                cursor = self.conn.cursor()
+            if not hasattr(self._local, 'cursors'):
+                self._local.cursors = []
+            self._local.cursors.append(cursor)
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
 
     def close(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
+        """Release the cursor acquired by the matching connect()
 
-    def create_tables(self):
-        """Create all necessary tables for the exam management system"""
+        The underlying connection stays open for reuse. Work left
+        uncommitted by the outermost caller is rolled back, just as
+        closing a connection would have discarded it.
+        """
+        cursors = getattr(self._local, 'cursors', None)
+        if not cursors:
+            return
+        cursors.pop().close()
+        if not cursors and self._local.conn.in_transaction:
+            self._local.conn.rollback()
+
+    def close_all(self):
+        """Close every connection opened by this manager (call on shutdown)"""
+        self.disable_write_queue()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def enable_write_queue(self, max_batch=32, max_delay=0.005):
+        """Route exam submissions through a group-commit writer thread
+
+        Concurrent submit_exam_result() calls are then committed together in
+        small groups within one transaction; each caller still gets its own
+        score back.
+        """
+        if self._write_queue is None:
+            self._write_queue = GroupCommitQueue(self, max_batch, max_delay)
+
+    def disable_write_queue(self):
+        """Flush pending queued writes and go back to direct commits"""
+        if self._write_queue is not None:
+            write_queue, self._write_queue = self._write_queue, None
+            write_queue.stop()
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a cursor on the persistent connection"""
         self.connect()
-        print("Creating tables...")  # Debug print
-        
-        # Trainers Table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS trainers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            class_assigned TEXT,
-            contact_email TEXT UNIQUE,
-            hire_date DATE NOT NULL
-        )
-        ''')
-
-        # Batches Table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS batches (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            batch_year TEXT NOT NULL,
-            num_trainees INTEGER CHECK (num_trainees >= 0),
-            training_duration TEXT NOT NULL,
-            training_location TEXT,
-            trainer_id INTEGER,
-            FOREIGN KEY (trainer_id) REFERENCES trainers(id) ON DELETE SET NULL
-        )
-        ''')
-
-        # Trainees Table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS trainees (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            id_no TEXT UNIQUE NOT NULL,
-            uli TEXT UNIQUE,
-            batch_id INTEGER NOT NULL,
-            batch_year INTEGER NOT NULL,
-            exams_taken INTEGER DEFAULT 0,
-            status TEXT CHECK (status IN ('Active', 'Inactive', 'Completed')),
-            remarks TEXT,
-            FOREIGN KEY (batch_id) REFERENCES batches(id) ON DELETE CASCADE
-        )
-        ''')
-
-        # Exams Table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS exams (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            module_no TEXT NOT NULL,
-            num_items INTEGER NOT NULL CHECK (num_items > 0),
-            time_limit INTEGER NOT NULL CHECK (time_limit > 0),
-            batch_id INTEGER NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'Active' CHECK (status IN ('Active', 'Inactive')),
-            FOREIGN KEY (batch_id) REFERENCES batches(id) ON DELETE CASCADE
-        )
-        ''')
-
-        # Questions Table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS questions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            exam_id INTEGER NOT NULL,
-            question_text TEXT NOT NULL,
-            correct_answer TEXT NOT NULL,  -- Format: "*A:Text|B:Text|C:Text|D:Text"
-            points INTEGER DEFAULT 1 CHECK (points > 0),
-            question_type TEXT DEFAULT 'multiple_choice',
-            FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
-        )
-        ''')
-
-        # Results Table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS results (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            trainee_id INTEGER NOT NULL,
-            exam_id INTEGER NOT NULL,
-            score INTEGER NOT NULL CHECK (score >= 0),
-            total_items INTEGER NOT NULL CHECK (total_items > 0),
-            percentage REAL CHECK (percentage >= 0 AND percentage <= 100),
-            time_spent INTEGER NOT NULL,  -- in seconds
-            date_taken DATETIME DEFAULT CURRENT_TIMESTAMP,
-            status TEXT CHECK (status IN ('Passed', 'Failed')),
-            attempt_number INTEGER DEFAULT 1,
-            FOREIGN KEY (trainee_id) REFERENCES trainees(id) ON DELETE CASCADE,
-            FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
-        )
-        ''')
+        try:
+            yield self.cursor
+        finally:
+            self.close()
 
-        self.conn.commit()
-        self.close()
+    @contextmanager
+    def transaction(self, immediate=True):
+        """Context manager running its body in a single transaction
 
-    def migrate_schema(self):
-        """Ensure the database schema is up-to-date."""
+        Commits on success and rolls back on any exception. BEGIN IMMEDIATE
+        takes the write lock up front so concurrent writers wait on the busy
+        timeout instead of failing mid-transaction. Nested use joins the
+        enclosing transaction.
+        """
         self.connect()
+        conn = self.conn
+        outermost = not conn.in_transaction
         try:
-            # Check and add percentage column to results table
-            self.cursor.execute("PRAGMA table_info(results)")
-            columns = [col[1] for col in self.cursor.fetchall()]
-            
-            if 'percentage' not in columns:
-                self.cursor.execute("""
-                ALTER TABLE results 
-                ADD COLUMN percentage REAL CHECK (percentage >= 0 AND percentage <= 100)
-                """)
-            
-            # Update existing results with calculated percentages
-            self.cursor.execute("""
-                UPDATE results 
-                SET percentage = (CAST(score AS FLOAT) / total_items) * 100
-                WHERE percentage IS NULL AND total_items > 0
-            """)
-            
-            self.conn.commit()
-        except sqlite3.Error as e:
-            print(f"Schema migration error: {e}")
+            if outermost:
+                self._begin(conn, immediate)
+            yield self.cursor
+            if outermost:
+                conn.commit()
+        except Exception:
+            if outermost:
+                conn.rollback()
+            raise
         finally:
             self.close()
 
+    def _begin(self, conn, immediate=True):
+        """Start a transaction, recording any wait for the write lock"""
+        start = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        if self._stats is not None:
+            self._stats.record_lock_wait(time.perf_counter() - start)
+
+    def enable_instrumentation(self, slow_threshold=0.1, slow_log_path='slow_queries.log',
+                               max_bytes=1_048_576, backup_count=3):
+        """Start collecting per-method query statistics
+
+        Every public method is wrapped to record call counts, wall time
+        histograms, rows returned and time spent waiting on the write lock.
+        Statements slower than slow_threshold seconds are logged with their
+        query plan to a rotating slow-query log.
+        """
+        if self._stats is not None:
+            return
+        self._stats = QueryStats(slow_threshold, slow_log_path, max_bytes, backup_count)
+        for name in dir(type(self)):
+            if name.startswith('_') or name in self.UNINSTRUMENTED_METHODS:
+                continue
+            # Look up on the class so properties such as conn are skipped
+            if callable(getattr(type(self), name)):
+                setattr(self, name, self._stats.wrap(name, getattr(self, name)))
+
+    def get_query_stats(self):
+        """Per-method statistics collected so far, or None if not enabled"""
+        return self._stats.summary() if self._stats is not None else None
+
+    def format_query_stats(self):
+        """Text table of the collected statistics"""
+        if self._stats is None:
+            return "Query instrumentation is not enabled."
+        return format_summary(self._stats.summary())
+
+    def dump_query_stats(self, path):
+        """Write collected statistics to a JSON file"""
+        if self._stats is not None:
+            self._stats.dump(path)
+
+    def migrate_schema(self):
+        """Bring the schema up to date by applying pending migrations"""
+        with self.connection():
+            return apply_migrations(self.conn)
+
+    def explain_query_plan(self, sql, params=()):
+        """Return the EXPLAIN QUERY PLAN detail lines for a statement"""
+        with self.connection() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[3] for row in cursor.fetchall()]
+
     def insert_trainer(self, name, class_assigned, contact_email=None, hire_date=None):
         """Insert a new trainer"""
         self.connect()
@@ -178,14 +260,14 @@ class DatabaseManager:
         finally:
             self.close()
 
-    def insert_trainee(self, name, id_no, uli, batch_year, trainer_name, batch_id, status=None, remarks=None):
+    def insert_trainee(self, name, id_no, uli, batch_year, batch_id, status=None, remarks=None):
         """Insert a new trainee"""
         self.connect()
         try:
             self.cursor.execute('''
-            INSERT INTO trainees (name, id_no, uli, batch_year, trainer_name, batch_id, status, remarks)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (name, id_no, uli, batch_year, trainer_name, batch_id, status, remarks))
+            INSERT INTO trainees (name, id_no, uli, batch_year, batch_id, status, remarks)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (name, id_no, uli, batch_year, batch_id, status, remarks))
             self.conn.commit()
             return self.cursor.lastrowid
         except sqlite3.Error as e:
@@ -210,14 +292,15 @@ class DatabaseManager:
         finally:
             self.close()
 
-    def insert_result(self, trainee_id, trainer_id, exam_id, competency, date_taken, remarks=None):
-        """Insert exam result for a trainee"""
+    def insert_result(self, trainee_id, exam_id, score, total_items, time_spent, date_taken):
+        """Insert an already scored exam result for a trainee"""
+        percentage = (score / total_items) * 100
         self.connect()
         try:
             self.cursor.execute('''
-            INSERT INTO results (trainee_id, trainer_id, exam_id, competency, date_taken, remarks)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', (trainee_id, trainer_id, exam_id, competency, date_taken, remarks))
+            INSERT INTO results (trainee_id, exam_id, score, total_items, percentage, time_spent, date_taken, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CASE WHEN ? >= 75 THEN 'Passed' ELSE 'Failed' END)
+            ''', (trainee_id, exam_id, score, total_items, percentage, time_spent, date_taken, percentage))
             self.conn.commit()
             return self.cursor.lastrowid
         except sqlite3.Error as e:
@@ -230,7 +313,12 @@ class DatabaseManager:
         """Retrieve all records from a specified table"""
         self.connect()
         try:
-            self.cursor.execute(f"SELECT * FROM {table_name}")
+            record_type = TABLE_RECORDS.get(table_name)
+            if record_type is None:
+                raise ValueError(f"Invalid table name: {table_name}")
+
+            self.cursor.row_factory = record_factory(record_type)
+            self.cursor.execute(f"SELECT {columns(record_type)} FROM {table_name}")
             return self.cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Error retrieving records from {table_name}: {e}")
@@ -238,6 +326,134 @@ class DatabaseManager:
         finally:
             self.close()
 
+    def get_records_page(self, table_name, after=None, limit=100, sort_column='id', descending=False):
+        """Retrieve one page of records using keyset pagination
+
+        Rows are ordered by (sort_column, id). Instead of an OFFSET, each page
+        seeks past the last row of the previous one, so every page costs the
+        same however deep into the table it is.
+
+        Args:
+            table_name: Table to read (must be in TABLE_RECORDS)
+            after: Cursor returned with the previous page, or None for the first
+            limit: Maximum number of records in the page
+            sort_column: Column to order by; ties are broken by id
+            descending: Order from the highest value down
+
+        Returns:
+            (records, next_cursor) where next_cursor is None on the last page
+        """
+        record_type = TABLE_RECORDS.get(table_name)
+        if record_type is None:
+            raise ValueError(f"Invalid table name: {table_name}")
+        if sort_column not in record_type._fields:
+            raise ValueError(f"Invalid sort column for {table_name}: {sort_column}")
+
+        where, params = '', []
+        if after is not None:
+            last_value, last_id = after
+            if sort_column == 'id':
+                where = "WHERE id < ?" if descending else "WHERE id > ?"
+                params = [last_id]
+            # NULLs sort first ascending and last descending
+            elif last_value is None:
+                if descending:
+                    where = f"WHERE {sort_column} IS NULL AND id < ?"
+                else:
+                    where = f"WHERE ({sort_column} IS NULL AND id > ?) OR {sort_column} IS NOT NULL"
+                params = [last_id]
+            elif descending:
+                where = f"WHERE ({sort_column}, id) < (?, ?) OR {sort_column} IS NULL"
+                params = [last_value, last_id]
+            else:
+                where = f"WHERE ({sort_column}, id) > (?, ?)"
+                params = [last_value, last_id]
+
+        direction = 'DESC' if descending else 'ASC'
+        order_by = f"id {direction}" if sort_column == 'id' else f"{sort_column} {direction}, id {direction}"
+
+        self.connect()
+        try:
+            self.cursor.row_factory = record_factory(record_type)
+            # Fetch one extra row to learn whether another page follows
+            self.cursor.execute(f"""
+                SELECT {columns(record_type)}
+                FROM {table_name}
+                {where}
+                ORDER BY {order_by}
+                LIMIT ?
+            """, params + [limit + 1])
+            records = self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error retrieving records from {table_name}: {e}")
+            return [], None
+        finally:
+            self.close()
+
+        if len(records) <= limit:
+            return records, None
+        records = records[:limit]
+        last = records[-1]
+        return records, (getattr(last, sort_column), last.id)
+
+    def count_records(self, table_name):
+        """Number of rows in a table
+
+        SQLite counts over the table's smallest index, so this stays cheap
+        at a million rows where reading the ids would not.
+        """
+        if table_name not in TABLE_RECORDS:
+            raise ValueError(f"Invalid table name: {table_name}")
+        with self.connection() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            return cursor.fetchone()[0]
+
+    def get_page_cursor(self, table_name, after, rows):
+        """Return the id-order cursor that lies rows rows past another
+
+        Lets a view jump to a page it has not scrolled through: passing the
+        result to get_records_page() returns the rows from there on. Only
+        the ids between the two cursors are stepped over, so jumps near a
+        known cursor stay cheap.
+
+        Args:
+            after: A cursor from get_records_page() or this method, or None
+                for the start of the table
+            rows: Rows to skip, at least 1
+
+        Returns:
+            The cursor, or None if the table has fewer rows
+        """
+        if table_name not in TABLE_RECORDS:
+            raise ValueError(f"Invalid table name: {table_name}")
+        with self.connection() as cursor:
+            cursor.execute(f"""
+                SELECT id FROM {table_name}
+                WHERE id > ?
+                ORDER BY id
+                LIMIT 1 OFFSET ?
+            """, (0 if after is None else after[1], rows - 1))
+            row = cursor.fetchone()
+        return None if row is None else (row[0], row[0])
+
+    def get_following_ids(self, table_name, ids):
+        """Return the id following each given id in a table, or None after the last
+
+        Each lookup is a single seek on the primary key, so page cursors
+        can be moved past a deleted row without recounting the table.
+        """
+        if table_name not in TABLE_RECORDS:
+            raise ValueError(f"Invalid table name: {table_name}")
+        if not ids:
+            return []
+        with self.connection() as cursor:
+            cursor.execute(f"""
+                SELECT (SELECT MIN(id) FROM {table_name} WHERE id > given.value)
+                FROM json_each(?) AS given
+                ORDER BY given.key
+            """, (json.dumps(list(ids)),))
+            return [row[0] for row in cursor.fetchall()]
+
     def update_record(self, table_name, record_id, update_data):
         """Update a record in a specified table"""
         self.connect()
@@ -278,19 +494,15 @@ class DatabaseManager:
         self.connect()
         try:
             # Whitelist of allowed table names
-            allowed_tables = {'exams', 'trainers', 'batches', 'trainees', 'results', 'questions'}
-            if table_name not in allowed_tables:
+            record_type = TABLE_RECORDS.get(table_name)
+            if record_type is None:
                 raise ValueError(f"Invalid table name: {table_name}")
             
-            if table_name == 'exams':
-                # Explicitly specify the column order for exams table
-                self.cursor.execute("""
-                    SELECT id, title, module_no, num_items, time_limit, 
-                        batch_id, created_at, status 
-                    FROM exams WHERE id = ?
-                """, (record_id,))
-            else:
-                self.cursor.execute(f"SELECT * FROM {table_name} WHERE id = ?", (record_id,))
+            self.cursor.row_factory = record_factory(record_type)
+            self.cursor.execute(
+                f"SELECT {columns(record_type)} FROM {table_name} WHERE id = ?",
+                (record_id,)
+            )
             return self.cursor.fetchone()
         except sqlite3.Error as e:
             print(f"Error retrieving record from {table_name}: {e}")
@@ -324,8 +536,9 @@ class DatabaseManager:
         """Retrieve exams available for a specific batch"""
         self.connect()
         try:
-            self.cursor.execute("""
-                SELECT id, title, module_no, num_items, time_limit 
+            self.cursor.row_factory = record_factory(Exam)
+            self.cursor.execute(f"""
+                SELECT {columns(Exam)}
                 FROM exams 
                 WHERE batch_id = ?
             """, (batch_id,))
@@ -340,8 +553,9 @@ class DatabaseManager:
         """Retrieve questions for a specific exam"""
         self.connect()
         try:
-            self.cursor.execute("""
-                SELECT id, question_text, correct_answer, points 
+            self.cursor.row_factory = record_factory(Question)
+            self.cursor.execute(f"""
+                SELECT {columns(Question)}
                 FROM questions 
                 WHERE exam_id = ?
             """, (exam_id,))
@@ -352,77 +566,318 @@ class DatabaseManager:
         finally:
             self.close()
 
+    def _write(self, operation, *args):
+        """Run operation(cursor, *args) in one write transaction
+
+        Goes through the group-commit queue when it is enabled, otherwise
+        through a transaction of its own.
+        """
+        if self._write_queue is not None:
+            if self._stats is not None:
+                operation = self._stats.on_behalf_of_caller(operation)
+            future = self._write_queue.submit(operation, *args)
+            start = time.perf_counter()
+            try:
+                return future.result()
+            finally:
+                # Waiting on the group commit is this caller's lock wait
+                if self._stats is not None:
+                    self._stats.record_lock_wait(time.perf_counter() - start)
+
+        with self.transaction() as cursor:
+            return operation(cursor, *args)
+
     def submit_exam_result(self, trainee_id, exam_id, answers, time_spent):
         """Submit exam results and calculate score with proper transaction handling."""
-        self.connect()
         try:
-            # Start transaction
-            self.conn.execute("BEGIN TRANSACTION")
-            
-            # Get questions and calculate score
-            self.cursor.execute("""
-                SELECT id, correct_answer, points FROM questions WHERE exam_id = ?
-            """, (exam_id,))
-            questions = self.cursor.fetchall()
-            
-            if not questions:
-                raise ValueError("No questions found for this exam")
-                
-            total_points = sum(q[2] for q in questions)
-            score = sum(q[2] for q in questions if answers.get(q[0]) == q[1])
-            percentage = (score / total_points) * 100 if total_points > 0 else 0
-            
-            # Insert result
-            self.cursor.execute("""
-                INSERT INTO results (
-                    trainee_id, exam_id, score, total_items, 
-                    percentage, time_spent, date_taken, status
-                )
-                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, 
-                    CASE WHEN ? >= 75 THEN 'Passed' ELSE 'Failed' END)
-            """, (trainee_id, exam_id, score, total_points, percentage, 
-                  time_spent, percentage))
-            
-            # Update trainee's exam count
-            self.cursor.execute("""
-                UPDATE trainees 
-                SET exams_taken = exams_taken + 1
-                WHERE id = ?
-            """, (trainee_id,))
-            
-            # Commit transaction
-            self.conn.commit()
-            
-            return {
-                'score': score,
-                'total_items': total_points,
-                'percentage': percentage
-            }
-            
+            return self._write(self._record_exam_result, trainee_id, exam_id, answers, time_spent)
         except Exception as e:
-            # Rollback on error
-            self.conn.rollback()
             print(f"Error submitting exam result: {e}")
             raise
-        finally:
-            self.close()
+
+    def finalize_attempt(self, trainee_id, exam_id, answers, time_spent):
+        """Score and record an exam attempt and update the trainee's status
+
+        Scoring, the result and response inserts, exams_taken and the
+        status transition all happen in one write transaction, so a
+        submission takes the write lock once.
+
+        Returns:
+            The submit_exam_result() dict plus 'trainee_status', the
+            update_trainee_status() dict
+        """
+        try:
+            return self._write(self._finalize_attempt, trainee_id, exam_id, answers, time_spent)
+        except Exception as e:
+            print(f"Error finalizing exam attempt: {e}")
+            raise
+
+    def _finalize_attempt(self, cursor, trainee_id, exam_id, answers, time_spent):
+        result = self._record_exam_result(cursor, trainee_id, exam_id, answers, time_spent)
+        result['trainee_status'] = self._update_trainee_status(cursor, trainee_id)
+        return result
+
+    def submit_exam_result_async(self, trainee_id, exam_id, answers, time_spent):
+        """Queue an exam submission and return a Future for its score
+
+        Requires enable_write_queue(); the Future resolves once the group the
+        submission was committed with is durable.
+        """
+        if self._write_queue is None:
+            raise RuntimeError("Write queue is not enabled")
+        operation = self._record_exam_result
+        if self._stats is not None:
+            operation = self._stats.on_behalf_of_caller(operation)
+        return self._write_queue.submit(operation, trainee_id, exam_id, answers, time_spent)
+
+    def _record_exam_result(self, cursor, trainee_id, exam_id, answers, time_spent):
+        """Score a submission and insert its result inside the caller's transaction
+
+        A submission arriving after its attempt's deadline (plus the
+        configured grace) is not trusted: the answers autosaved before the
+        deadline are recorded instead, with the full time limit spent. The
+        reported time spent is never recorded above the exam's time limit,
+        so skipping start_attempt() cannot bypass the deadline.
+        """
+        # Score against the compiled answer key
+        key = self._answer_keys.get(cursor, exam_id)
+        if not len(key):
+            raise ValueError("No questions found for this exam")
+
+        cursor.execute("""
+            SELECT e.time_limit, d.answers,
+                   julianday('now') > julianday(d.expires_at, '+' || ? || ' seconds')
+            FROM exams e
+            LEFT JOIN attempt_drafts d ON d.exam_id = e.id AND d.trainee_id = ?
+            WHERE e.id = ?
+        """, (self.deadline_grace, trainee_id, exam_id))
+        time_limit, draft_answers, expired = cursor.fetchone()
+        expired = bool(expired)
+        if expired:
+            answers = self._decode_answers(draft_answers)
+            time_spent = time_limit * 60
+        time_spent = min(max(int(time_spent), 0), time_limit * 60)
+
+        total_points = key.total_points
+        score, responses = key.grade(answers)
+        percentage = (score / total_points) * 100 if total_points > 0 else 0
+
+        # Insert result
+        cursor.execute("""
+            INSERT INTO results (
+                trainee_id, exam_id, score, total_items, 
+                percentage, time_spent, date_taken, status
+            )
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, 
+                CASE WHEN ? >= 75 THEN 'Passed' ELSE 'Failed' END)
+        """, (trainee_id, exam_id, score, total_points, percentage, 
+              time_spent, percentage))
+        result_id = cursor.lastrowid
+
+        # Keep every answer for per-question statistics
+        cursor.executemany("""
+            INSERT INTO responses (
+                result_id, question_id, chosen_option, is_correct, points_awarded
+            )
+            VALUES (?, ?, ?, ?, ?)
+        """, [(result_id, *response) for response in responses])
+
+        # exams_taken counts distinct exams, as update_trainee_status() does;
+        # the progress trigger has already added this exam's row
+        cursor.execute("""
+            UPDATE trainees
+            SET exams_taken = (
+                SELECT COUNT(*) FROM trainee_exam_progress WHERE trainee_id = ?
+            )
+            WHERE id = ?
+        """, (trainee_id, trainee_id))
+
+        # The attempt is recorded; its autosaved draft is no longer needed
+        cursor.execute("""
+            DELETE FROM attempt_drafts WHERE trainee_id = ? AND exam_id = ?
+        """, (trainee_id, exam_id))
+
+        return {
+            'result_id': result_id,
+            'score': score,
+            'total_items': total_points,
+            'percentage': percentage,
+            'expired': expired
+        }
+
+    def save_attempt_draft(self, trainee_id, exam_id, answers, elapsed_seconds):
+        """Autosave an in-progress attempt's answers, replacing its last draft
+
+        Args:
+            answers: {question id: option label} of the answered questions
+            elapsed_seconds: Time the trainee has spent on the attempt so far
+        """
+        self._write(
+            self._save_attempt_draft, trainee_id, exam_id,
+            json.dumps(answers, separators=(',', ':')), elapsed_seconds
+        )
+
+    def _save_attempt_draft(self, cursor, trainee_id, exam_id, answers_json, elapsed_seconds):
+        # Answers changed after the deadline are not accepted
+        cursor.execute("""
+            INSERT INTO attempt_drafts (
+                trainee_id, exam_id, answers, elapsed_seconds, updated_at
+            )
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (trainee_id, exam_id) DO UPDATE SET
+                answers = excluded.answers,
+                elapsed_seconds = excluded.elapsed_seconds,
+                updated_at = excluded.updated_at
+            WHERE attempt_drafts.expires_at IS NULL
+               OR julianday('now') <= julianday(attempt_drafts.expires_at, '+' || ? || ' seconds')
+        """, (trainee_id, exam_id, answers_json, elapsed_seconds, self.deadline_grace))
+
+    def start_attempt(self, trainee_id, exam_id):
+        """Open a trainee's attempt at an exam, fixing its deadline
+
+        The deadline is set from the exam's time limit the first time the
+        attempt starts and kept when it is resumed, so time spent away from
+        the exam still counts.
+
+        Returns:
+            The attempt's AttemptDraft, or None if the exam does not exist
+        """
+        return self._write(self._start_attempt, trainee_id, exam_id)
+
+    def _start_attempt(self, cursor, trainee_id, exam_id):
+        # A draft autosaved before deadlines were kept gets one from its
+        # elapsed time
+        cursor.execute("""
+            INSERT INTO attempt_drafts (trainee_id, exam_id, expires_at)
+            SELECT ?, id, datetime('now', '+' || (time_limit * 60) || ' seconds')
+            FROM exams
+            WHERE id = ?
+            ON CONFLICT (trainee_id, exam_id) DO UPDATE SET
+                expires_at = COALESCE(
+                    attempt_drafts.expires_at,
+                    datetime(excluded.expires_at, '-' || attempt_drafts.elapsed_seconds || ' seconds')
+                )
+        """, (trainee_id, exam_id))
+        return self._fetch_attempt_draft(cursor, trainee_id, exam_id)
+
+    def get_attempt_draft(self, trainee_id, exam_id):
+        """Return the AttemptDraft saved for a trainee's exam, or None"""
+        with self.connection() as cursor:
+            return self._fetch_attempt_draft(cursor, trainee_id, exam_id)
+
+    def _fetch_attempt_draft(self, cursor, trainee_id, exam_id):
+        cursor.execute("""
+            SELECT trainee_id, exam_id, answers, elapsed_seconds, updated_at, expires_at,
+                   (julianday(expires_at) - julianday('now')) * 86400
+            FROM attempt_drafts
+            WHERE trainee_id = ? AND exam_id = ?
+        """, (trainee_id, exam_id))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return AttemptDraft(row[0], row[1], self._decode_answers(row[2]), *row[3:])
+
+    @staticmethod
+    def _decode_answers(answers_json):
+        # JSON object keys are strings; question ids are ints
+        return {int(question_id): label for question_id, label in json.loads(answers_json).items()}
+
+    def rescore_exam(self, exam_id, dry_run=False):
+        """Regrade every stored response of an exam against its current key
+
+        Scores, percentages and Passed/Failed statuses are recomputed with
+        NumPy and the changed rows are written back in one transaction,
+        together with the status of every trainee whose results changed.
+        Results submitted before responses were stored cannot be regraded
+        and are only counted in the report.
+
+        Args:
+            exam_id: The exam whose results to regrade
+            dry_run: Compute the report without writing anything
+
+        Returns:
+            Report dict with the counts of checked and changed results and
+            responses, status flips and a per-result list of changes
+        """
+        from rescoring import regrade
+
+        try:
+            with self.transaction() as cursor:
+                key = self._answer_keys.get(cursor, exam_id)
+                if not len(key):
+                    raise ValueError("No questions found for this exam")
+
+                cursor.execute("""
+                    SELECT id, trainee_id, score, total_items, percentage, status
+                    FROM results
+                    WHERE exam_id = ?
+                """, (exam_id,))
+                results = cursor.fetchall()
+
+                cursor.execute("""
+                    SELECT rs.result_id, rs.question_id, COALESCE(rs.chosen_option, ?),
+                           rs.is_correct, rs.points_awarded
+                    FROM results r
+                    JOIN responses rs ON rs.result_id = r.id
+                    WHERE r.exam_id = ?
+                """, (NO_ANSWER, exam_id))
+                responses = cursor.fetchall()
+
+                response_updates, result_updates, report = regrade(key, responses, results)
+                report['exam_id'] = exam_id
+                report['dry_run'] = dry_run
+                if dry_run:
+                    return report
+
+                cursor.executemany("""
+                    UPDATE responses
+                    SET is_correct = ?, points_awarded = ?
+                    WHERE result_id = ? AND question_id = ?
+                """, response_updates)
+                cursor.executemany("""
+                    UPDATE results
+                    SET score = ?, total_items = ?, percentage = ?, status = ?
+                    WHERE id = ?
+                """, result_updates)
+                # A flipped Passed/Failed can complete or reopen a trainee
+                for trainee_id in sorted({change['trainee_id'] for change in report['changes']}):
+                    self._update_trainee_status(cursor, trainee_id)
+                return report
+        except Exception as e:
+            print(f"Error rescoring exam {exam_id}: {e}")
+            raise
+
+    def count_exam_results(self, exam_id):
+        """Number of results recorded for an exam"""
+        with self.connection() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM results WHERE exam_id = ?", (exam_id,))
+            return cursor.fetchone()[0]
+
+    def get_answer_key(self, exam_id):
+        """Compile (or fetch from cache) an exam's answer key
+
+        Called when an exam is loaded so the submissions at its end find
+        the key ready.
+        """
+        with self.connection() as cursor:
+            return self._answer_keys.get(cursor, exam_id)
 
     def get_available_exams(self, trainee_id):
         """Get exams available for a trainee that haven't been taken yet."""
         self.connect()
         try:
+            self.cursor.row_factory = record_factory(AvailableExam)
             self.cursor.execute("""
                 SELECT 
                     e.id, e.title, e.module_no, e.num_items, e.time_limit,
-                    CASE WHEN r.id IS NULL THEN 'Not Taken' ELSE 'Completed' END AS status
+                    CASE WHEN p.exam_id IS NULL THEN 'Not Taken' ELSE 'Completed' END AS status
                 FROM exams e
-                LEFT JOIN results r ON e.id = r.exam_id AND r.trainee_id = ?
+                LEFT JOIN trainee_exam_progress p ON p.trainee_id = ? AND p.exam_id = e.id
                 WHERE e.batch_id = (SELECT batch_id FROM trainees WHERE id = ?)
                   AND e.status = 'Active'
                 ORDER BY e.module_no, e.title
             """, (trainee_id, trainee_id))
-            columns = ['id', 'title', 'module_no', 'num_items', 'time_limit', 'status']
-            return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+            return self.cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Error getting available exams: {e}")
             return []
@@ -439,29 +894,86 @@ class DatabaseManager:
             correct_answer: The correct option letter (A, B, C, or D)
             points: Points for this question
         """
-        self.connect()
         try:
-            # Format the correct_answer string as "*A:Text|B:Text|C:Text|D:Text"
-            options_str = []
-            for letter in ['A', 'B', 'C', 'D']:
-                if letter in options:
-                    prefix = '*' if letter == correct_answer else ''
-                    options_str.append(f"{prefix}{letter}:{options[letter]}")
-            
-            formatted_answer = '|'.join(options_str)
-            
-            self.cursor.execute('''
-            INSERT INTO questions (
-                exam_id, question_text, correct_answer, points, question_type
-            ) VALUES (?, ?, ?, ?, ?)
-            ''', (
-                exam_id, question_text, formatted_answer, points, 'multiple_choice'
-            ))
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.Error as e:
+            return self.save_question(exam_id, question_text, options, correct_answer, points)
+        except (sqlite3.Error, ValueError) as e:
             print(f"Error adding question: {e}")
             return None
+
+    def save_question(self, exam_id, question_text, options, correct_answer, points=1, question_id=None):
+        """Insert or update a question together with its options
+
+        Args:
+            exam_id: The ID of the exam this question belongs to
+            question_text: The question text
+            options: Dictionary of options {'A': 'text', 'B': 'text', ...}
+            correct_answer: The label of the correct option
+            points: Points for this question
+            question_id: The question to update, or None to insert a new one
+
+        Returns:
+            The question's id
+        """
+        if correct_answer not in options:
+            raise ValueError(f"Correct answer {correct_answer} is not one of the options")
+
+        with self.transaction() as cursor:
+            if question_id is None:
+                cursor.execute("""
+                    INSERT INTO questions (
+                        exam_id, question_text, correct_answer, points, question_type
+                    ) VALUES (?, ?, ?, ?, 'multiple_choice')
+                """, (exam_id, question_text, correct_answer, points))
+                question_id = cursor.lastrowid
+            else:
+                cursor.execute("""
+                    UPDATE questions
+                    SET exam_id = ?, question_text = ?, correct_answer = ?, points = ?
+                    WHERE id = ?
+                """, (exam_id, question_text, correct_answer, points, question_id))
+                cursor.execute("DELETE FROM question_options WHERE question_id = ?", (question_id,))
+
+            cursor.executemany("""
+                INSERT INTO question_options (question_id, position, label, text, is_correct)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                (question_id, position, label, text, int(label == correct_answer))
+                for position, (label, text) in enumerate(sorted(options.items()))
+            ])
+            return question_id
+
+    def get_exam_questions_with_options(self, exam_id):
+        """Retrieve an exam's questions and their options in one query
+
+        Returns ExamQuestion records in question id order, each carrying
+        its QuestionOption records in position order.
+        """
+        self.connect()
+        try:
+            self.cursor.execute("""
+                SELECT q.id, q.exam_id, q.question_text, q.points, q.question_type,
+                       o.position, o.label, o.text, o.is_correct
+                FROM questions q
+                LEFT JOIN question_options o ON o.question_id = q.id
+                WHERE q.exam_id = ?
+                ORDER BY q.id, o.position
+            """, (exam_id,))
+
+            questions = []
+            current, options = None, []
+            for row in self.cursor.fetchall():
+                if current is None or row[0] != current[0]:
+                    if current is not None:
+                        questions.append(ExamQuestion(*current, tuple(options)))
+                    current, options = row[:5], []
+                if row[5] is not None:
+                    options.append(QuestionOption(row[0], *row[5:]))
+            if current is not None:
+                questions.append(ExamQuestion(*current, tuple(options)))
+            return questions
+        except sqlite3.Error as e:
+            print(f"Error retrieving questions: {e}")
+            return []
         finally:
             self.close()
 
@@ -469,14 +981,13 @@ class DatabaseManager:
         """Get detailed exam information"""
         self.connect()
         try:
-            self.cursor.execute("""
-                SELECT id, title, module_no, num_items, time_limit, status
+            self.cursor.row_factory = record_factory(Exam)
+            self.cursor.execute(f"""
+                SELECT {columns(Exam)}
                 FROM exams
                 WHERE id = ? AND status = 'Active'
             """, (exam_id,))
-            columns = ['id', 'title', 'module_no', 'num_items', 'time_limit', 'status']
-            result = self.cursor.fetchone()
-            return dict(zip(columns, result)) if result else None
+            return self.cursor.fetchone()
         finally:
             self.close()
 
@@ -496,6 +1007,7 @@ class DatabaseManager:
         """Get exam results for a specific trainee"""
         self.connect()
         try:
+            self.cursor.row_factory = record_factory(TraineeResult)
             self.cursor.execute("""
                 SELECT 
                     e.title,
@@ -510,9 +1022,7 @@ class DatabaseManager:
                 WHERE r.trainee_id = ?
                 ORDER BY r.date_taken DESC
             """, (trainee_id,))
-            columns = ['exam_title', 'score', 'total_items', 'percentage', 
-                    'date_taken', 'time_spent', 'status']
-            return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+            return self.cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Error getting trainee results: {e}")
             return []
@@ -537,18 +1047,19 @@ class DatabaseManager:
                 
             batch_id, trainee_name, status, batch_year = trainee_info
             
-            # Get all exams for the batch and their status for this trainee
+            # Get all exams for the batch and this trainee's latest attempt at each
             self.cursor.execute("""
                 SELECT 
                     e.id,
                     e.title,
                     e.module_no,
                     e.num_items,
-                    COALESCE(r.status, 'Not Taken') as exam_status,
-                    COALESCE(r.percentage, 0) as score_percentage,
-                    r.date_taken
+                    COALESCE(p.last_status, 'Not Taken') as exam_status,
+                    COALESCE(p.last_percentage, 0) as score_percentage,
+                    p.last_date,
+                    COALESCE(p.passed, 0) as passed
                 FROM exams e
-                LEFT JOIN results r ON e.id = r.exam_id AND r.trainee_id = ?
+                LEFT JOIN trainee_exam_progress p ON p.trainee_id = ? AND p.exam_id = e.id
                 WHERE e.batch_id = ?
                 ORDER BY e.module_no, e.title
             """, (trainee_id, batch_id))
@@ -558,7 +1069,7 @@ class DatabaseManager:
             # Calculate overall progress
             total_exams = len(exams)
             completed_exams = sum(1 for exam in exams if exam[4] != 'Not Taken')
-            passed_exams = sum(1 for exam in exams if exam[4] == 'Passed')
+            passed_exams = sum(exam[7] for exam in exams)
             
             progress = {
                 'trainee_name': trainee_name,
@@ -594,13 +1105,12 @@ class DatabaseManager:
             # Check if batch exists and is active
             self.cursor.execute("""
                 SELECT b.id, b.batch_year, b.num_trainees,
-                       COUNT(DISTINCT t.id) as current_trainees,
-                       COUNT(DISTINCT e.id) as num_exams
+                       COALESCE(s.active_trainees, 0) as current_trainees,
+                       (SELECT COUNT(*) FROM exams e
+                        WHERE e.batch_id = b.id AND e.status = 'Active') as num_exams
                 FROM batches b
-                LEFT JOIN trainees t ON b.id = t.batch_id AND t.status = 'Active'
-                LEFT JOIN exams e ON b.id = e.batch_id AND e.status = 'Active'
+                LEFT JOIN batch_stats s ON s.batch_id = b.id
                 WHERE b.id = ?
-                GROUP BY b.id
             """, (batch_id,))
             
             batch_info = self.cursor.fetchone()
@@ -659,15 +1169,14 @@ class DatabaseManager:
                     b.batch_year,
                     b.training_duration,
                     t.name as trainer_name,
-                    COUNT(DISTINCT tr.id) as total_trainees,
-                    COUNT(DISTINCT e.id) as total_exams,
-                    COUNT(DISTINCT CASE WHEN tr.status = 'Active' THEN tr.id END) as active_trainees
+                    COALESCE(s.trainees, 0) as total_trainees,
+                    (SELECT COUNT(*) FROM exams e
+                     WHERE e.batch_id = b.id AND e.status = 'Active') as total_exams,
+                    COALESCE(s.active_trainees, 0) as active_trainees
                 FROM batches b
                 LEFT JOIN trainers t ON b.trainer_id = t.id
-                LEFT JOIN trainees tr ON b.id = tr.batch_id
-                LEFT JOIN exams e ON b.id = e.batch_id AND e.status = 'Active'
+                LEFT JOIN batch_stats s ON s.batch_id = b.id
                 WHERE b.id = ?
-                GROUP BY b.id
             """, (batch_id,))
             
             basic_info = self.cursor.fetchone()
@@ -680,13 +1189,12 @@ class DatabaseManager:
                     e.id,
                     e.title,
                     e.module_no,
-                    COUNT(DISTINCT r.trainee_id) as attempts,
-                    COUNT(DISTINCT CASE WHEN r.status = 'Passed' THEN r.trainee_id END) as passes,
-                    AVG(r.percentage) as avg_score
+                    COALESCE(s.trainees_attempted, 0) as attempts,
+                    COALESCE(s.trainees_passed, 0) as passes,
+                    s.percentage_sum / s.scored as avg_score
                 FROM exams e
-                LEFT JOIN results r ON e.id = r.exam_id
+                LEFT JOIN exam_stats s ON s.exam_id = e.id
                 WHERE e.batch_id = ? AND e.status = 'Active'
-                GROUP BY e.id
                 ORDER BY e.module_no, e.title
             """, (batch_id,))
             
@@ -797,31 +1305,33 @@ class DatabaseManager:
             self.cursor.execute("""
                 SELECT e.title, e.module_no, e.num_items, e.time_limit,
                        b.batch_year, t.name as trainer_name,
-                       COUNT(DISTINCT r.trainee_id) as total_attempts,
-                       COUNT(DISTINCT CASE WHEN r.status = 'Passed' THEN r.trainee_id END) as total_passes,
-                       AVG(r.percentage) as avg_score,
-                       MIN(r.percentage) as lowest_score,
-                       MAX(r.percentage) as highest_score,
-                       AVG(r.time_spent) as avg_time_spent
+                       COALESCE(s.trainees_attempted, 0) as total_attempts,
+                       COALESCE(s.trainees_passed, 0) as total_passes,
+                       s.percentage_sum / s.scored as avg_score,
+                       s.min_percentage as lowest_score,
+                       s.max_percentage as highest_score,
+                       CAST(s.time_spent_sum AS REAL) / s.attempts as avg_time_spent,
+                       s.percentage_sq_sum / s.scored
+                           - (s.percentage_sum / s.scored) * (s.percentage_sum / s.scored)
+                           as score_variance
                 FROM exams e
                 JOIN batches b ON e.batch_id = b.id
                 LEFT JOIN trainers t ON b.trainer_id = t.id
-                LEFT JOIN results r ON e.id = r.exam_id
+                LEFT JOIN exam_stats s ON s.exam_id = e.id
                 WHERE e.id = ?
-                GROUP BY e.id
             """, (exam_id,))
             
             exam_info = self.cursor.fetchone()
             if not exam_info:
                 raise ValueError("Exam not found")
             
-            # Get question statistics
+            # Get question statistics from the stored responses
             self.cursor.execute("""
                 SELECT q.id, q.question_text,
-                       COUNT(DISTINCT r.trainee_id) as total_attempts,
-                       SUM(CASE WHEN r.answer = q.correct_answer THEN 1 ELSE 0 END) as correct_answers
+                       COUNT(rs.question_id) as total_attempts,
+                       COALESCE(SUM(rs.is_correct), 0) as correct_answers
                 FROM questions q
-                LEFT JOIN results r ON q.exam_id = r.exam_id
+                LEFT JOIN responses rs ON rs.question_id = q.id
                 WHERE q.exam_id = ?
                 GROUP BY q.id
             """, (exam_id,))
@@ -841,7 +1351,8 @@ class DatabaseManager:
                     'average_score': round(exam_info[8] or 0, 2),
                     'lowest_score': round(exam_info[9] or 0, 2),
                     'highest_score': round(exam_info[10] or 0, 2),
-                    'average_time': round(exam_info[11] or 0, 2) if exam_info[11] else 0
+                    'average_time': round(exam_info[11] or 0, 2) if exam_info[11] else 0,
+                    'score_std_dev': round(math.sqrt(max(exam_info[12] or 0, 0)), 2)
                 },
                 'question_statistics': [
                     {
@@ -857,6 +1368,57 @@ class DatabaseManager:
         finally:
             self.close()
 
+    def rebuild_statistics(self):
+        """Recompute the statistics rollups and trainee progress from scratch
+
+        Both are kept current by triggers; this is a repair tool.
+        """
+        with self.transaction() as cursor:
+            rebuild_statistics(cursor)
+            rebuild_trainee_progress(cursor)
+
+    def get_item_analysis(self, exam_id):
+        """Item difficulty, discrimination, distractors and KR-20 for an exam
+
+        Each attempt is one row of the response matrix. The matrix is cached,
+        so repeat calls only read the results recorded since the last one.
+        """
+        with self.transaction(immediate=False) as cursor:
+            key = self._answer_keys.get(cursor, exam_id)
+            return self._item_analysis.get(cursor, key)
+
+    def get_batch_item_analysis(self, batch_id):
+        """Item analysis across every exam of a batch
+
+        Each trainee is one row, holding their latest attempt at each exam;
+        test statistics only count trainees who have taken every exam.
+        """
+        with self.transaction(immediate=False) as cursor:
+            cursor.execute("SELECT id FROM exams WHERE batch_id = ?", (batch_id,))
+            keys = [self._answer_keys.get(cursor, row[0]) for row in cursor.fetchall()]
+            columns = sorted(
+                (question_id, correct, labels)
+                for key in keys
+                for question_id, correct, labels in zip(key.question_ids, key.correct, key.labels)
+            )
+            question_ids = [column[0] for column in columns]
+
+            cursor.execute("""
+                SELECT r.trainee_id, rs.question_id, COALESCE(rs.chosen_option, ?)
+                FROM exams e
+                JOIN results r ON r.exam_id = e.id
+                JOIN responses rs ON rs.result_id = r.id
+                WHERE e.batch_id = ?
+                AND r.id = (
+                    SELECT MAX(latest.id) FROM results latest
+                    WHERE latest.trainee_id = r.trainee_id AND latest.exam_id = r.exam_id
+                )
+            """, (NO_ANSWER, batch_id))
+            _, matrix = response_matrix(cursor.fetchall(), question_ids)
+        return analyze_matrix(
+            matrix, question_ids, [column[1] for column in columns], [column[2] for column in columns]
+        )
+
     def get_trainee_exam_history(self, trainee_id):
         """Get detailed exam history for a trainee with analytics"""
         self.connect()
@@ -945,85 +1507,59 @@ class DatabaseManager:
 
     def update_trainee_status(self, trainee_id):
         """Update trainee status based on exam completion and performance"""
-        self.connect()
-        try:
-            # Start transaction
-            self.conn.execute("BEGIN TRANSACTION")
-            
-            # Get required exams and completion status
-            self.cursor.execute("""
-                WITH RequiredExams AS (
-                    SELECT COUNT(*) as total_exams
-                    FROM exams e
-                    WHERE e.batch_id = (
-                        SELECT batch_id FROM trainees WHERE id = ?
-                    )
-                    AND e.status = 'Active'
-                ),
-                CompletedExams AS (
-                    SELECT 
-                        COUNT(DISTINCT e.id) as completed_exams,
-                        COUNT(DISTINCT CASE WHEN r.status = 'Passed' THEN e.id END) as passed_exams
-                    FROM exams e
-                    LEFT JOIN results r ON e.id = r.exam_id AND r.trainee_id = ?
-                    WHERE e.batch_id = (
-                        SELECT batch_id FROM trainees WHERE id = ?
-                    )
-                    AND e.status = 'Active'
-                )
-                SELECT 
-                    re.total_exams,
-                    ce.completed_exams,
-                    ce.passed_exams
-                FROM RequiredExams re, CompletedExams ce
-            """, (trainee_id, trainee_id, trainee_id))
-            
-            result = self.cursor.fetchone()
-            if not result:
-                raise ValueError("Trainee not found")
-                
-            total_exams, completed_exams, passed_exams = result
-            
-            # Determine new status
-            new_status = 'Active'
-            remarks = None
-            
-            if completed_exams == total_exams:
-                if passed_exams == total_exams:
-                    new_status = 'Completed'
-                    remarks = 'Successfully completed all required exams'
-                else:
-                    remarks = f'Completed all exams but passed only {passed_exams}/{total_exams}'
-            
-            # Update trainee status
-            self.cursor.execute("""
-                UPDATE trainees
-                SET status = ?,
-                    remarks = ?,
-                    exams_taken = (
-                        SELECT COUNT(DISTINCT exam_id)
-                        FROM results
-                        WHERE trainee_id = ?
-                    )
-                WHERE id = ?
-            """, (new_status, remarks, trainee_id, trainee_id))
-            
-            # Commit transaction
-            self.conn.commit()
-            
-            return {
-                'status': new_status,
-                'remarks': remarks,
-                'total_exams': total_exams,
-                'completed_exams': completed_exams,
-                'passed_exams': passed_exams
-            }
+        with self.transaction() as cursor:
+            return self._update_trainee_status(cursor, trainee_id)
+
+    def _update_trainee_status(self, cursor, trainee_id):
+        """Recompute a trainee's status inside the caller's transaction"""
+        # Required exams and the trainee's progress counters for them
+        cursor.execute("""
+            SELECT 
+                COUNT(e.id) as total_exams,
+                COUNT(p.exam_id) as completed_exams,
+                COALESCE(SUM(p.passed), 0) as passed_exams,
+                (SELECT COUNT(*) FROM trainee_exam_progress
+                 WHERE trainee_id = t.id) as exams_taken
+            FROM trainees t
+            LEFT JOIN exams e ON e.batch_id = t.batch_id AND e.status = 'Active'
+            LEFT JOIN trainee_exam_progress p ON p.trainee_id = t.id AND p.exam_id = e.id
+            WHERE t.id = ?
+            GROUP BY t.id
+        """, (trainee_id,))
+        
+        result = cursor.fetchone()
+        if not result:
+            raise ValueError("Trainee not found")
             
-        except Exception as e:
-            self.conn.rollback()
-            raise
-        finally:
-            self.close()
+        total_exams, completed_exams, passed_exams, exams_taken = result
+        
+        # Determine new status
+        new_status = 'Active'
+        remarks = None
+        
+        if completed_exams == total_exams:
+            if passed_exams == total_exams:
+                new_status = 'Completed'
+                remarks = 'Successfully completed all required exams'
+            else:
+                remarks = f'Completed all exams but passed only {passed_exams}/{total_exams}'
+        
+        # Update trainee status
+        cursor.execute("""
+            UPDATE trainees
+            SET status = ?,
+                remarks = ?,
+                exams_taken = ?
+            WHERE id = ?
+        """, (new_status, remarks, exams_taken, trainee_id))
+        
+        return {
+            'status': new_status,
+            'remarks': remarks,
+            'total_exams': total_exams,
+            'completed_exams': completed_exams,
+            'passed_exams': passed_exams
+        }
 
     def get_batch_completion_status(self, batch_id):
         """Get detailed completion status for a batch"""
@@ -0,0 +1,231 @@
+"""Maintenance commands for the exam management database.
+
+Usage:
+    python db_tools.py check-plans [--db exam_management.db] [--fail-on-scan]
+    python db_tools.py query-stats [--file query_stats.json]
+    python db_tools.py rebuild-stats [--db exam_management.db]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+from database_manager import DatabaseManager
+from query_stats import format_summary
+
+# Matches "FROM table alias", "JOIN table AS alias" and bare "FROM table"
+TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|LEFT\b|JOIN\b|GROUP\b|ORDER\b)(\w+))?',
+    re.IGNORECASE
+)
+
+
+def _sample_ids(db):
+    """Pick existing ids to drive the query methods with"""
+    ids = {}
+    with db.connection() as cursor:
+        for table in ('trainees', 'exams', 'batches'):
+            cursor.execute(f"SELECT MIN(id) FROM {table}")
+            ids[table] = cursor.fetchone()[0] or 1
+    return ids
+
+
+def _query_plan_calls(db, ids):
+    """(label, callable) pairs covering every DatabaseManager query method"""
+    trainee_id, exam_id, batch_id = ids['trainees'], ids['exams'], ids['batches']
+    calls = [
+        (f"get_all_records({table})", lambda t=table: db.get_all_records(t))
+        for table in ('trainers', 'batches', 'trainees', 'exams', 'questions', 'results')
+    ]
+    calls += [
+        ("get_records_page", lambda: db.get_records_page('results', (1, 1))),
+        ("count_records", lambda: db.count_records('results')),
+        ("get_page_cursor", lambda: db.get_page_cursor('results', (1, 1), 200)),
+        ("get_following_ids", lambda: db.get_following_ids('results', [1])),
+        ("get_record_by_id", lambda: db.get_record_by_id('exams', exam_id)),
+        ("get_available_exams_for_batch", lambda: db.get_available_exams_for_batch(batch_id)),
+        ("get_exam_questions", lambda: db.get_exam_questions(exam_id)),
+        ("get_exam_questions_with_options", lambda: db.get_exam_questions_with_options(exam_id)),
+        ("get_answer_key", lambda: db.get_answer_key(exam_id)),
+        ("count_exam_results", lambda: db.count_exam_results(exam_id)),
+        ("get_item_analysis", lambda: db.get_item_analysis(exam_id)),
+        ("get_batch_item_analysis", lambda: db.get_batch_item_analysis(batch_id)),
+        ("get_available_exams", lambda: db.get_available_exams(trainee_id)),
+        ("get_exam_details", lambda: db.get_exam_details(exam_id)),
+        ("has_taken_exam", lambda: db.has_taken_exam(trainee_id, exam_id)),
+        ("get_trainee_results", lambda: db.get_trainee_results(trainee_id)),
+        ("get_trainee_progress", lambda: db.get_trainee_progress(trainee_id)),
+        ("validate_batch_assignment", lambda: db.validate_batch_assignment(batch_id, exam_id)),
+        ("get_batch_statistics", lambda: db.get_batch_statistics(batch_id)),
+        ("validate_exam_attempt", lambda: db.validate_exam_attempt(trainee_id, exam_id)),
+        ("get_exam_summary", lambda: db.get_exam_summary(exam_id)),
+        ("get_trainee_exam_history", lambda: db.get_trainee_exam_history(trainee_id)),
+        ("get_batch_completion_status", lambda: db.get_batch_completion_status(batch_id)),
+        ("export_trainee_results", lambda: db.export_trainee_results(trainee_id)),
+        ("export_batch_report", lambda: db.export_batch_report(batch_id)),
+        ("submit_exam_result", lambda: db.submit_exam_result(trainee_id, exam_id, {}, 60)),
+        ("update_trainee_status", lambda: db.update_trainee_status(trainee_id)),
+        ("finalize_attempt", lambda: db.finalize_attempt(trainee_id, exam_id, {}, 60)),
+        ("save_attempt_draft", lambda: db.save_attempt_draft(trainee_id, exam_id, {}, 60)),
+        ("get_attempt_draft", lambda: db.get_attempt_draft(trainee_id, exam_id)),
+        ("start_attempt", lambda: db.start_attempt(trainee_id, exam_id)),
+        ("rescore_exam", lambda: db.rescore_exam(exam_id, dry_run=True)),
+    ]
+    return calls
+
+
+def _table_aliases(sql, tables):
+    """Map every alias (and bare name) in a statement to its base table"""
+    aliases = {}
+    for table, alias in TABLE_REFERENCE.findall(sql):
+        if table.lower() in tables:
+            aliases[table.lower()] = table.lower()
+            if alias:
+                aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def _full_scans(plan, aliases):
+    """Plan lines that read a whole base table or build a transient index
+
+    Scans of CTEs and subqueries are skipped since they read intermediate
+    results rather than a table on disk.
+    """
+    scans = []
+    for detail in plan:
+        if 'AUTOMATIC' in detail:
+            scans.append(detail)
+        elif detail.startswith('SCAN ') and ' USING ' not in detail:
+            name = detail.split()[1].lower()
+            if name in aliases:
+                scans.append(f"{detail} (table {aliases[name]})")
+    return scans
+
+
+def check_query_plans(db_name, fail_on_scan=False):
+    """Run EXPLAIN QUERY PLAN for every DatabaseManager query and report full scans"""
+    # Work on a scratch copy so the write methods can run safely
+    scratch_dir = tempfile.mkdtemp()
+    scratch_db = os.path.join(scratch_dir, 'plans.db')
+    try:
+        if os.path.exists(db_name):
+            source = sqlite3.connect(db_name)
+            target = sqlite3.connect(scratch_db)
+            source.backup(target)
+            source.close()
+            target.close()
+
+        db = DatabaseManager(scratch_db)
+        ids = _sample_ids(db)
+        with db.connection() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0].lower() for row in cursor.fetchall()}
+
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+
+        report = []
+        for label, call in _query_plan_calls(db, ids):
+            del statements[:]
+            try:
+                call()
+            except Exception as e:
+                report.append((label, None, [f"ERROR: {e}"]))
+            for sql in list(statements):
+                keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+                if keyword not in ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT'):
+                    continue
+                try:
+                    plan = db.explain_query_plan(sql)
+                except sqlite3.Error as e:
+                    report.append((label, sql, [f"ERROR: {e}"]))
+                    continue
+                scans = _full_scans(plan, _table_aliases(sql, tables))
+                if scans:
+                    report.append((label, sql, scans))
+
+        db.conn.set_trace_callback(None)
+        db.close_all()
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    if not report:
+        print("No full table scans found.")
+        return 0
+
+    for label, sql, findings in report:
+        print(f"{label}:")
+        for finding in findings:
+            print(f"    {finding}")
+        if sql:
+            print(f"    in: {' '.join(sql.split())[:200]}")
+        print()
+    print(f"{len(report)} statement(s) with full scans or errors.")
+    return 1 if fail_on_scan else 0
+
+
+def show_query_stats(stats_file):
+    """Print a query statistics dump written by the application"""
+    try:
+        with open(stats_file, encoding='utf-8') as f:
+            summary = json.load(f)
+    except FileNotFoundError:
+        print(f"No statistics file at {stats_file}; enable instrumentation in config.py")
+        return 1
+    print(format_summary(summary))
+    return 0
+
+
+def rebuild_stats(db_path):
+    """Recompute the trigger-maintained statistics rollups and trainee progress"""
+    if not os.path.exists(db_path):
+        print(f"No database at {db_path}")
+        return 1
+    db = DatabaseManager(db_path)
+    try:
+        db.rebuild_statistics()
+        with db.connection() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM exam_stats")
+            exams = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM batch_stats")
+            batches = cursor.fetchone()[0]
+    finally:
+        db.close_all()
+    print(f"Rebuilt statistics for {exams} exam(s) and {batches} batch(es).")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exam management database tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # Commands that open the database take --db after the command name
+    database = argparse.ArgumentParser(add_help=False)
+    database.add_argument('--db', default='exam_management.db', help="database file")
+
+    plans = commands.add_parser('check-plans', parents=[database],
+                                help="report full table scans in DatabaseManager queries")
+    plans.add_argument('--fail-on-scan', action='store_true', help="exit with status 1 if any scan is found")
+
+    stats = commands.add_parser('query-stats', help="print the per-method query statistics dump")
+    stats.add_argument('--file', default='query_stats.json', help="statistics file written on exit")
+
+    commands.add_parser('rebuild-stats', parents=[database],
+                        help="recompute the statistics rollups and trainee progress")
+
+    args = parser.parse_args(argv)
+    if args.command == 'check-plans':
+        return check_query_plans(args.db, args.fail_on_scan)
+    if args.command == 'query-stats':
+        return show_query_stats(args.file)
+    if args.command == 'rebuild-stats':
+        return rebuild_stats(args.db)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 import time
-from config import THEME, BUTTON_COLORS
+import math
+import asyncio
+from autosave import AnswerAutosaver
+from config import THEME, BUTTON_COLORS, DATABASE
+from question_views import VirtualQuestionList, PagedQuestionView
 
 class ExamManager:
     def __init__(self, db_manager):
@@ -11,9 +15,14 @@ class ExamManager:
         self.current_exam = None
         self.current_questions = []
         self.answers = {}
-        self.start_time = None
-        self.remaining_time = 0
+        self.flagged = set()
+        self.deadline = None  # time.monotonic() at which the attempt expires
+        self.remaining_time = 0  # seconds on the timer display
         self.timer_id = None
+        self.draft = None
+        self.autosaver = None
+        self.current_trainee_id = None
+        self.completion_callback = None
 
     def start_exam(self, exam_id, trainee_id, callback=None):
         """Start an exam session with validation"""
@@ -25,11 +34,58 @@ class ExamManager:
 
         # Get exam details and questions
         exam_details = self.db_manager.get_exam_details(exam_id)
+        questions = self.db_manager.get_exam_questions_with_options(exam_id)
+        # Compile the answer key now so submission only has to score
+        self.db_manager.get_answer_key(exam_id)
+        # Start (or resume) the attempt, fixing its deadline
+        draft = self.db_manager.start_attempt(trainee_id, exam_id)
+        return self.begin_exam(validation, exam_details, questions, callback, draft)
+
+    async def load_exam_async(self, async_db, exam_id, trainee_id):
+        """Load an exam and start a permitted attempt off the Tk thread
+
+        Returns the (validation, exam_details, questions, draft) arguments for
+        begin_exam().
+        """
+        content = await self.load_exam_content_async(async_db, exam_id, trainee_id)
+        return await self.start_attempt_async(async_db, content, exam_id, trainee_id)
+
+    async def load_exam_content_async(self, async_db, exam_id, trainee_id):
+        """Fetch validation, details and questions concurrently off the Tk thread
+
+        Returns (validation, exam_details, questions). The exam's answer key
+        is compiled alongside, ready for submission.
+        """
+        validation, exam_details, questions, _ = await asyncio.gather(
+            async_db.validate_exam_attempt(trainee_id, exam_id),
+            async_db.get_exam_details(exam_id),
+            async_db.get_exam_questions_with_options(exam_id),
+            async_db.get_answer_key(exam_id)
+        )
+        return validation, exam_details, questions
+
+    async def start_attempt_async(self, async_db, content, exam_id, trainee_id):
+        """Start the attempt for content from load_exam_content_async()
+
+        Returns the (validation, exam_details, questions, draft) arguments for
+        begin_exam(); draft is None when the attempt is not permitted.
+        """
+        validation, exam_details, questions = content
+        draft = None
+        if validation['can_take']:
+            draft = await async_db.start_attempt(trainee_id, exam_id)
+        return validation, exam_details, questions, draft
+
+    def begin_exam(self, validation, exam_details, questions, callback=None, draft=None):
+        """Check loaded exam data and initialize the exam session"""
+        if not validation['can_take']:
+            messagebox.showerror("Cannot Take Exam", validation['message'])
+            return False
+
         if not exam_details:
             messagebox.showerror("Error", "Failed to load exam details")
             return False
 
-        questions = self.db_manager.get_exam_questions(exam_id)
         if not questions:
             messagebox.showerror("Error", "No questions found for this exam")
             return False
@@ -37,9 +93,25 @@ class ExamManager:
         # Initialize exam session
         self.current_exam = exam_details
         self.current_questions = questions
-        self.answers = {}
-        self.start_time = datetime.now()
-        self.remaining_time = exam_details['time_limit'] * 60  # Convert to seconds
+        self.answers = dict(draft.answers) if draft else {}
+        self.flagged = set()
+        self.draft = draft
+
+        # Count down to the attempt's deadline on the monotonic clock, so
+        # a busy event loop or a wall clock change cannot stretch it
+        seconds_left = exam_details.time_limit * 60  # Convert to seconds
+        if draft and draft.seconds_left is not None:
+            seconds_left = min(max(draft.seconds_left, 0), seconds_left)
+        self.deadline = time.monotonic() + seconds_left
+        self.remaining_time = None
+
+        if draft and (draft.answers or draft.elapsed_seconds):
+            # Resume an interrupted attempt where its last autosave left off
+            messagebox.showinfo(
+                "Exam Resumed",
+                f"Your {len(draft.answers)} saved answer(s) have been restored. "
+                "The time limit still counts from when you first started."
+            )
         
         if callback:
             callback()
@@ -53,7 +125,7 @@ class ExamManager:
 
         # Create exam window
         exam_window = ctk.CTkToplevel(parent)
-        exam_window.title(f"Exam: {self.current_exam['title']}")
+        exam_window.title(f"Exam: {self.current_exam.title}")
         exam_window.geometry("1000x800")
         exam_window.resizable(True, True)
         
@@ -61,9 +133,11 @@ class ExamManager:
         def on_close():
             if messagebox.askyesno(
                 "Confirm Exit",
-                "Are you sure you want to exit? This will end your exam session and your progress will be lost.",
+                "Are you sure you want to exit? Your answers so far will be submitted and "
+                "scored now, and this attempt cannot be continued.",
                 icon="warning"
             ):
+                self._stop_timer(exam_window)
                 self.end_exam(trainee_id, force=True)
                 exam_window.destroy()
                 if completion_callback:
@@ -75,8 +149,9 @@ class ExamManager:
         exam_window.transient(parent)
         exam_window.grab_set()
         
-        # Store trainee ID for forced submission
+        # Store trainee ID and callback for forced submission
         self.current_trainee_id = trainee_id
+        self.completion_callback = completion_callback
 
         # Create main container
         main_container = ctk.CTkFrame(exam_window, fg_color="transparent")
@@ -93,13 +168,13 @@ class ExamManager:
         # Exam title and info
         title_label = ctk.CTkLabel(
             header,
-            text=self.current_exam['title'],
+            text=self.current_exam.title,
             font=THEME["fonts"]["heading"],
             text_color=THEME["colors"]["text"]
         )
         title_label.pack(pady=(10, 5))
 
-        info_text = f"Module {self.current_exam['module_no']} • {self.current_exam['num_items']} Items"
+        info_text = f"Module {self.current_exam.module_no} • {self.current_exam.num_items} Items"
         info_label = ctk.CTkLabel(
             header,
             text=info_text,
@@ -117,19 +192,35 @@ class ExamManager:
         )
         self.timer_label.pack(pady=(0, 10))
 
-        # Create scrollable frame for questions
-        question_container = ctk.CTkScrollableFrame(main_container)
-        question_container.pack(expand=True, fill="both", pady=(0, 20))
-
-        # Add questions
-        for idx, question in enumerate(self.current_questions, 1):
-            self._create_question_widget(
-                question_container, 
-                idx, 
-                question[1],  # question text
-                question[2],  # correct_answer string
-                question[0]   # question id
+        # Journal answer changes so an interrupted attempt can be resumed
+        self.autosaver = AnswerAutosaver(
+            exam_window,
+            self.db_manager,
+            trainee_id,
+            self.current_exam.id,
+            self._time_spent,
+            DATABASE["autosave_interval"],
+            self.answers
+        )
+
+        if self.current_exam.delivery_mode == 'paged':
+            # One question at a time, reconfigured in place
+            question_view = PagedQuestionView(
+                main_container,
+                self.current_questions,
+                self.answers,
+                self._record_answer,
+                self.flagged
             )
+        else:
+            # Only the questions near the viewport get widgets
+            question_view = VirtualQuestionList(
+                main_container,
+                self.current_questions,
+                self.answers,
+                self._record_answer
+            )
+        question_view.pack(expand=True, fill="both", pady=(0, 20))
 
         # Create bottom button bar
         button_bar = ctk.CTkFrame(main_container, fg_color="transparent")
@@ -142,7 +233,7 @@ class ExamManager:
             font=THEME["fonts"]["body"],
             fg_color=THEME["colors"]["primary"],
             hover_color=THEME["colors"]["primary_hover"],
-            command=lambda: self._handle_submit(exam_window, trainee_id, completion_callback)
+            command=lambda: self._handle_submit(exam_window, trainee_id)
         )
         submit_btn.pack(side="right", padx=5)
 
@@ -151,98 +242,55 @@ class ExamManager:
 
         return exam_window
 
-    def _create_question_widget(self, parent, number, text, options_str, q_id):
-        """Create a question widget with options"""
-        # Question frame
-        q_frame = ctk.CTkFrame(
-            parent,
-            fg_color=THEME["colors"]["surface"],
-            corner_radius=8,
-            border_width=1,
-            border_color=THEME["colors"]["secondary"]
-        )
-        q_frame.pack(fill="x", padx=10, pady=5)
-
-        # Question number and text
-        q_label = ctk.CTkLabel(
-            q_frame,
-            text=f"Question {number}",
-            font=THEME["fonts"]["subheading"],
-            text_color=THEME["colors"]["primary"]
-        )
-        q_label.pack(anchor="w", padx=15, pady=(10, 5))
-
-        text_label = ctk.CTkLabel(
-            q_frame,
-            text=text,
-            font=THEME["fonts"]["body"],
-            text_color=THEME["colors"]["text"],
-            wraplength=800,
-            justify="left"
-        )
-        text_label.pack(anchor="w", padx=15, pady=(0, 10))
-
-        # Parse options
-        options = options_str.split('|')
-        option_var = tk.StringVar()
-        
-        # Options container
-        options_frame = ctk.CTkFrame(q_frame, fg_color="transparent")
-        options_frame.pack(fill="x", padx=15, pady=(0, 10))
+    def _record_answer(self, q_id, label):
+        """Keep a trainee's choice and journal it for autosave"""
+        self.answers[q_id] = label
+        self.autosaver.record(q_id, label)
 
-        for option in options:
-            letter = option[1] if option.startswith('*') else option[0]
-            text = option[3:] if option.startswith('*') else option[2:]
-            
-            # Option container
-            option_container = ctk.CTkFrame(
-                options_frame,
-                fg_color="transparent",
-                height=40
-            )
-            option_container.pack(fill="x", pady=2)
-            
-            radio_btn = ctk.CTkRadioButton(
-                option_container,
-                text=f"{letter}. {text}",
-                variable=option_var,
-                value=letter,
-                font=THEME["fonts"]["body"],
-                text_color=THEME["colors"]["text"],
-                fg_color=THEME["colors"]["primary"]
-            )
-            radio_btn.pack(side="left", padx=15)
+    def _collect_answers(self):
+        """Every question's chosen option label, '' if unanswered"""
+        return {q.id: self.answers.get(q.id, '') for q in self.current_questions}
 
-        # Store the variable for later access
-        self.answers[q_id] = option_var
+    def _time_spent(self):
+        """Seconds spent on the attempt, by the monotonic clock"""
+        time_limit = self.current_exam.time_limit * 60
+        return min(max(time_limit - (self.deadline - time.monotonic()), 0), time_limit)
 
     def _update_timer(self, window):
-        """Update the timer display"""
-        if self.remaining_time > 0:
-            minutes = self.remaining_time // 60
-            seconds = self.remaining_time % 60
+        """Redraw the timer when its display changes and time out at the deadline"""
+        left = self.deadline - time.monotonic()
+        if left <= 0:
+            self.timer_id = None
+            self._handle_timeout(window)
+            return
+
+        shown = math.ceil(left)
+        if shown != self.remaining_time:
+            self.remaining_time = shown
+            minutes, seconds = divmod(shown, 60)
             self.timer_label.configure(
                 text=f"Time Remaining: {minutes:02d}:{seconds:02d}"
             )
-            self.remaining_time -= 1
-            self.timer_id = window.after(1000, lambda: self._update_timer(window))
-        else:
-            self._handle_timeout(window)
+        # Wake just after the displayed second runs out
+        delay = int((left - shown + 1) * 1000) + 1
+        self.timer_id = window.after(delay, self._update_timer, window)
 
     def _handle_timeout(self, window):
-        """Handle exam timeout"""
-        messagebox.showwarning(
-            "Time's Up",
-            "The exam time has expired. Your answers will be submitted automatically."
-        )
+        """Handle exam timeout
+
+        The answers are saved and submitted before any dialog is shown: a
+        modal left open past the deadline grace would otherwise make the
+        database record the last draft instead.
+        """
+        self.autosaver.flush()
         self._submit_exam(window)
 
-    def _handle_submit(self, window, trainee_id, callback=None):
+    def _handle_submit(self, window, trainee_id):
         """Handle exam submission"""
         if messagebox.askyesno("Confirm Submission", 
                               "Are you sure you want to submit your exam?"):
             # Get all answers
-            answers = {q_id: var.get() for q_id, var in self.answers.items()}
+            answers = self._collect_answers()
             
             # Check for unanswered questions
             unanswered = sum(1 for ans in answers.values() if not ans)
@@ -254,106 +302,145 @@ class ExamManager:
                 ):
                     return
 
+            # Check for questions flagged for review
+            if self.flagged:
+                if not messagebox.askyesno(
+                    "Flagged Questions",
+                    f"You have {len(self.flagged)} question(s) flagged for review. "
+                    "Do you still want to submit?"
+                ):
+                    return
+
+            # Time may have run out, submitting the attempt, while the
+            # dialogs were open
+            if self.current_exam is None:
+                return
+
             try:
                 # Calculate time spent
-                time_spent = int((datetime.now() - self.start_time).total_seconds())
+                time_spent = int(self._time_spent())
                 
-                # Submit exam
-                result = self.db_manager.submit_exam_result(
+                # Score, record and update the trainee's status in one transaction
+                result = self.db_manager.finalize_attempt(
                     trainee_id,
-                    self.current_exam['id'],
+                    self.current_exam.id,
                     answers,
                     time_spent
                 )
-                
-                # Update trainee status
-                self.db_manager.update_trainee_status(trainee_id)
-                
-                # Show result
-                status = "Passed" if result['percentage'] >= 75 else "Failed"
-                messagebox.showinfo(
-                    "Exam Complete",
-                    f"Your score: {result['score']}/{result['total_items']}\n"
-                    f"Percentage: {result['percentage']:.1f}%\n"
-                    f"Status: {status}"
-                )
-                
-                # Clean up
-                if self.timer_id:
-                    window.after_cancel(self.timer_id)
-                window.destroy()
-                
-                if callback:
-                    callback(result)
-                    
             except Exception as e:
+                # Keep the draft current so the attempt can be resumed
+                self.autosaver.flush()
                 messagebox.showerror(
                     "Error",
                     f"Failed to submit exam: {str(e)}"
                 )
+                return
+
+            self._finish_exam(window, result, "Exam Complete")
+
+    def _stop_timer(self, window):
+        """Cancel the pending timer tick, if any"""
+        if self.timer_id:
+            window.after_cancel(self.timer_id)
+            self.timer_id = None
+
+    def _finish_exam(self, window, result, title, intro=""):
+        """Close a recorded attempt and report its result
+
+        Stops the timer and autosave, shows the score, closes the window,
+        ends the session and hands the result to the completion callback,
+        so the dashboard and its prefetched exams are refreshed.
+        """
+        callback = self.completion_callback
+        # A stopped autosaver has nothing left for end_exam() to flush, so
+        # no draft is written back for the recorded attempt
+        self.autosaver.stop()
+        self._stop_timer(window)
+
+        status = "Passed" if result['percentage'] >= 75 else "Failed"
+        messagebox.showinfo(
+            title,
+            intro
+            + f"Your score: {result['score']}/{result['total_items']}\n"
+            f"Percentage: {result['percentage']:.1f}%\n"
+            f"Status: {status}"
+            + self._expiry_note(result)
+        )
+        window.destroy()
+        self.end_exam(self.current_trainee_id)
+
+        if callback:
+            callback(result)
+
+    @staticmethod
+    def _expiry_note(result):
+        if not result.get('expired'):
+            return ""
+        return ("\n\nYour time had already expired, so the answers saved "
+                "before the deadline were recorded.")
 
     def _submit_exam(self, window):
         """Force submit the exam"""
         # Get all answers, using empty string for unanswered questions
-        answers = {q_id: var.get() or '' for q_id, var in self.answers.items()}
+        answers = self._collect_answers()
         
         try:
             # Calculate time spent (use full time for timeout)
-            time_spent = self.current_exam['time_limit'] * 60
+            time_spent = self.current_exam.time_limit * 60
             
-            # Submit exam
-            result = self.db_manager.submit_exam_result(
+            # Score, record and update the trainee's status in one transaction
+            result = self.db_manager.finalize_attempt(
                 self.current_trainee_id,
-                self.current_exam['id'],
+                self.current_exam.id,
                 answers,
                 time_spent
             )
-            
-            # Clean up
-            if self.timer_id:
-                window.after_cancel(self.timer_id)
-            window.destroy()
-            
-            # Show result
-            status = "Passed" if result['percentage'] >= 75 else "Failed"
-            messagebox.showinfo(
-                "Exam Complete",
-                f"Your score: {result['score']}/{result['total_items']}\n"
-                f"Percentage: {result['percentage']:.1f}%\n"
-                f"Status: {status}"
-            )
-            
         except Exception as e:
+            self.autosaver.flush()
             messagebox.showerror(
                 "Error",
                 f"Failed to submit exam: {str(e)}"
             )
+            return
+
+        self._finish_exam(
+            window, result, "Time's Up",
+            "The exam time has expired and your answers were submitted automatically.\n\n"
+        )
 
     def end_exam(self, trainee_id, force=False):
         """End exam session with optional force submit"""
         try:
             if force:
                 # Get all answers, using empty string for unanswered
-                answers = {q_id: var.get() or '' for q_id, var in self.answers.items()}
+                answers = self._collect_answers()
                 
                 # Calculate time spent (from start time to now)
-                time_spent = int((datetime.now() - self.start_time).total_seconds())
+                time_spent = int(self._time_spent())
                 
-                # Submit exam
-                self.db_manager.submit_exam_result(
+                # Score, record and update the trainee's status in one transaction
+                self.db_manager.finalize_attempt(
                     trainee_id,
-                    self.current_exam['id'],
+                    self.current_exam.id,
                     answers,
                     time_spent
                 )
-            
+            elif self.autosaver:
+                self.autosaver.flush()
+
             # Clean up
+            if self.autosaver:
+                self.autosaver.stop()
+                self.autosaver = None
+            self.draft = None
             self.current_exam = None
             self.current_questions = []
             self.answers = {}
-            self.start_time = None
+            self.flagged = set()
+            self.deadline = None
             self.remaining_time = 0
             self.timer_id = None
+            self.completion_callback = None
             
         except Exception as e:
             messagebox.showerror(
@@ -0,0 +1,93 @@
+"""Prefetching of exam content for the trainee's Available Exams list.
+
+While the exam cards are on screen, ExamPrefetcher loads the validation,
+details and questions of each exam not yet taken on the database workers,
+compiling its answer key alongside, and keeps them in a bounded LRU cache.
+Taking a prefetched exam then opens from memory; only the write that starts
+the attempt and fixes its deadline still goes to the database.
+
+The cache is only touched on the Tk thread: loads run through the
+dashboard's BackgroundTaskRunner and their results are stored by its
+callbacks.
+"""
+import time
+from collections import OrderedDict
+
+
+class ExamPrefetcher:
+    def __init__(self, task_runner, exam_manager, trainee_id, max_exams=8, max_age=300):
+        """
+        Args:
+            task_runner: BackgroundTaskRunner that runs the loads
+            exam_manager: ExamManager whose load_exam_content_async() is used
+            trainee_id: The trainee the exams are validated for
+            max_exams: Most exams kept; least recently used go first
+            max_age: Seconds a prefetched exam stays usable
+        """
+        self.task_runner = task_runner
+        self.exam_manager = exam_manager
+        self.trainee_id = trainee_id
+        self.max_exams = max_exams
+        self.max_age = max_age
+        self._exams = OrderedDict()  # exam id -> (loaded at, content)
+        self._pending = {}  # exam id -> BackgroundTask of an in-flight load
+
+    def prefetch(self, exam_ids):
+        """Start loading the exams that are neither cached nor loading
+
+        Only the first max_exams ids are prefetched, so a long list cannot
+        evict its own entries.
+        """
+        for exam_id in list(exam_ids)[:self.max_exams]:
+            if exam_id in self._pending or self._fresh(exam_id) is not None:
+                continue
+            self._pending[exam_id] = self.task_runner.run(
+                self.exam_manager.load_exam_content_async(
+                    self.task_runner.db, exam_id, self.trainee_id
+                ),
+                on_done=lambda content, exam_id=exam_id: self._store(exam_id, content),
+                on_error=lambda e, exam_id=exam_id: self._failed(exam_id, e)
+            )
+
+    def take(self, exam_id):
+        """Remove and return an exam's prefetched content, or None
+
+        The content is (validation, exam_details, questions), as returned by
+        ExamManager.load_exam_content_async().
+        """
+        content = self._fresh(exam_id)
+        self._exams.pop(exam_id, None)
+        return content
+
+    def invalidate(self, exam_id=None):
+        """Drop one exam's content, or every exam's, and cancel their loads"""
+        exam_ids = list(self._pending) + list(self._exams) if exam_id is None else [exam_id]
+        for stale_id in exam_ids:
+            task = self._pending.pop(stale_id, None)
+            if task is not None:
+                task.cancel()
+            self._exams.pop(stale_id, None)
+
+    def _fresh(self, exam_id):
+        entry = self._exams.get(exam_id)
+        if entry is None:
+            return None
+        loaded_at, content = entry
+        if time.monotonic() - loaded_at > self.max_age:
+            del self._exams[exam_id]
+            return None
+        self._exams.move_to_end(exam_id)
+        return content
+
+    def _store(self, exam_id, content):
+        if self._pending.pop(exam_id, None) is None:
+            return  # Invalidated while loading
+        self._exams[exam_id] = (time.monotonic(), content)
+        self._exams.move_to_end(exam_id)
+        while len(self._exams) > self.max_exams:
+            self._exams.popitem(last=False)
+
+    def _failed(self, exam_id, error):
+        # The exam is loaded again, with its error shown, when it is taken
+        self._pending.pop(exam_id, None)
+        print(f"Error prefetching exam {exam_id}: {error}")
@@ -0,0 +1,236 @@
+"""Classical item analysis over the response matrix.
+
+Stored responses are laid out as a matrix with one row per attempt (or per
+trainee, for a batch) and one column per question, holding the chosen
+option position. Item difficulty, point-biserial discrimination, distractor
+frequencies and KR-20 reliability are then column-wise NumPy reductions.
+
+Correctness is judged against the current answer key rather than the stored
+is_correct flags, so the statistics follow key corrections even before the
+exam is re-scored. Scores are number-correct, as classical test theory
+assumes.
+
+Per-exam matrices are cached and only the results recorded since the last
+analysis are fetched and appended; a changed key or a deleted result
+rebuilds the exam's matrix.
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from answer_keys import NO_ANSWER
+
+NOT_PRESENTED = -2  # matrix cell of a question the attempt never saw
+
+
+class ItemStats(NamedTuple):
+    question_id: int
+    responses: int  # attempts the question was presented in
+    difficulty: Optional[float]  # proportion correct (p-value)
+    discrimination: Optional[float]  # corrected point-biserial correlation
+    option_labels: Tuple[str, ...]  # the question's option labels by position
+    option_counts: Tuple[int, ...]  # choices per option position
+    omitted: int
+    correct_option: Optional[int]  # position of the keyed option
+
+    @property
+    def correct_label(self):
+        if self.correct_option is None or self.correct_option >= len(self.option_labels):
+            return None
+        return self.option_labels[self.correct_option]
+
+
+class ItemAnalysis(NamedTuple):
+    attempts: int
+    mean_score: Optional[float]
+    score_sd: Optional[float]
+    kr20: Optional[float]
+    items: Tuple[ItemStats, ...]
+
+
+def response_matrix(rows, question_ids):
+    """Lay (row id, question id, chosen position) rows out as a matrix
+
+    Args:
+        rows: Response rows; chosen is NO_ANSWER when unanswered
+        question_ids: Sorted question ids giving the column order
+
+    Returns:
+        (row_ids, matrix) with one sorted row per distinct row id; cells
+        without a response are NOT_PRESENTED
+    """
+    question_ids = np.asarray(question_ids, dtype=np.int64)
+    if not rows or not len(question_ids):
+        return np.empty(0, dtype=np.int64), np.empty((0, len(question_ids)), dtype=np.int8)
+
+    data = np.array(rows, dtype=np.int64)
+    row_ids, row_index = np.unique(data[:, 0], return_inverse=True)
+    column = np.minimum(np.searchsorted(question_ids, data[:, 1]), len(question_ids) - 1)
+    # Responses to questions no longer in the key are dropped
+    keep = question_ids[column] == data[:, 1]
+
+    matrix = np.full((len(row_ids), len(question_ids)), NOT_PRESENTED, dtype=np.int8)
+    matrix[row_index[keep], column[keep]] = data[keep, 2]
+    return row_ids, matrix
+
+
+def analyze_matrix(matrix, question_ids, correct, labels):
+    """Compute item and test statistics for a response matrix
+
+    Args:
+        matrix: Chosen option positions, NO_ANSWER or NOT_PRESENTED
+        question_ids: The question id of each column
+        correct: The keyed option position of each column (NO_ANSWER if
+            the question has no correct option)
+        labels: The option labels of each column's question, by position;
+            option counts are kept for each of them
+    """
+    attempts, items = matrix.shape
+    correct = np.asarray(correct, dtype=np.int64)
+    presented = matrix != NOT_PRESENTED
+    right = ((matrix == correct) & (correct != NO_ANSWER)).astype(np.float64)
+    totals = right.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Per-item sums over the attempts that saw the item; the rest score
+        # (total minus the item) keeps an item from correlating with itself
+        mask = presented.astype(np.float64)
+        n = mask.sum(axis=0)
+        sum_x = right.sum(axis=0)
+        sum_t = mask.T @ totals
+        sum_t2 = mask.T @ (totals ** 2)
+        sum_xt = right.T @ totals
+
+        p = sum_x / n
+        mean_rest = (sum_t - sum_x) / n
+        var_rest = (sum_t2 - 2 * sum_xt + sum_x) / n - mean_rest ** 2
+        cov = (sum_xt - sum_x) / n - p * mean_rest
+        r_pb = cov / np.sqrt(p * (1 - p) * var_rest)
+
+    # Questions may have any number of options; each item keeps the counts
+    # of the positions it has
+    max_options = max((len(question_labels) for question_labels in labels), default=0)
+    option_counts = np.stack(
+        [(matrix == position).sum(axis=0) for position in range(max_options)],
+        axis=1
+    ) if items and max_options else np.zeros((items, 0), dtype=np.int64)
+    omitted = (matrix == NO_ANSWER).sum(axis=0)
+
+    item_stats = tuple(
+        ItemStats(
+            question_id=int(question_ids[i]),
+            responses=int(n[i]),
+            difficulty=_finite(p[i]),
+            discrimination=_finite(r_pb[i]),
+            option_labels=tuple(labels[i]),
+            option_counts=tuple(int(count) for count in option_counts[i, :len(labels[i])]),
+            omitted=int(omitted[i]),
+            correct_option=None if correct[i] == NO_ANSWER else int(correct[i])
+        )
+        for i in range(items)
+    )
+
+    # Test statistics only use attempts that saw every item
+    complete = presented.all(axis=1)
+    scores = totals[complete]
+    mean_score = score_sd = kr20 = None
+    if len(scores):
+        mean_score = float(scores.mean())
+        score_sd = float(scores.std())
+        if items > 1 and score_sd > 0:
+            p_complete = right[complete].mean(axis=0)
+            kr20 = float(items / (items - 1) * (1 - (p_complete * (1 - p_complete)).sum() / scores.var()))
+    return ItemAnalysis(attempts, mean_score, score_sd, kr20, item_stats)
+
+
+def _finite(value):
+    return float(value) if np.isfinite(value) else None
+
+
+class _ExamMatrix(NamedTuple):
+    version: int
+    question_ids: np.ndarray
+    correct: np.ndarray
+    last_result_id: int
+    results_seen: int
+    matrix: np.ndarray
+    analysis: ItemAnalysis
+
+
+class ItemAnalysisCache:
+    def __init__(self, max_exams=64):
+        """
+        Args:
+            max_exams: Most exams whose matrices are kept; least recently used go first
+        """
+        self.max_exams = max_exams
+        self._exams = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cursor, key):
+        """Return the ItemAnalysis of an exam, fetching only new results
+
+        Call within a read transaction so the counts and the responses
+        read come from the same snapshot.
+
+        Args:
+            cursor: Cursor to read results and responses with
+            key: The exam's current AnswerKey
+        """
+        exam_id = key.exam_id
+        cursor.execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM results WHERE exam_id = ?",
+            (exam_id,)
+        )
+        result_count, max_result_id = cursor.fetchone()
+
+        with self._lock:
+            entry = self._exams.get(exam_id)
+            if entry is not None:
+                self._exams.move_to_end(exam_id)
+
+        if entry is not None and entry.version != key.version:
+            entry = None
+        if entry is not None:
+            if entry.last_result_id == max_result_id and entry.results_seen == result_count:
+                return entry.analysis
+            cursor.execute(
+                "SELECT COUNT(*) FROM results WHERE exam_id = ? AND id > ?",
+                (exam_id, entry.last_result_id)
+            )
+            if entry.results_seen + cursor.fetchone()[0] != result_count:
+                # A result was deleted since the last analysis; start over
+                entry = None
+
+        question_ids = np.array(key.question_ids, dtype=np.int64)
+        correct = np.array(key.correct, dtype=np.int64)
+        after = entry.last_result_id if entry is not None else 0
+        cursor.execute("""
+            SELECT rs.result_id, rs.question_id, COALESCE(rs.chosen_option, ?)
+            FROM results r
+            JOIN responses rs ON rs.result_id = r.id
+            WHERE r.exam_id = ? AND r.id > ?
+        """, (NO_ANSWER, exam_id, after))
+        _, rows = response_matrix(cursor.fetchall(), question_ids)
+        matrix = np.concatenate([entry.matrix, rows]) if entry is not None else rows
+
+        analysis = analyze_matrix(matrix, question_ids, correct, key.labels)
+        entry = _ExamMatrix(
+            key.version, question_ids, correct, max_result_id, result_count, matrix, analysis
+        )
+        with self._lock:
+            self._exams[exam_id] = entry
+            self._exams.move_to_end(exam_id)
+            while len(self._exams) > self.max_exams:
+                self._exams.popitem(last=False)
+        return analysis
+
+    def invalidate(self, exam_id=None):
+        """Drop one exam's matrix, or every matrix"""
+        with self._lock:
+            if exam_id is None:
+                self._exams.clear()
+            else:
+                self._exams.pop(exam_id, None)
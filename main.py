@@ -3,10 +3,11 @@ import sqlite3
 from datetime import datetime
 import os
 import sys
-from config import THEME, BUTTON_COLORS  # Add this import
+from config import THEME, BUTTON_COLORS, DATABASE
 
 # Import other modules we'll create
 from database_manager import DatabaseManager
+from async_database_manager import TkAsyncBridge
 from admin_dashboard import AdminDashboard
 from trainee_dashboard import TraineeDashboard
 from exam_manager import ExamManager
@@ -35,7 +36,25 @@ class ExamManagementApp:
         self.root.geometry(f"{window_width}x{window_height}+{position_right}+{position_top}")
 
         # Initialize database 
-        self.db_manager = DatabaseManager()
+        self.db_manager = DatabaseManager(DATABASE["path"], DATABASE["deadline_grace"])
+        write_queue = DATABASE["write_queue"]
+        if write_queue["enabled"]:
+            self.db_manager.enable_write_queue(
+                write_queue["max_batch"],
+                write_queue["max_delay"]
+            )
+
+        instrumentation = DATABASE["instrumentation"]
+        if instrumentation["enabled"]:
+            self.db_manager.enable_instrumentation(
+                instrumentation["slow_query_threshold"],
+                instrumentation["slow_query_log"],
+                instrumentation["max_log_bytes"],
+                instrumentation["log_backups"]
+            )
+
+        # Run database calls off the Tk thread
+        self.async_bridge = TkAsyncBridge(self.root, self.db_manager)
 
         # Create login frame
         self.create_login_frame()
@@ -125,24 +144,26 @@ class ExamManagementApp:
 
     def validate_trainee_login(self, username):
         """Validate trainee login using DatabaseManager"""
-        try:
-            # Use existing db_manager instance
-            self.db_manager.connect()
-            self.db_manager.cursor.execute(
+        # Use existing db_manager instance
+        with self.db_manager.connection() as cursor:
+            cursor.execute(
                 "SELECT * FROM trainees WHERE id_no = ? AND status = 'Active'", 
                 (username,)
             )
-            trainee = self.db_manager.cursor.fetchone()
+            trainee = cursor.fetchone()
             return trainee is not None
-        finally:
-            self.db_manager.close()
 
     def open_admin_dashboard(self):
         # Clear login frame
         self.login_frame.destroy()
         
         # Open admin dashboard
-        admin_dashboard = AdminDashboard(self.root, self.db_manager, self.return_to_login)
+        admin_dashboard = AdminDashboard(
+            self.root,
+            self.db_manager,
+            self.return_to_login,
+            async_bridge=self.async_bridge
+        )
 
     def open_trainee_dashboard(self, username):
         # Clear login frame
@@ -153,7 +174,8 @@ class ExamManagementApp:
             self.root, 
             self.db_manager, 
             username, 
-            self.return_to_login
+            self.return_to_login,
+            async_bridge=self.async_bridge
         )
 
     def return_to_login(self):
@@ -182,7 +204,13 @@ class ExamManagementApp:
         close_button.pack(pady=10)
 
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.async_bridge.close()
+            if DATABASE["instrumentation"]["enabled"]:
+                self.db_manager.dump_query_stats(DATABASE["instrumentation"]["stats_file"])
+            self.db_manager.close_all()
 
     def resource_path(relative_path):
         """ Get absolute path to resource, works for dev and PyInstaller """
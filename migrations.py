@@ -0,0 +1,832 @@
+"""Versioned schema migrations for the exam management database.
+
+Each migration runs exactly once, in order, inside its own transaction. The
+number of the last applied migration is stored in ``PRAGMA user_version`` so
+an up-to-date database skips all schema work on startup.
+"""
+import re
+
+# Splits "*A:Text|B:Text" on the pipes that start a new option, so option
+# text may itself contain '|'
+OPTION_SEPARATOR = re.compile(r'\|(?=\*?[A-Z]:)')
+
+
+def create_base_tables(cursor):
+    """Create all necessary tables for the exam management system"""
+    # Trainers Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS trainers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        class_assigned TEXT,
+        contact_email TEXT UNIQUE,
+        hire_date DATE NOT NULL
+    )
+    ''')
+
+    # Batches Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS batches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        batch_year TEXT NOT NULL,
+        num_trainees INTEGER CHECK (num_trainees >= 0),
+        training_duration TEXT NOT NULL,
+        training_location TEXT,
+        trainer_id INTEGER,
+        FOREIGN KEY (trainer_id) REFERENCES trainers(id) ON DELETE SET NULL
+    )
+    ''')
+
+    # Trainees Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS trainees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        id_no TEXT UNIQUE NOT NULL,
+        uli TEXT UNIQUE,
+        batch_id INTEGER NOT NULL,
+        batch_year INTEGER NOT NULL,
+        exams_taken INTEGER DEFAULT 0,
+        status TEXT CHECK (status IN ('Active', 'Inactive', 'Completed')),
+        remarks TEXT,
+        FOREIGN KEY (batch_id) REFERENCES batches(id) ON DELETE CASCADE
+    )
+    ''')
+
+    # Exams Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS exams (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        module_no TEXT NOT NULL,
+        num_items INTEGER NOT NULL CHECK (num_items > 0),
+        time_limit INTEGER NOT NULL CHECK (time_limit > 0),
+        batch_id INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'Active' CHECK (status IN ('Active', 'Inactive')),
+        FOREIGN KEY (batch_id) REFERENCES batches(id) ON DELETE CASCADE
+    )
+    ''')
+
+    # Questions Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        exam_id INTEGER NOT NULL,
+        question_text TEXT NOT NULL,
+        correct_answer TEXT NOT NULL,  -- Format: "*A:Text|B:Text|C:Text|D:Text"
+        points INTEGER DEFAULT 1 CHECK (points > 0),
+        question_type TEXT DEFAULT 'multiple_choice',
+        FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+    )
+    ''')
+
+    # Results Table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        trainee_id INTEGER NOT NULL,
+        exam_id INTEGER NOT NULL,
+        score INTEGER NOT NULL CHECK (score >= 0),
+        total_items INTEGER NOT NULL CHECK (total_items > 0),
+        percentage REAL CHECK (percentage >= 0 AND percentage <= 100),
+        time_spent INTEGER NOT NULL,  -- in seconds
+        date_taken DATETIME DEFAULT CURRENT_TIMESTAMP,
+        status TEXT CHECK (status IN ('Passed', 'Failed')),
+        attempt_number INTEGER DEFAULT 1,
+        FOREIGN KEY (trainee_id) REFERENCES trainees(id) ON DELETE CASCADE,
+        FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+    )
+    ''')
+
+
+def add_result_percentage(cursor):
+    """Add the percentage column to older results tables and backfill it"""
+    cursor.execute("PRAGMA table_info(results)")
+    columns = [col[1] for col in cursor.fetchall()]
+
+    if 'percentage' not in columns:
+        cursor.execute("""
+        ALTER TABLE results
+        ADD COLUMN percentage REAL CHECK (percentage >= 0 AND percentage <= 100)
+        """)
+
+    # Update existing results with calculated percentages
+    cursor.execute("""
+        UPDATE results
+        SET percentage = (CAST(score AS FLOAT) / total_items) * 100
+        WHERE percentage IS NULL AND total_items > 0
+    """)
+
+
+def create_lookup_indexes(cursor):
+    """Create secondary indexes for the hot lookups and foreign keys"""
+    # Per-trainee history and the correlated MAX(date_taken) subqueries
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_results_trainee_exam_date
+        ON results(trainee_id, exam_id, date_taken)
+    """)
+    # Per-exam statistics
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_results_exam_status
+        ON results(exam_id, status)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_exams_batch_status
+        ON exams(batch_id, status)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_questions_exam
+        ON questions(exam_id)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_trainees_batch_status
+        ON trainees(batch_id, status)
+    """)
+    # Foreign key enforcement when a trainer is deleted
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_batches_trainer
+        ON batches(trainer_id)
+    """)
+
+
+def add_legacy_columns(cursor):
+    """Add columns that databases created by early builds are missing
+
+    Typed records select an explicit column list, so every table must
+    carry all of the current columns.
+    """
+    cursor.execute("PRAGMA table_info(questions)")
+    if 'question_type' not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("""
+        ALTER TABLE questions
+        ADD COLUMN question_type TEXT DEFAULT 'multiple_choice'
+        """)
+
+    cursor.execute("PRAGMA table_info(results)")
+    if 'attempt_number' not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("""
+        ALTER TABLE results
+        ADD COLUMN attempt_number INTEGER DEFAULT 1
+        """)
+
+
+def add_answer_key_version(cursor):
+    """Track answer key changes per exam in exams.key_version
+
+    Triggers bump the version whenever a question of the exam is added,
+    changed or removed, so cached answer keys know when to recompile.
+    """
+    cursor.execute("PRAGMA table_info(exams)")
+    if 'key_version' not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("""
+        ALTER TABLE exams
+        ADD COLUMN key_version INTEGER NOT NULL DEFAULT 0
+        """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_key_insert
+        AFTER INSERT ON questions
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1 WHERE id = NEW.exam_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_key_update
+        AFTER UPDATE OF exam_id, correct_answer, points ON questions
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1
+            WHERE id IN (OLD.exam_id, NEW.exam_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_key_delete
+        AFTER DELETE ON questions
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1 WHERE id = OLD.exam_id;
+        END
+    """)
+
+
+def _parse_packed_options(packed):
+    """[(label, text, is_correct)] from a "*A:Text|B:Text|..." string"""
+    options = []
+    for part in OPTION_SEPARATOR.split(packed or ''):
+        is_correct = part.startswith('*')
+        part = part[1:] if is_correct else part
+        if len(part) >= 2 and part[1] == ':':
+            options.append((part[0], part[2:], int(is_correct)))
+    return options
+
+
+def _rebuild_legacy_questions(cursor):
+    """Recreate a legacy questions table without its option_a..option_d columns"""
+    cursor.execute("""
+    CREATE TABLE questions_rebuilt (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        exam_id INTEGER NOT NULL,
+        question_text TEXT NOT NULL,
+        correct_answer TEXT NOT NULL,  -- Label of the correct option
+        points INTEGER DEFAULT 1 CHECK (points > 0),
+        question_type TEXT DEFAULT 'multiple_choice',
+        FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+    )
+    """)
+    cursor.execute("""
+        INSERT INTO questions_rebuilt (id, exam_id, question_text, correct_answer, points, question_type)
+        SELECT id, exam_id, question_text, correct_answer, points, question_type
+        FROM questions
+    """)
+    cursor.execute("DROP TABLE questions")
+    cursor.execute("ALTER TABLE questions_rebuilt RENAME TO questions")
+
+    # Dropping the table dropped its index and triggers
+    create_lookup_indexes(cursor)
+    add_answer_key_version(cursor)
+
+
+def create_question_options(cursor):
+    """Move answer options out of questions into the question_options table
+
+    Options packed into correct_answer as "*A:Text|B:Text|..." are split
+    into rows, as are the option_a..option_d columns of legacy databases.
+    Afterwards questions.correct_answer holds just the correct label.
+    """
+    cursor.execute("PRAGMA table_info(questions)")
+    question_columns = [col[1] for col in cursor.fetchall()]
+
+    options = []
+    if 'option_a' in question_columns:
+        cursor.execute("""
+            SELECT id, option_a, option_b, option_c, option_d, correct_answer
+            FROM questions
+        """)
+        for question_id, *texts, correct in cursor.fetchall():
+            for position, (label, text) in enumerate(zip('ABCD', texts)):
+                options.append((question_id, position, label, text, int(label == correct)))
+        _rebuild_legacy_questions(cursor)
+    else:
+        cursor.execute("SELECT id, correct_answer FROM questions")
+        for question_id, packed in cursor.fetchall():
+            for position, (label, text, is_correct) in enumerate(_parse_packed_options(packed)):
+                options.append((question_id, position, label, text, is_correct))
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS question_options (
+        question_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,  -- 0 for the first option
+        label TEXT NOT NULL,
+        text TEXT NOT NULL,
+        is_correct INTEGER NOT NULL DEFAULT 0 CHECK (is_correct IN (0, 1)),
+        PRIMARY KEY (question_id, position),
+        FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """)
+    # Answer keys read only the correct option of each question
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_question_options_correct
+        ON question_options(question_id, position)
+        WHERE is_correct = 1
+    """)
+
+    cursor.executemany("""
+        INSERT OR REPLACE INTO question_options (question_id, position, label, text, is_correct)
+        VALUES (?, ?, ?, ?, ?)
+    """, options)
+
+    cursor.execute("""
+        UPDATE questions
+        SET correct_answer = (
+            SELECT label FROM question_options
+            WHERE question_id = questions.id AND is_correct = 1
+        )
+        WHERE EXISTS (
+            SELECT 1 FROM question_options
+            WHERE question_id = questions.id AND is_correct = 1
+        )
+    """)
+
+    # Answer keys now come from question_options; keep key_version current
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_question_options_key_insert
+        AFTER INSERT ON question_options
+        WHEN NEW.is_correct = 1
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1
+            WHERE id = (SELECT exam_id FROM questions WHERE id = NEW.question_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_question_options_key_update
+        AFTER UPDATE OF position, is_correct ON question_options
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1
+            WHERE id = (SELECT exam_id FROM questions WHERE id = NEW.question_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_question_options_key_delete
+        AFTER DELETE ON question_options
+        WHEN OLD.is_correct = 1
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1
+            WHERE id = (SELECT exam_id FROM questions WHERE id = OLD.question_id);
+        END
+    """)
+
+
+def create_responses(cursor):
+    """Create the responses table holding every answer of every result"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS responses (
+        result_id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        chosen_option INTEGER,  -- position of the chosen option, NULL if unanswered
+        is_correct INTEGER NOT NULL DEFAULT 0 CHECK (is_correct IN (0, 1)),
+        points_awarded INTEGER NOT NULL DEFAULT 0 CHECK (points_awarded >= 0),
+        PRIMARY KEY (result_id, question_id),
+        FOREIGN KEY (result_id) REFERENCES results(id) ON DELETE CASCADE,
+        FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """)
+    # Per-question aggregation (and cascades from questions) read only this index
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_responses_question
+        ON responses(question_id, is_correct, chosen_option)
+    """)
+
+
+# Trigger bodies that add a result's contribution to exam_stats, or take it
+# away. Formatted with NEW or OLD; the result's own id is excluded from the
+# lookups so the same statements serve insert, update and delete triggers.
+_EXAM_STATS_ADD = """
+    INSERT INTO exam_stats (exam_id)
+    SELECT {row}.exam_id WHERE EXISTS (SELECT 1 FROM exams WHERE id = {row}.exam_id)
+    ON CONFLICT (exam_id) DO NOTHING;
+    UPDATE exam_stats SET
+        attempts = attempts + 1,
+        trainees_attempted = trainees_attempted + NOT EXISTS (
+            SELECT 1 FROM results
+            WHERE trainee_id = {row}.trainee_id AND exam_id = {row}.exam_id AND id != {row}.id
+        ),
+        trainees_passed = trainees_passed + ({row}.status IS 'Passed' AND NOT EXISTS (
+            SELECT 1 FROM results
+            WHERE trainee_id = {row}.trainee_id AND exam_id = {row}.exam_id AND id != {row}.id
+            AND status = 'Passed'
+        )),
+        scored = scored + ({row}.percentage IS NOT NULL),
+        percentage_sum = percentage_sum + IFNULL({row}.percentage, 0),
+        percentage_sq_sum = percentage_sq_sum + IFNULL({row}.percentage * {row}.percentage, 0),
+        min_percentage = CASE WHEN {row}.percentage < IFNULL(min_percentage, 101)
+                              THEN {row}.percentage ELSE min_percentage END,
+        max_percentage = CASE WHEN {row}.percentage > IFNULL(max_percentage, -1)
+                              THEN {row}.percentage ELSE max_percentage END,
+        time_spent_sum = time_spent_sum + IFNULL({row}.time_spent, 0)
+    WHERE exam_id = {row}.exam_id;
+"""
+
+_EXAM_STATS_REMOVE = """
+    UPDATE exam_stats SET
+        attempts = attempts - 1,
+        trainees_attempted = trainees_attempted - NOT EXISTS (
+            SELECT 1 FROM results
+            WHERE trainee_id = {row}.trainee_id AND exam_id = {row}.exam_id AND id != {row}.id
+        ),
+        trainees_passed = trainees_passed - ({row}.status IS 'Passed' AND NOT EXISTS (
+            SELECT 1 FROM results
+            WHERE trainee_id = {row}.trainee_id AND exam_id = {row}.exam_id AND id != {row}.id
+            AND status = 'Passed'
+        )),
+        scored = scored - ({row}.percentage IS NOT NULL),
+        percentage_sum = percentage_sum - IFNULL({row}.percentage, 0),
+        percentage_sq_sum = percentage_sq_sum - IFNULL({row}.percentage * {row}.percentage, 0),
+        -- Losing the minimum or maximum means one index probe for the next
+        min_percentage = CASE WHEN {row}.percentage <= min_percentage THEN (
+            SELECT percentage FROM results
+            WHERE exam_id = {row}.exam_id AND id != {row}.id AND percentage IS NOT NULL
+            ORDER BY percentage LIMIT 1
+        ) ELSE min_percentage END,
+        max_percentage = CASE WHEN {row}.percentage >= max_percentage THEN (
+            SELECT percentage FROM results
+            WHERE exam_id = {row}.exam_id AND id != {row}.id AND percentage IS NOT NULL
+            ORDER BY percentage DESC LIMIT 1
+        ) ELSE max_percentage END,
+        time_spent_sum = time_spent_sum - IFNULL({row}.time_spent, 0)
+    WHERE exam_id = {row}.exam_id;
+"""
+
+_BATCH_STATS_ADD = """
+    INSERT INTO batch_stats (batch_id)
+    SELECT {row}.batch_id WHERE EXISTS (SELECT 1 FROM batches WHERE id = {row}.batch_id)
+    ON CONFLICT (batch_id) DO NOTHING;
+    UPDATE batch_stats SET
+        trainees = trainees + 1,
+        active_trainees = active_trainees + ({row}.status IS 'Active'),
+        inactive_trainees = inactive_trainees + ({row}.status IS 'Inactive'),
+        completed_trainees = completed_trainees + ({row}.status IS 'Completed')
+    WHERE batch_id = {row}.batch_id;
+"""
+
+_BATCH_STATS_REMOVE = """
+    UPDATE batch_stats SET
+        trainees = trainees - 1,
+        active_trainees = active_trainees - ({row}.status IS 'Active'),
+        inactive_trainees = inactive_trainees - ({row}.status IS 'Inactive'),
+        completed_trainees = completed_trainees - ({row}.status IS 'Completed')
+    WHERE batch_id = {row}.batch_id;
+"""
+
+
+def rebuild_statistics(cursor):
+    """Recompute exam_stats and batch_stats from results and trainees
+
+    The triggers keep both tables current; this repairs them if they were
+    ever bypassed (e.g. triggers dropped during a manual fix).
+    """
+    cursor.execute("DELETE FROM exam_stats")
+    cursor.execute("""
+        INSERT INTO exam_stats (
+            exam_id, attempts, trainees_attempted, trainees_passed, scored,
+            percentage_sum, percentage_sq_sum, min_percentage, max_percentage,
+            time_spent_sum
+        )
+        SELECT exam_id,
+               COUNT(*),
+               COUNT(DISTINCT trainee_id),
+               COUNT(DISTINCT CASE WHEN status = 'Passed' THEN trainee_id END),
+               COUNT(percentage),
+               TOTAL(percentage),
+               TOTAL(percentage * percentage),
+               MIN(percentage),
+               MAX(percentage),
+               IFNULL(SUM(time_spent), 0)
+        FROM results
+        -- Rows orphaned before foreign keys were enforced have no rollup
+        WHERE exam_id IN (SELECT id FROM exams)
+        GROUP BY exam_id
+    """)
+    cursor.execute("DELETE FROM batch_stats")
+    cursor.execute("""
+        INSERT INTO batch_stats (
+            batch_id, trainees, active_trainees, inactive_trainees, completed_trainees
+        )
+        SELECT batch_id,
+               COUNT(*),
+               SUM(status IS 'Active'),
+               SUM(status IS 'Inactive'),
+               SUM(status IS 'Completed')
+        FROM trainees
+        WHERE batch_id IN (SELECT id FROM batches)
+        GROUP BY batch_id
+    """)
+
+
+def create_statistics_rollups(cursor):
+    """Create exam_stats and batch_stats, kept current by triggers
+
+    Exam and batch statistics then read one row instead of aggregating
+    every result of the exam or trainee of the batch.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS exam_stats (
+        exam_id INTEGER PRIMARY KEY,
+        attempts INTEGER NOT NULL DEFAULT 0,  -- results recorded
+        trainees_attempted INTEGER NOT NULL DEFAULT 0,
+        trainees_passed INTEGER NOT NULL DEFAULT 0,
+        scored INTEGER NOT NULL DEFAULT 0,  -- results with a percentage
+        percentage_sum REAL NOT NULL DEFAULT 0,
+        percentage_sq_sum REAL NOT NULL DEFAULT 0,
+        min_percentage REAL,
+        max_percentage REAL,
+        time_spent_sum INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS batch_stats (
+        batch_id INTEGER PRIMARY KEY,
+        trainees INTEGER NOT NULL DEFAULT 0,
+        active_trainees INTEGER NOT NULL DEFAULT 0,
+        inactive_trainees INTEGER NOT NULL DEFAULT 0,
+        completed_trainees INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (batch_id) REFERENCES batches(id) ON DELETE CASCADE
+    )
+    """)
+    # Finds the next minimum or maximum when the current one is removed
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_results_exam_percentage
+        ON results(exam_id, percentage)
+    """)
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_results_stats_insert
+        AFTER INSERT ON results
+        BEGIN
+            {_EXAM_STATS_ADD.format(row='NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_results_stats_update
+        AFTER UPDATE OF trainee_id, exam_id, percentage, time_spent, status ON results
+        BEGIN
+            {_EXAM_STATS_REMOVE.format(row='OLD')}
+            {_EXAM_STATS_ADD.format(row='NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_results_stats_delete
+        AFTER DELETE ON results
+        BEGIN
+            {_EXAM_STATS_REMOVE.format(row='OLD')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trainees_stats_insert
+        AFTER INSERT ON trainees
+        BEGIN
+            {_BATCH_STATS_ADD.format(row='NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trainees_stats_update
+        AFTER UPDATE OF batch_id, status ON trainees
+        BEGIN
+            {_BATCH_STATS_REMOVE.format(row='OLD')}
+            {_BATCH_STATS_ADD.format(row='NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_trainees_stats_delete
+        AFTER DELETE ON trainees
+        BEGIN
+            {_BATCH_STATS_REMOVE.format(row='OLD')}
+        END
+    """)
+
+    rebuild_statistics(cursor)
+
+
+# Recomputes one trainee's progress row for one exam from their results,
+# dropping it when no result is left. Formatted with NEW or OLD.
+_TRAINEE_PROGRESS_RECOMPUTE = """
+    DELETE FROM trainee_exam_progress
+    WHERE trainee_id = {row}.trainee_id AND exam_id = {row}.exam_id;
+    INSERT INTO trainee_exam_progress (
+        trainee_id, exam_id, attempts, best_percentage, passed,
+        last_result_id, last_status, last_percentage, last_date
+    )
+    SELECT r.trainee_id, r.exam_id, agg.attempts, agg.best_percentage, agg.passed,
+           r.id, r.status, r.percentage, r.date_taken
+    FROM (
+        SELECT COUNT(*) AS attempts,
+               MAX(percentage) AS best_percentage,
+               MAX(status IS 'Passed') AS passed,
+               MAX(id) AS last_id
+        FROM results
+        WHERE trainee_id = {row}.trainee_id AND exam_id = {row}.exam_id
+    ) agg
+    JOIN results r ON r.id = agg.last_id
+    WHERE EXISTS (SELECT 1 FROM trainees WHERE id = r.trainee_id)
+    AND EXISTS (SELECT 1 FROM exams WHERE id = r.exam_id);
+"""
+
+
+def rebuild_trainee_progress(cursor):
+    """Recompute trainee_exam_progress from results"""
+    cursor.execute("DELETE FROM trainee_exam_progress")
+    cursor.execute("""
+        INSERT INTO trainee_exam_progress (
+            trainee_id, exam_id, attempts, best_percentage, passed,
+            last_result_id, last_status, last_percentage, last_date
+        )
+        SELECT r.trainee_id, r.exam_id, agg.attempts, agg.best_percentage, agg.passed,
+               r.id, r.status, r.percentage, r.date_taken
+        FROM (
+            SELECT COUNT(*) AS attempts,
+                   MAX(percentage) AS best_percentage,
+                   MAX(status IS 'Passed') AS passed,
+                   MAX(id) AS last_id
+            FROM results
+            GROUP BY trainee_id, exam_id
+        ) agg
+        JOIN results r ON r.id = agg.last_id
+        -- Rows orphaned before foreign keys were enforced have no progress
+        WHERE r.trainee_id IN (SELECT id FROM trainees)
+        AND r.exam_id IN (SELECT id FROM exams)
+    """)
+
+
+def create_trainee_exam_progress(cursor):
+    """Create trainee_exam_progress, one row per trainee and exam attempted
+
+    A new result updates its row's counters in place; the rarer edits and
+    deletions of results recompute the affected row from its results.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS trainee_exam_progress (
+        trainee_id INTEGER NOT NULL,
+        exam_id INTEGER NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        best_percentage REAL,
+        passed INTEGER NOT NULL DEFAULT 0 CHECK (passed IN (0, 1)),  -- any attempt passed
+        last_result_id INTEGER,
+        last_status TEXT,
+        last_percentage REAL,
+        last_date DATETIME,
+        PRIMARY KEY (trainee_id, exam_id),
+        FOREIGN KEY (trainee_id) REFERENCES trainees(id) ON DELETE CASCADE,
+        FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """)
+    # Foreign key enforcement when an exam is deleted
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_trainee_exam_progress_exam
+        ON trainee_exam_progress(exam_id)
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_results_progress_insert
+        AFTER INSERT ON results
+        BEGIN
+            INSERT INTO trainee_exam_progress (
+                trainee_id, exam_id, attempts, best_percentage, passed,
+                last_result_id, last_status, last_percentage, last_date
+            )
+            VALUES (
+                NEW.trainee_id, NEW.exam_id, 1, NEW.percentage, NEW.status IS 'Passed',
+                NEW.id, NEW.status, NEW.percentage, NEW.date_taken
+            )
+            ON CONFLICT (trainee_id, exam_id) DO UPDATE SET
+                attempts = attempts + 1,
+                best_percentage = CASE WHEN excluded.best_percentage > IFNULL(best_percentage, -1)
+                                       THEN excluded.best_percentage ELSE best_percentage END,
+                passed = MAX(passed, excluded.passed),
+                last_result_id = excluded.last_result_id,
+                last_status = excluded.last_status,
+                last_percentage = excluded.last_percentage,
+                last_date = excluded.last_date;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_results_progress_update
+        AFTER UPDATE OF trainee_id, exam_id, percentage, status, date_taken ON results
+        BEGIN
+            {_TRAINEE_PROGRESS_RECOMPUTE.format(row='OLD')}
+        END
+    """)
+    # A result moved to another trainee or exam also changes the new row
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_results_progress_move
+        AFTER UPDATE OF trainee_id, exam_id ON results
+        WHEN NEW.trainee_id != OLD.trainee_id OR NEW.exam_id != OLD.exam_id
+        BEGIN
+            {_TRAINEE_PROGRESS_RECOMPUTE.format(row='NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_results_progress_delete
+        AFTER DELETE ON results
+        BEGIN
+            {_TRAINEE_PROGRESS_RECOMPUTE.format(row='OLD')}
+        END
+    """)
+
+    rebuild_trainee_progress(cursor)
+
+
+def create_attempt_drafts(cursor):
+    """Create attempt_drafts, the autosaved answers of in-progress exams
+
+    One row per trainee and exam, overwritten in place by each autosave and
+    deleted when the attempt is recorded.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS attempt_drafts (
+        trainee_id INTEGER NOT NULL,
+        exam_id INTEGER NOT NULL,
+        answers TEXT NOT NULL DEFAULT '{}',  -- JSON {question id: option label}
+        elapsed_seconds INTEGER NOT NULL DEFAULT 0,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (trainee_id, exam_id),
+        FOREIGN KEY (trainee_id) REFERENCES trainees(id) ON DELETE CASCADE,
+        FOREIGN KEY (exam_id) REFERENCES exams(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """)
+    # Foreign key enforcement when an exam is deleted
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_attempt_drafts_exam
+        ON attempt_drafts(exam_id)
+    """)
+
+
+def add_exam_delivery_mode(cursor):
+    """Add exams.delivery_mode: 'scroll' lists every question, 'paged'
+    shows one question at a time with a navigator"""
+    cursor.execute("PRAGMA table_info(exams)")
+    if 'delivery_mode' not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("""
+        ALTER TABLE exams
+        ADD COLUMN delivery_mode TEXT NOT NULL DEFAULT 'scroll'
+            CHECK (delivery_mode IN ('scroll', 'paged'))
+        """)
+
+
+def add_attempt_deadline(cursor):
+    """Add attempt_drafts.expires_at, the UTC deadline fixed when an
+    attempt starts and enforced when it is submitted"""
+    cursor.execute("PRAGMA table_info(attempt_drafts)")
+    if 'expires_at' not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("""
+        ALTER TABLE attempt_drafts
+        ADD COLUMN expires_at DATETIME
+        """)
+
+
+def widen_option_key_triggers(cursor):
+    """Bump exams.key_version on any change to an exam's options
+
+    Answer keys grade by each question's own option labels, so adding,
+    removing or relabelling any option changes the key, not only changes
+    to the correct one.
+    """
+    for name in ('insert', 'update', 'delete'):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_question_options_key_{name}")
+    cursor.execute("""
+        CREATE TRIGGER trg_question_options_key_insert
+        AFTER INSERT ON question_options
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1
+            WHERE id = (SELECT exam_id FROM questions WHERE id = NEW.question_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_question_options_key_update
+        AFTER UPDATE OF question_id, position, label, is_correct ON question_options
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1
+            WHERE id IN (
+                SELECT exam_id FROM questions WHERE id IN (OLD.question_id, NEW.question_id)
+            );
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_question_options_key_delete
+        AFTER DELETE ON question_options
+        BEGIN
+            UPDATE exams SET key_version = key_version + 1
+            WHERE id = (SELECT exam_id FROM questions WHERE id = OLD.question_id);
+        END
+    """)
+
+
+# Ordered list of (version, description, migration). Append new migrations
+# to the end; never reorder or edit one that has shipped.
+MIGRATIONS = [
+    (1, "Create base tables", create_base_tables),
+    (2, "Add and backfill results.percentage", add_result_percentage),
+    (3, "Create lookup indexes", create_lookup_indexes),
+    (4, "Add columns missing from legacy tables", add_legacy_columns),
+    (5, "Add exams.key_version and answer key triggers", add_answer_key_version),
+    (6, "Move answer options into question_options", create_question_options),
+    (7, "Create responses table", create_responses),
+    (8, "Create trigger-maintained statistics rollups", create_statistics_rollups),
+    (9, "Create materialized trainee exam progress", create_trainee_exam_progress),
+    (10, "Create attempt_drafts for answer autosave", create_attempt_drafts),
+    (11, "Add exams.delivery_mode", add_exam_delivery_mode),
+    (12, "Add attempt_drafts.expires_at", add_attempt_deadline),
+    (13, "Bump answer key versions on any option change", widen_option_key_triggers),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Return the migration version recorded in the database header"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    """Apply every pending migration and return the resulting version"""
+    version = get_schema_version(conn)
+    if version >= LATEST_VERSION:
+        return version  # Fast path: nothing to do
+
+    for migration_version, description, migration in MIGRATIONS:
+        if migration_version <= version:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if get_schema_version(conn) >= migration_version:
+                conn.rollback()
+                continue
+            migration(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {migration_version}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Schema migration {migration_version} ({description}) failed: {e}")
+            raise
+
+    return get_schema_version(conn)
@@ -0,0 +1,283 @@
+"""Opt-in query instrumentation for DatabaseManager.
+
+When enabled, every public DatabaseManager method is timed and counted, the
+rows its statements return and the time spent waiting on the write lock are
+tallied, and statements slower than a threshold are written with their
+EXPLAIN QUERY PLAN to a rotating slow-query log.
+"""
+import bisect
+import json
+import logging
+import sqlite3
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+# Upper bounds (seconds) of the wall-time histogram buckets; the last bucket
+# collects everything slower
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+HISTOGRAM_LABELS = tuple(f"<={int(b * 1000)}ms" for b in HISTOGRAM_BUCKETS) + (">5000ms",)
+
+# Statements worth running EXPLAIN QUERY PLAN on
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+class MethodStats:
+    __slots__ = ('calls', 'errors', 'total_time', 'max_time', 'rows', 'lock_wait', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.lock_wait = 0.0
+        self.histogram = [0] * len(HISTOGRAM_LABELS)
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_time': round(self.total_time, 6),
+            'avg_time': round(self.total_time / self.calls, 6) if self.calls else 0,
+            'max_time': round(self.max_time, 6),
+            'rows': self.rows,
+            'lock_wait': round(self.lock_wait, 6),
+            'histogram': dict(zip(HISTOGRAM_LABELS, self.histogram)),
+        }
+
+
+class QueryStats:
+    def __init__(self, slow_threshold=0.1, slow_log_path='slow_queries.log',
+                 max_bytes=1_048_576, backup_count=3):
+        """
+        Args:
+            slow_threshold: Seconds after which a statement is logged as slow
+            slow_log_path: Slow-query log file (rotated at max_bytes)
+            max_bytes: Size at which the slow-query log rotates
+            backup_count: Rotated slow-query logs to keep
+        """
+        self.slow_threshold = slow_threshold
+        self._methods = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started_at = time.time()
+
+        self.slow_log = logging.getLogger(f"{__name__}.slow.{id(self)}")
+        self.slow_log.setLevel(logging.INFO)
+        self.slow_log.propagate = False
+        if slow_log_path:
+            handler = RotatingFileHandler(
+                slow_log_path,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            self.slow_log.addHandler(handler)
+
+    def _current_method(self):
+        stack = getattr(self._local, 'methods', None)
+        return stack[-1] if stack else '(outside methods)'
+
+    def _stats_for(self, method):
+        stats = self._methods.get(method)
+        if stats is None:
+            stats = self._methods[method] = MethodStats()
+        return stats
+
+    def wrap(self, name, method):
+        """Return method wrapped to record calls, wall time and errors"""
+        def instrumented(*args, **kwargs):
+            stack = getattr(self._local, 'methods', None)
+            if stack is None:
+                stack = self._local.methods = []
+            stack.append(name)
+            start = time.perf_counter()
+            failed = False
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                with self._lock:
+                    stats = self._stats_for(name)
+                    stats.calls += 1
+                    stats.errors += failed
+                    stats.total_time += elapsed
+                    stats.max_time = max(stats.max_time, elapsed)
+                    stats.histogram[bisect.bisect_left(HISTOGRAM_BUCKETS, elapsed)] += 1
+
+        instrumented.__name__ = name
+        instrumented.__doc__ = method.__doc__
+        return instrumented
+
+    def on_behalf_of_caller(self, operation):
+        """Wrap operation so its statements count for the calling method
+
+        For work handed to another thread, such as the group-commit writer:
+        the method running now is captured, and the wrapped operation's
+        rows and slow statements are recorded under it wherever it runs.
+        """
+        name = self._current_method()
+
+        def attributed(*args, **kwargs):
+            stack = getattr(self._local, 'methods', None)
+            if stack is None:
+                stack = self._local.methods = []
+            stack.append(name)
+            try:
+                return operation(*args, **kwargs)
+            finally:
+                stack.pop()
+
+        return attributed
+
+    def record_rows(self, count):
+        """Attribute fetched rows to the method running on this thread"""
+        if count:
+            with self._lock:
+                self._stats_for(self._current_method()).rows += count
+
+    def record_lock_wait(self, elapsed):
+        """Attribute time spent waiting for the write lock"""
+        with self._lock:
+            self._stats_for(self._current_method()).lock_wait += elapsed
+
+    def record_statement(self, conn, sql, params, elapsed):
+        """Log a finished statement to the slow-query log if over threshold"""
+        if elapsed < self.slow_threshold:
+            return
+        statement = ' '.join(sql.split())
+        plan = []
+        if statement.split(' ', 1)[0].upper() in EXPLAINABLE:
+            try:
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())]
+            except sqlite3.Error as e:
+                plan = [f"(plan unavailable: {e})"]
+        self.slow_log.info(
+            "%.1fms in %s: %s | params=%r | plan: %s",
+            elapsed * 1000,
+            self._current_method(),
+            statement,
+            params,
+            '; '.join(plan)
+        )
+
+    def summary(self):
+        """Per-method statistics as a JSON-serializable dict"""
+        with self._lock:
+            methods = {name: stats.as_dict() for name, stats in self._methods.items()}
+        return {
+            'started_at': self.started_at,
+            'slow_threshold': self.slow_threshold,
+            'methods': methods,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+        self.started_at = time.time()
+
+    def dump(self, path):
+        """Write the summary to a JSON file (read by db_tools.py query-stats)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def format_summary(summary):
+    """Render a summary dict as a text table, slowest methods first"""
+    methods = sorted(
+        summary['methods'].items(),
+        key=lambda item: item[1]['total_time'],
+        reverse=True
+    )
+    header = f"{'Method':<32} {'Calls':>7} {'Errors':>6} {'Total ms':>10} {'Avg ms':>8} {'Max ms':>8} {'Rows':>9} {'Lock ms':>8}"
+    lines = [header, '-' * len(header)]
+    for name, stats in methods:
+        lines.append(
+            f"{name:<32} {stats['calls']:>7} {stats['errors']:>6} "
+            f"{stats['total_time'] * 1000:>10.1f} {stats['avg_time'] * 1000:>8.2f} "
+            f"{stats['max_time'] * 1000:>8.1f} {stats['rows']:>9} {stats['lock_wait'] * 1000:>8.1f}"
+        )
+
+    lines.append('')
+    lines.append("Wall time histogram")
+    lines.append(f"{'Method':<32} " + ' '.join(f"{label:>8}" for label in HISTOGRAM_LABELS))
+    for name, stats in methods:
+        counts = [stats['histogram'].get(label, 0) for label in HISTOGRAM_LABELS]
+        lines.append(f"{name:<32} " + ' '.join(f"{count:>8}" for count in counts))
+    return '\n'.join(lines)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times its statements and counts the rows they return
+
+    A statement's time runs from execute() until its results are exhausted
+    or the cursor moves on, so lazily stepped SELECTs are timed in full.
+    """
+    stats = None
+
+    def _finish(self):
+        sql = getattr(self, '_sql', None)
+        if sql is not None:
+            self._sql = None
+            self.stats.record_statement(self.connection, sql, self._params, self._elapsed)
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._sql, self._params = sql, parameters
+            self._elapsed = time.perf_counter() - start
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._sql, self._params = sql, None
+            self._elapsed = time.perf_counter() - start
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed = getattr(self, '_elapsed', 0) + time.perf_counter() - start
+        if row is None:
+            self._finish()
+        else:
+            self.stats.record_rows(1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._elapsed = getattr(self, '_elapsed', 0) + time.perf_counter() - start
+        self.stats.record_rows(len(rows))
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed = getattr(self, '_elapsed', 0) + time.perf_counter() - start
+        self.stats.record_rows(len(rows))
+        self._finish()
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
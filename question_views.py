@@ -0,0 +1,471 @@
+"""Exam question views whose widget count does not grow with the exam.
+
+VirtualQuestionList scrolls through every question but only materializes the
+ones in or near the viewport: a small pool of QuestionPanel slots is placed
+on a canvas at each question's offset and rebound as the list scrolls.
+
+PagedQuestionView shows one question at a time in a single QuestionPanel
+that is reconfigured in place, next to a navigator drawn as canvas items
+rather than widgets.
+
+Both read answers from a plain dict kept by the caller, not from Tk
+variables.
+"""
+import math
+import tkinter as tk
+from bisect import bisect_right
+from itertools import accumulate
+from tkinter import ttk
+
+import customtkinter as ctk
+
+from config import THEME
+
+PANEL_GAP = 10  # vertical space between two questions
+TEXT_WRAP = 800
+NAVIGATOR_COLUMNS = 5
+NAVIGATOR_CELL = 36  # pixels per navigator cell, including its margin
+
+
+class QuestionPanel(ctk.CTkFrame):
+    """A reusable widget slot showing one question and its options"""
+
+    def __init__(self, parent, on_select):
+        """
+        Args:
+            parent: Widget the panel is created in
+            on_select: Called with (question id, option label) when the
+                trainee picks an option
+        """
+        super().__init__(
+            parent,
+            fg_color=THEME["colors"]["surface"],
+            corner_radius=8,
+            border_width=1,
+            border_color=THEME["colors"]["secondary"]
+        )
+        self.on_select = on_select
+        self.question = None
+        self.index = None
+
+        self.number_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=THEME["fonts"]["subheading"],
+            text_color=THEME["colors"]["primary"]
+        )
+        self.number_label.pack(anchor="w", padx=15, pady=(10, 5))
+
+        self.text_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=THEME["fonts"]["body"],
+            text_color=THEME["colors"]["text"],
+            wraplength=TEXT_WRAP,
+            justify="left"
+        )
+        self.text_label.pack(anchor="w", padx=15, pady=(0, 10))
+
+        self.options_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.options_frame.pack(fill="x", padx=15, pady=(0, 10))
+
+        # One radio button per option position, created as questions with
+        # more options are shown; a question with fewer options hides the rest
+        self.variable = tk.StringVar()
+        self.option_buttons = []
+
+    def _add_option_button(self):
+        radio_btn = ctk.CTkRadioButton(
+            self.options_frame,
+            text="",
+            variable=self.variable,
+            value="",
+            font=THEME["fonts"]["body"],
+            text_color=THEME["colors"]["text"],
+            fg_color=THEME["colors"]["primary"],
+            command=self._on_click
+        )
+        self.option_buttons.append(radio_btn)
+
+    def show(self, index, question, selected):
+        """Bind the panel to a question
+
+        Args:
+            index: The question's position in the exam, from 0
+            question: The ExamQuestion to show
+            selected: The label of the chosen option, or '' if unanswered
+        """
+        self.index = index
+        self.question = question
+        self.number_label.configure(text=f"Question {index + 1}")
+        self.text_label.configure(text=question.question_text)
+
+        while len(self.option_buttons) < len(question.options):
+            self._add_option_button()
+        for radio_btn, option in zip(self.option_buttons, question.options):
+            radio_btn.configure(text=f"{option.label}. {option.text}", value=option.label)
+            if not radio_btn.winfo_manager():
+                radio_btn.pack(anchor="w", padx=15, pady=6)
+        for radio_btn in self.option_buttons[len(question.options):]:
+            radio_btn.pack_forget()
+
+        # Setting the variable only updates the buttons; on_select is
+        # reserved for the trainee's own clicks
+        self.variable.set(selected or '')
+
+    def _on_click(self):
+        if self.question is not None:
+            self.on_select(self.question.id, self.variable.get())
+
+
+class VirtualQuestionList(ctk.CTkFrame):
+    """A scrollable list of questions that materializes only visible ones"""
+
+    def __init__(self, parent, questions, answers, on_select, overscan=2):
+        """
+        Args:
+            parent: Widget the list is created in
+            questions: ExamQuestion list, in display order
+            answers: {question id: option label}; read whenever a question
+                is shown, so the caller keeps it current in on_select
+            on_select: Called with (question id, option label) on each choice
+            overscan: Questions materialized beyond each edge of the viewport
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.questions = questions
+        self.answers = answers
+        self.on_select = on_select
+        self.overscan = overscan
+
+        # Heights start as estimates and are replaced by measured ones as
+        # questions are shown
+        self.heights = [self._estimate_height(question) for question in questions]
+        self.offsets = []
+        self.total_height = 0
+        self._layout()
+
+        self.shown = {}  # question index -> (panel, canvas item)
+        self.free = []  # (panel, canvas item) slots not bound to a question
+        self._render_pending = None
+        self._layout_pending = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(
+            self,
+            bg=THEME["colors"]["background"],
+            highlightthickness=0
+        )
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.canvas.configure(
+            yscrollcommand=self._on_yview,
+            scrollregion=(0, 0, 0, self.total_height)
+        )
+
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind_all("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+        self.bind("<Destroy>", self._on_destroy)
+
+    @staticmethod
+    def _estimate_height(question):
+        lines = max(1, math.ceil(len(question.question_text) * 8 / TEXT_WRAP))
+        return 70 + lines * 20 + len(question.options) * 40
+
+    def _layout(self):
+        """Recompute each question's top offset from the heights"""
+        self.offsets = [0] + list(accumulate(height + PANEL_GAP for height in self.heights))
+        self.total_height = self.offsets.pop()
+
+    def see(self, index):
+        """Scroll so the question at index is at the top of the view"""
+        if self.total_height:
+            self.canvas.yview_moveto(self.offsets[index] / self.total_height)
+
+    def visible_range(self):
+        """The (first, last) question indexes in the viewport"""
+        if not self.questions:
+            return 0, -1
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(bisect_right(self.offsets, top) - 1, 0)
+        last = max(bisect_right(self.offsets, bottom) - 1, first)
+        return first, last
+
+    def refresh(self):
+        """Re-read the answers of the shown questions"""
+        for index, (panel, _) in self.shown.items():
+            panel.show(index, self.questions[index], self.answers.get(self.questions[index].id, ''))
+
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _on_canvas_configure(self, event):
+        for _, item in list(self.shown.values()) + self.free:
+            self.canvas.itemconfigure(item, width=event.width)
+        self._schedule_render()
+
+    def _on_mousewheel(self, event):
+        # macOS reports deltas of a few units, which int(delta / 120) rounds
+        # to nothing; scroll at least one unit the delta's way
+        if event.delta:
+            steps = max(1, abs(event.delta) // 120)
+            self.canvas.yview_scroll(-steps if event.delta > 0 else steps, "units")
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                self.canvas.unbind_all(sequence)
+
+    def _schedule_render(self):
+        if self._render_pending is None:
+            self._render_pending = self.after_idle(self._render)
+
+    def _render(self):
+        """Bind panels to the questions around the viewport"""
+        self._render_pending = None
+        first, last = self.visible_range()
+        wanted = range(max(first - self.overscan, 0), min(last + self.overscan + 1, len(self.questions)))
+
+        # Release slots that scrolled out of range before binding new ones
+        for index in [index for index in self.shown if index not in wanted]:
+            panel, item = self.shown.pop(index)
+            self.canvas.itemconfigure(item, state="hidden")
+            self.free.append((panel, item))
+
+        for index in wanted:
+            if index in self.shown:
+                continue
+            if self.free:
+                panel, item = self.free.pop()
+                self.canvas.coords(item, 0, self.offsets[index])
+                self.canvas.itemconfigure(item, state="normal")
+            else:
+                panel = QuestionPanel(self.canvas, self.on_select)
+                panel.bind("<Configure>", lambda e, panel=panel: self._on_panel_configure(panel, e))
+                item = self.canvas.create_window(
+                    0, self.offsets[index],
+                    window=panel,
+                    anchor="nw",
+                    width=self.canvas.winfo_width()
+                )
+            question = self.questions[index]
+            panel.show(index, question, self.answers.get(question.id, ''))
+            self.shown[index] = (panel, item)
+
+    def _on_panel_configure(self, panel, event):
+        index = panel.index
+        if index is None or self.shown.get(index, (None,))[0] is not panel:
+            return
+        if event.height != self.heights[index]:
+            self.heights[index] = event.height
+            if self._layout_pending is None:
+                self._layout_pending = self.after_idle(self._relayout)
+
+    def _relayout(self):
+        """Apply measured heights, keeping the top visible question in place"""
+        self._layout_pending = None
+        if not self.questions:
+            return
+        top = self.canvas.canvasy(0)
+        anchor = max(bisect_right(self.offsets, top) - 1, 0)
+        within = top - self.offsets[anchor]
+
+        self._layout()
+        self.canvas.configure(scrollregion=(0, 0, 0, self.total_height))
+        for index, (_, item) in self.shown.items():
+            self.canvas.coords(item, 0, self.offsets[index])
+        self.canvas.yview_moveto((self.offsets[anchor] + within) / self.total_height)
+        self._schedule_render()
+
+
+class PagedQuestionView(ctk.CTkFrame):
+    """One question at a time, with a navigator grid of every question"""
+
+    def __init__(self, parent, questions, answers, on_select, flagged):
+        """
+        Args:
+            parent: Widget the view is created in
+            questions: ExamQuestion list, in display order
+            answers: {question id: option label}; the caller keeps it
+                current in on_select
+            on_select: Called with (question id, option label) on each choice
+            flagged: Set of question ids marked for review; updated in place
+        """
+        super().__init__(parent, fg_color="transparent")
+        self.questions = questions
+        self.answers = answers
+        self.on_select = on_select
+        self.flagged = flagged
+        self.current = 0
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        # Question side: the one panel and its navigation buttons
+        question_side = ctk.CTkFrame(self, fg_color="transparent")
+        question_side.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
+
+        self.panel = QuestionPanel(question_side, self._on_select)
+        self.panel.pack(fill="x", padx=10, pady=5)
+
+        button_bar = ctk.CTkFrame(question_side, fg_color="transparent")
+        button_bar.pack(fill="x", padx=10, pady=10)
+
+        self.prev_btn = ctk.CTkButton(
+            button_bar,
+            text="Previous",
+            width=110,
+            font=THEME["fonts"]["body"],
+            fg_color=THEME["colors"]["secondary"],
+            hover_color=THEME["colors"]["secondary_hover"],
+            command=lambda: self.go(self.current - 1)
+        )
+        self.prev_btn.pack(side="left")
+
+        self.flag_btn = ctk.CTkButton(
+            button_bar,
+            text="Flag for Review",
+            width=140,
+            font=THEME["fonts"]["body"],
+            fg_color=THEME["colors"]["secondary"],
+            hover_color=THEME["colors"]["secondary_hover"],
+            command=self.toggle_flag
+        )
+        self.flag_btn.pack(side="left", padx=10)
+
+        self.next_btn = ctk.CTkButton(
+            button_bar,
+            text="Next",
+            width=110,
+            font=THEME["fonts"]["body"],
+            fg_color=THEME["colors"]["primary"],
+            hover_color=THEME["colors"]["primary_hover"],
+            command=lambda: self.go(self.current + 1)
+        )
+        self.next_btn.pack(side="right")
+
+        # Navigator side: a numbered cell per question on one canvas
+        navigator_side = ctk.CTkFrame(self, fg_color="transparent")
+        navigator_side.grid(row=0, column=1, sticky="ns")
+
+        self.summary_label = ctk.CTkLabel(
+            navigator_side,
+            text="",
+            font=THEME["fonts"]["body"],
+            text_color=THEME["colors"]["text_secondary"]
+        )
+        self.summary_label.pack(anchor="w", pady=(0, 5))
+
+        navigator_frame = ctk.CTkFrame(navigator_side, fg_color="transparent")
+        navigator_frame.pack(fill="y", expand=True)
+
+        rows = math.ceil(len(questions) / NAVIGATOR_COLUMNS)
+        self.navigator = tk.Canvas(
+            navigator_frame,
+            width=NAVIGATOR_COLUMNS * NAVIGATOR_CELL,
+            bg=THEME["colors"]["background"],
+            highlightthickness=0,
+            scrollregion=(0, 0, NAVIGATOR_COLUMNS * NAVIGATOR_CELL, rows * NAVIGATOR_CELL)
+        )
+        self.navigator.pack(side="left", fill="y", expand=True)
+        navigator_scrollbar = ttk.Scrollbar(
+            navigator_frame, orient="vertical", command=self.navigator.yview
+        )
+        navigator_scrollbar.pack(side="right", fill="y")
+        self.navigator.configure(yscrollcommand=navigator_scrollbar.set)
+
+        self.cells = []  # (rectangle item, text item) per question
+        for index in range(len(questions)):
+            row, column = divmod(index, NAVIGATOR_COLUMNS)
+            x, y = column * NAVIGATOR_CELL + 2, row * NAVIGATOR_CELL + 2
+            rect = self.navigator.create_rectangle(
+                x, y, x + NAVIGATOR_CELL - 4, y + NAVIGATOR_CELL - 4, width=1
+            )
+            text = self.navigator.create_text(
+                x + NAVIGATOR_CELL / 2 - 2, y + NAVIGATOR_CELL / 2 - 2,
+                text=str(index + 1),
+                font=("Helvetica", 10)
+            )
+            for item in (rect, text):
+                self.navigator.tag_bind(item, "<Button-1>", lambda e, index=index: self.go(index))
+            self.cells.append((rect, text))
+            self._paint_cell(index)
+
+        if questions:
+            self.go(0)
+
+    def go(self, index):
+        """Show the question at index"""
+        if not 0 <= index < len(self.questions):
+            return
+        previous, self.current = self.current, index
+        question = self.questions[index]
+        self.panel.show(index, question, self.answers.get(question.id, ''))
+
+        self.prev_btn.configure(state="normal" if index > 0 else "disabled")
+        self.next_btn.configure(state="normal" if index < len(self.questions) - 1 else "disabled")
+        self.flag_btn.configure(
+            text="Remove Flag" if question.id in self.flagged else "Flag for Review"
+        )
+        self._paint_cell(previous)
+        self._paint_cell(index)
+        self._keep_cell_visible(index)
+        self._update_summary()
+
+    def toggle_flag(self):
+        """Flag the current question for review, or clear its flag"""
+        question = self.questions[self.current]
+        if question.id in self.flagged:
+            self.flagged.discard(question.id)
+        else:
+            self.flagged.add(question.id)
+        self.flag_btn.configure(
+            text="Remove Flag" if question.id in self.flagged else "Flag for Review"
+        )
+        self._paint_cell(self.current)
+        self._update_summary()
+
+    def _on_select(self, question_id, label):
+        self.on_select(question_id, label)
+        self._paint_cell(self.current)
+        self._update_summary()
+
+    def _paint_cell(self, index):
+        if not 0 <= index < len(self.cells):
+            return
+        question_id = self.questions[index].id
+        rect, text = self.cells[index]
+        if question_id in self.flagged:
+            fill, text_color = THEME["colors"]["warning"], THEME["colors"]["text"]
+        elif self.answers.get(question_id):
+            fill, text_color = THEME["colors"]["primary"], "white"
+        else:
+            fill, text_color = THEME["colors"]["surface"], THEME["colors"]["text"]
+        current = index == self.current
+        self.navigator.itemconfigure(
+            rect,
+            fill=fill,
+            outline=THEME["colors"]["text"] if current else THEME["colors"]["secondary"],
+            width=3 if current else 1
+        )
+        self.navigator.itemconfigure(text, fill=text_color)
+
+    def _keep_cell_visible(self, index):
+        rows = math.ceil(len(self.questions) / NAVIGATOR_COLUMNS)
+        top, bottom = self.navigator.yview()
+        row_fraction = (index // NAVIGATOR_COLUMNS) / rows
+        if not top <= row_fraction < bottom - 1 / rows:
+            self.navigator.yview_moveto(max(row_fraction - (bottom - top) / 2, 0))
+
+    def _update_summary(self):
+        answered = sum(1 for question in self.questions if self.answers.get(question.id))
+        self.summary_label.configure(
+            text=f"Answered {answered}/{len(self.questions)} • Flagged {len(self.flagged)}"
+        )
@@ -0,0 +1,149 @@
+"""Typed record objects returned by DatabaseManager.
+
+Records are named tuples: they need no per-row dict, and callers can read
+fields by name (question.question_text) instead of by position. Each table
+record lists its fields in table column order, so queries select
+``columns(Record)`` and rows map straight onto the record.
+"""
+from typing import NamedTuple, Optional
+
+
+class Trainer(NamedTuple):
+    id: int
+    name: str
+    class_assigned: Optional[str]
+    contact_email: Optional[str]
+    hire_date: str
+
+
+class Batch(NamedTuple):
+    id: int
+    batch_year: str
+    num_trainees: Optional[int]
+    training_duration: str
+    training_location: Optional[str]
+    trainer_id: Optional[int]
+
+
+class Trainee(NamedTuple):
+    id: int
+    name: str
+    id_no: str
+    uli: Optional[str]
+    batch_id: int
+    batch_year: int
+    exams_taken: int
+    status: Optional[str]
+    remarks: Optional[str]
+
+
+class Exam(NamedTuple):
+    id: int
+    title: str
+    module_no: str
+    num_items: int
+    time_limit: int  # minutes
+    batch_id: int
+    created_at: Optional[str]
+    status: str
+    delivery_mode: str  # 'scroll' or 'paged'
+
+
+class Question(NamedTuple):
+    id: int
+    exam_id: int
+    question_text: str
+    correct_answer: str
+    points: int
+    question_type: Optional[str]
+
+
+class Result(NamedTuple):
+    id: int
+    trainee_id: int
+    exam_id: int
+    score: int
+    total_items: int
+    percentage: Optional[float]
+    time_spent: int  # seconds
+    date_taken: Optional[str]
+    status: Optional[str]
+    attempt_number: Optional[int]
+
+
+class AvailableExam(NamedTuple):
+    """An exam of the trainee's batch with their attempt status"""
+    id: int
+    title: str
+    module_no: str
+    num_items: int
+    time_limit: int
+    status: str  # 'Not Taken' or 'Completed'
+
+
+class TraineeResult(NamedTuple):
+    """A result joined with its exam title"""
+    exam_title: str
+    score: int
+    total_items: int
+    percentage: Optional[float]
+    date_taken: Optional[str]
+    time_spent: int
+    status: Optional[str]
+
+
+class QuestionOption(NamedTuple):
+    question_id: int
+    position: int  # 0 for the first option
+    label: str
+    text: str
+    is_correct: int
+
+
+class ExamQuestion(NamedTuple):
+    """A question with its options, in position order"""
+    id: int
+    exam_id: int
+    question_text: str
+    points: int
+    question_type: Optional[str]
+    options: tuple  # of QuestionOption
+
+
+class AttemptDraft(NamedTuple):
+    """The autosaved answers of an in-progress attempt"""
+    trainee_id: int
+    exam_id: int
+    answers: dict  # {question id: option label}
+    elapsed_seconds: int
+    updated_at: Optional[str]
+    expires_at: Optional[str]  # UTC deadline of the attempt
+    seconds_left: Optional[float]  # to the deadline, as of the read
+
+
+# Record type for each table, in the whitelist of tables the generic
+# record methods may touch
+TABLE_RECORDS = {
+    'trainers': Trainer,
+    'batches': Batch,
+    'trainees': Trainee,
+    'exams': Exam,
+    'questions': Question,
+    'results': Result,
+}
+
+
+def columns(record_type, alias=None):
+    """SELECT column list for a record type, optionally table-qualified"""
+    prefix = f"{alias}." if alias else ""
+    return ', '.join(f"{prefix}{field}" for field in record_type._fields)
+
+
+def record_factory(record_type):
+    """sqlite3 row factory that builds record_type from each row"""
+    make = record_type._make
+
+    def factory(cursor, row):
+        return make(row)
+
+    return factory
@@ -0,0 +1,124 @@
+"""Vectorized re-scoring of stored exam responses.
+
+After an answer key is corrected, every stored response of the exam is
+regraded against the current key in one pass of NumPy array operations:
+correctness and points per response, then score, percentage and
+Passed/Failed per result. Only the rows that actually change are written
+back.
+"""
+import numpy as np
+
+from answer_keys import NO_ANSWER
+
+PASSING_PERCENTAGE = 75
+
+
+def regrade(key, responses, results):
+    """Regrade responses against an answer key
+
+    Args:
+        key: The exam's current AnswerKey
+        responses: (result_id, question_id, chosen_option, is_correct,
+            points_awarded) rows, with NO_ANSWER for unanswered questions
+        results: (id, trainee_id, score, total_items, percentage, status)
+            rows of the exam's results
+
+    Returns:
+        (response_updates, result_updates, report) where the updates are
+        parameter rows for the UPDATE statements and report describes the
+        changes
+    """
+    report = {
+        'results_checked': 0,
+        'results_changed': 0,
+        'responses_changed': 0,
+        'now_passed': 0,
+        'now_failed': 0,
+        'results_without_responses': 0,
+        'changes': [],
+    }
+
+    result_rows = np.array(
+        [(row[0], row[1], row[2], row[3]) for row in results], dtype=np.int64
+    ).reshape(-1, 4)
+    old_percentage = np.array([row[4] or 0.0 for row in results], dtype=np.float64)
+    old_passed = np.array([row[5] == 'Passed' for row in results], dtype=bool)
+
+    if not responses:
+        report['results_without_responses'] = len(results)
+        return [], [], report
+
+    data = np.array(responses, dtype=np.int64)
+    result_ids, question_ids, chosen, old_correct, old_points = data.T
+
+    # Position of each response's question in the key (ordered by question
+    # id); questions no longer in the key point at a trailing sentinel
+    key_ids = np.array(key.question_ids, dtype=np.int64)
+    key_correct = np.append(np.array(key.correct, dtype=np.int64), NO_ANSWER)
+    key_points = np.append(np.array(key.points, dtype=np.int64), 0)
+    position = np.minimum(np.searchsorted(key_ids, question_ids), len(key_ids))
+    in_key = position < len(key_ids)
+    in_key[in_key] = key_ids[position[in_key]] == question_ids[in_key]
+    position[~in_key] = len(key_ids)
+
+    expected = key_correct[position]
+    new_correct = (chosen == expected) & (expected != NO_ANSWER)
+    new_points = np.where(new_correct, key_points[position], 0)
+
+    changed = (new_correct.astype(np.int64) != old_correct) | (new_points != old_points)
+    report['responses_changed'] = int(changed.sum())
+    response_updates = list(zip(
+        new_correct[changed].astype(int).tolist(),
+        new_points[changed].tolist(),
+        result_ids[changed].tolist(),
+        question_ids[changed].tolist()
+    ))
+
+    # Per-result scores; every graded result is one of the exam's results
+    graded_ids, inverse = np.unique(result_ids, return_inverse=True)
+    scores = np.bincount(inverse, weights=new_points).astype(np.int64)
+    ids = result_rows[:, 0]
+    order = np.argsort(ids)
+    rows = order[np.searchsorted(ids, graded_ids, sorter=order)]
+
+    report['results_checked'] = len(graded_ids)
+    report['results_without_responses'] = len(results) - len(graded_ids)
+
+    total = key.total_points
+    percentages = scores / total * 100 if total > 0 else np.zeros(len(scores))
+    passed = percentages >= PASSING_PERCENTAGE
+
+    old_scores = result_rows[rows, 2]
+    old_totals = result_rows[rows, 3]
+    result_changed = (
+        (scores != old_scores)
+        | (old_totals != total)
+        | ~np.isclose(percentages, old_percentage[rows])
+        | (passed != old_passed[rows])
+    )
+    report['results_changed'] = int(result_changed.sum())
+    report['now_passed'] = int((passed & ~old_passed[rows] & result_changed).sum())
+    report['now_failed'] = int((~passed & old_passed[rows] & result_changed).sum())
+
+    statuses = np.where(passed, 'Passed', 'Failed')
+    result_updates = list(zip(
+        scores[result_changed].tolist(),
+        [total] * int(result_changed.sum()),
+        percentages[result_changed].tolist(),
+        statuses[result_changed].tolist(),
+        graded_ids[result_changed].tolist()
+    ))
+
+    report['changes'] = [
+        {
+            'result_id': result_id,
+            'trainee_id': int(result_rows[row, 1]),
+            'old_score': int(result_rows[row, 2]),
+            'new_score': score,
+            'old_status': 'Passed' if old_passed[row] else 'Failed',
+            'new_status': status,
+        }
+        for (score, _, _, status, result_id), row
+        in zip(result_updates, rows[result_changed].tolist())
+    ]
+    return response_updates, result_updates, report
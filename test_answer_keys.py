@@ -0,0 +1,58 @@
+"""Tests for compiled answer keys and their cache"""
+from answer_keys import AnswerKey, AnswerKeyCache
+
+
+def test_grade_follows_each_questions_stored_labels():
+    # Question 3 has no option C: D is stored at position 2
+    key = AnswerKey(1, 1, [(1, 0, 1), (2, 1, 2), (3, 2, 1), (4, None, 5)], {
+        1: ['A', 'B', 'C', 'D'], 2: ['A', 'B', 'C', 'D'], 3: ['A', 'B', 'D'], 4: ['A', 'B']
+    })
+
+    score, responses = key.grade({1: 'A', 2: 'C', 3: 'D', 4: 'A'})
+
+    assert (len(key), key.total_points) == (4, 9)
+    assert score == 2
+    assert responses == [(1, 0, 1, 1), (2, 2, 0, 0), (3, 2, 1, 1), (4, 0, 0, 0)]
+
+
+def test_grade_records_unanswered_and_unknown_labels_as_no_answer():
+    key = AnswerKey(1, 1, [(1, 0, 1), (2, 1, 1)], {1: ['A', 'B'], 2: ['A', 'B']})
+
+    score, responses = key.grade({2: 'Z'})
+
+    assert score == 0
+    assert responses == [(1, None, 0, 0), (2, None, 0, 0)]
+
+
+def test_submission_grades_by_stored_labels(db, exam):
+    question_id = db.save_question(exam['exam_id'], 'Question 3', {'A': 'a', 'B': 'b', 'D': 'd'}, 'D')
+    answers = dict(zip(exam['questions'], 'ABC'))
+
+    answers[question_id] = 'D'
+    assert db.submit_exam_result(exam['trainees'][0], exam['exam_id'], answers, 60)['score'] == 4
+    answers[question_id] = 'C'
+    assert db.submit_exam_result(exam['trainees'][1], exam['exam_id'], answers, 60)['score'] == 3
+
+
+def test_cached_key_is_recompiled_after_a_question_edit(db, exam):
+    key = db.get_answer_key(exam['exam_id'])
+    assert db.get_answer_key(exam['exam_id']) is key
+
+    # Relabelling without changing the correct position still changes grading
+    db.save_question(exam['exam_id'], 'Question 0', {'A': 'a', 'X': 'x'}, 'A',
+                     question_id=exam['questions'][0])
+    relabelled = db.get_answer_key(exam['exam_id'])
+
+    assert relabelled is not key
+    assert relabelled.version > key.version
+    assert relabelled.positions[0] == {'A': 0, 'X': 1}
+
+
+def test_cache_drops_least_recently_used_exams(db, exam, execute):
+    execute("INSERT INTO exams (title, module_no, num_items, time_limit, batch_id) VALUES ('Two', 'M2', 1, 10, ?)",
+            (exam['batch_id'],))
+    cache = AnswerKeyCache(max_exams=1)
+    with db.connection() as cursor:
+        first = cache.get(cursor, exam['exam_id'])
+        cache.get(cursor, exam['exam_id'] + 1)
+        assert cache.get(cursor, exam['exam_id']) is not first
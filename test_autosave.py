@@ -0,0 +1,103 @@
+"""Tests for the debounced answer autosaver"""
+from autosave import AnswerAutosaver
+
+
+class FakeWidget:
+    """Stands in for the exam window's event loop; run() fires due callbacks"""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, delay, callback):
+        self._next_id += 1
+        self.pending[self._next_id] = callback
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run(self):
+        pending, self.pending = self.pending, {}
+        for callback in pending.values():
+            callback()
+
+
+class RecordingDatabase:
+    def __init__(self, fail=False):
+        self.saves = []
+        self.fail = fail
+
+    def save_attempt_draft(self, trainee_id, exam_id, answers, elapsed_seconds):
+        if self.fail:
+            raise RuntimeError("database is locked")
+        self.saves.append((trainee_id, exam_id, dict(answers), elapsed_seconds))
+
+
+def _autosaver(db, widget, answers=None):
+    return AnswerAutosaver(widget, db, 7, 3, elapsed=lambda: 42.9, interval=5.0, answers=answers)
+
+
+def test_burst_of_changes_is_written_once():
+    widget, db = FakeWidget(), RecordingDatabase()
+    autosaver = _autosaver(db, widget)
+
+    autosaver.record(1, 'A')
+    autosaver.record(2, 'C')
+    autosaver.record(1, 'B')
+    assert len(widget.pending) == 1 and db.saves == []
+
+    widget.run()
+    assert db.saves == [(7, 3, {1: 'B', 2: 'C'}, 42)]
+
+
+def test_resumed_answers_are_kept_and_unchanged_answers_are_not_written():
+    widget, db = FakeWidget(), RecordingDatabase()
+    autosaver = _autosaver(db, widget, answers={1: 'A', 2: 'B'})
+
+    autosaver.record(1, 'A')
+    assert widget.pending == {} and autosaver.flush() and db.saves == []
+
+    autosaver.record(2, None)
+    autosaver.flush()
+    assert db.saves == [(7, 3, {1: 'A'}, 42)]
+
+
+def test_failed_write_is_retried():
+    widget, db = FakeWidget(), RecordingDatabase(fail=True)
+    autosaver = _autosaver(db, widget)
+    autosaver.record(1, 'A')
+
+    assert autosaver.flush() is False
+    assert len(widget.pending) == 1
+
+    db.fail = False
+    widget.run()
+    assert db.saves == [(7, 3, {1: 'A'}, 42)]
+
+
+def test_stop_drops_the_pending_write():
+    widget, db = FakeWidget(), RecordingDatabase()
+    autosaver = _autosaver(db, widget)
+    autosaver.record(1, 'A')
+
+    autosaver.stop()
+
+    assert widget.pending == {}
+    assert autosaver.flush() and db.saves == []
+
+
+def test_drafts_round_trip_through_the_database(db, exam):
+    widget = FakeWidget()
+    question_id = exam['questions'][0]
+    autosaver = AnswerAutosaver(widget, db, exam['trainees'][0], exam['exam_id'], elapsed=lambda: 12)
+    autosaver.record(question_id, 'C')
+    widget.run()
+
+    draft = db.get_attempt_draft(exam['trainees'][0], exam['exam_id'])
+    resumed = AnswerAutosaver(widget, db, exam['trainees'][0], exam['exam_id'], elapsed=lambda: 20,
+                              answers=draft.answers)
+    resumed.record(question_id, 'C')
+
+    assert (draft.answers, draft.elapsed_seconds) == ({question_id: 'C'}, 12)
+    assert widget.pending == {}
@@ -0,0 +1,284 @@
+"""Tests for DatabaseManager's paging, rollups and deadlines"""
+import pytest
+
+
+def _answers(questions, labels):
+    return dict(zip(questions, labels))
+
+
+TRAINER_EMAILS = [None, 'c@x', None, 'a@x', 'b@x', None, 'a2@x', 'd@x', None, 'b2@x', 'e@x']
+TRAINER_NAMES = ['Cruz', 'Abad', 'Cruz', 'Bato', 'Abad', 'Diaz', 'Cruz', 'Abad', 'Bato', 'Diaz', 'Abad']
+
+
+@pytest.fixture
+def trainers(db):
+    """Trainers whose contact emails include NULLs and whose names repeat"""
+    return [
+        db.insert_record('trainers', {'name': name, 'contact_email': email, 'hire_date': '2024-01-01'})
+        for name, email in zip(TRAINER_NAMES, TRAINER_EMAILS)
+    ]
+
+
+def _all_pages(db, sort_column, descending, limit):
+    records, after, pages = [], None, 0
+    while True:
+        page, after = db.get_records_page('trainers', after, limit, sort_column, descending)
+        assert len(page) <= limit
+        records += page
+        pages += 1
+        if after is None:
+            return records, pages
+
+
+@pytest.mark.parametrize('sort_column', ['id', 'contact_email', 'name'])
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('limit', [1, 2, 3, 4, 11, 50])
+def test_keyset_pages_cover_every_row_once_in_order(db, trainers, sort_column, descending, limit):
+    records, pages = _all_pages(db, sort_column, descending, limit)
+
+    # SQLite sorts NULLs first ascending and last descending; ids break ties
+    expected = sorted(
+        (record for record in db.get_all_records('trainers')),
+        key=lambda record: (getattr(record, sort_column) is not None, getattr(record, sort_column) or '', record.id),
+        reverse=descending
+    )
+    assert [record.id for record in records] == [record.id for record in expected]
+    assert pages == max(1, -(-len(trainers) // limit))
+
+
+def test_page_cursor_after_a_null_sort_key(db, trainers):
+    page, after = db.get_records_page('trainers', None, 2, 'contact_email')
+    assert [record.contact_email for record in page] == [None, None]
+    assert after == (None, page[-1].id)
+
+    page, after = db.get_records_page('trainers', after, 3, 'contact_email')
+    assert [record.contact_email for record in page] == [None, None, 'a2@x']
+
+    page, after = db.get_records_page('trainers', None, 8, 'contact_email', descending=True)
+    assert [record.contact_email for record in page[-2:]] == ['a2@x', None]
+    page, after = db.get_records_page('trainers', after, 8, 'contact_email', descending=True)
+    assert [record.contact_email for record in page] == [None, None, None]
+    assert after is None
+
+
+def test_records_page_rejects_unknown_tables_and_columns(db):
+    with pytest.raises(ValueError):
+        db.get_records_page('sqlite_master')
+    with pytest.raises(ValueError):
+        db.get_records_page('trainers', sort_column='name; DROP TABLE trainers')
+
+
+def test_insert_trainee_and_result_write_existing_columns(db, rows, exam):
+    trainee_id = db.insert_trainee('New Trainee', 'ID-9', 'ULI-9', 2024, exam['batch_id'], 'Active')
+    result_id = db.insert_result(trainee_id, exam['exam_id'], 2, 3, 90, '2024-06-01')
+
+    assert rows("SELECT name, batch_id, status FROM trainees WHERE id = ?", (trainee_id,)) == [
+        ('New Trainee', exam['batch_id'], 'Active')
+    ]
+    assert rows("SELECT score, total_items, time_spent, status FROM results WHERE id = ?",
+                (result_id,)) == [(2, 3, 90, 'Failed')]
+
+
+def _matches_rebuild(db, rows, sql):
+    """Whether a trigger-maintained table holds what a full rebuild would"""
+    maintained = rows(sql)
+    db.rebuild_statistics()
+    return maintained == rows(sql)
+
+
+def test_exam_stats_follow_results(db, rows, exam):
+    questions = exam['questions']
+    first = db.submit_exam_result(exam['trainees'][0], exam['exam_id'], _answers(questions, 'ABC'), 600)
+    db.submit_exam_result(exam['trainees'][1], exam['exam_id'], _answers(questions, 'ABD'), 900)
+    db.submit_exam_result(exam['trainees'][1], exam['exam_id'], _answers(questions, 'DDD'), 300)
+    stats = """
+        SELECT attempts, trainees_attempted, trainees_passed, scored,
+               percentage_sum, min_percentage, max_percentage, time_spent_sum
+        FROM exam_stats WHERE exam_id = ?
+    """
+
+    assert rows(stats, (exam['exam_id'],)) == [(3, 2, 1, 3, pytest.approx(100 + 200 / 3), 0, 100, 1800)]
+
+    # Removing the best result moves the maximum to the next one
+    db.delete_record('results', first['result_id'])
+    assert rows(stats, (exam['exam_id'],)) == [
+        (2, 1, 0, 2, pytest.approx(200 / 3), 0, pytest.approx(200 / 3), 1200)
+    ]
+    db.update_record('results', first['result_id'] + 2, {'percentage': 80, 'status': 'Passed'})
+    assert rows(stats, (exam['exam_id'],))[0][:3] == (2, 1, 1)
+    assert _matches_rebuild(db, rows, "SELECT * FROM exam_stats ORDER BY exam_id")
+
+
+def test_batch_stats_follow_trainees(db, rows, exam):
+    other_batch = db.insert_record('batches', {
+        'batch_year': '2025', 'num_trainees': 1, 'training_duration': '1 month'
+    })
+    db.update_record('trainees', exam['trainees'][0], {'status': 'Completed'})
+    db.update_record('trainees', exam['trainees'][1], {'status': 'Inactive'})
+    db.update_record('trainees', exam['trainees'][2], {'batch_id': other_batch})
+    stats = """
+        SELECT batch_id, trainees, active_trainees, inactive_trainees, completed_trainees
+        FROM batch_stats ORDER BY batch_id
+    """
+
+    assert rows(stats) == [(exam['batch_id'], 2, 0, 1, 1), (other_batch, 1, 1, 0, 0)]
+
+    db.delete_record('trainees', exam['trainees'][1])
+    assert rows(stats) == [(exam['batch_id'], 1, 0, 0, 1), (other_batch, 1, 1, 0, 0)]
+    assert _matches_rebuild(db, rows, stats)
+
+
+PROGRESS = """
+    SELECT attempts, ROUND(best_percentage, 2), passed, last_result_id, last_status
+    FROM trainee_exam_progress
+    WHERE trainee_id = ? AND exam_id = ?
+"""
+
+
+def test_progress_tracks_attempts_best_and_latest(db, rows, exam):
+    trainee_id, exam_id = exam['trainees'][0], exam['exam_id']
+    questions = exam['questions']
+    assert rows(PROGRESS, (trainee_id, exam_id)) == []
+
+    passed = db.submit_exam_result(trainee_id, exam_id, _answers(questions, 'ABC'), 60)
+    failed = db.submit_exam_result(trainee_id, exam_id, _answers(questions, 'ABD'), 60)
+    assert rows(PROGRESS, (trainee_id, exam_id)) == [(2, 100.0, 1, failed['result_id'], 'Failed')]
+
+    # Deleting the latest attempt falls back to the one before it
+    db.delete_record('results', failed['result_id'])
+    assert rows(PROGRESS, (trainee_id, exam_id)) == [(1, 100.0, 1, passed['result_id'], 'Passed')]
+
+    db.update_record('results', passed['result_id'], {'percentage': 50, 'status': 'Failed'})
+    assert rows(PROGRESS, (trainee_id, exam_id)) == [(1, 50.0, 0, passed['result_id'], 'Failed')]
+
+    db.delete_record('results', passed['result_id'])
+    assert rows(PROGRESS, (trainee_id, exam_id)) == []
+
+
+def test_progress_follows_a_result_moved_to_another_trainee(db, rows, exam):
+    first, second = exam['trainees'][:2]
+    result = db.submit_exam_result(first, exam['exam_id'], _answers(exam['questions'], 'ABC'), 60)
+
+    db.update_record('results', result['result_id'], {'trainee_id': second})
+
+    assert rows(PROGRESS, (first, exam['exam_id'])) == []
+    assert rows(PROGRESS, (second, exam['exam_id'])) == [(1, 100.0, 1, result['result_id'], 'Passed')]
+    assert _matches_rebuild(db, rows, "SELECT * FROM trainee_exam_progress ORDER BY trainee_id, exam_id")
+
+
+def test_trainee_status_reads_progress(db, exam):
+    trainee_id = exam['trainees'][0]
+    db.submit_exam_result(trainee_id, exam['exam_id'], _answers(exam['questions'], 'ABD'), 60)
+    assert db.update_trainee_status(trainee_id)['passed_exams'] == 0
+
+    db.submit_exam_result(trainee_id, exam['exam_id'], _answers(exam['questions'], 'ABC'), 60)
+    status = db.update_trainee_status(trainee_id)
+    assert (status['status'], status['completed_exams'], status['passed_exams']) == ('Completed', 1, 1)
+
+
+def test_exams_taken_counts_distinct_exams_on_every_path(db, rows, exam):
+    second_exam = db.insert_exam('Module 2', 'M2', 1, 10, exam['batch_id'])
+    question_id = db.save_question(second_exam, 'Only question', {'A': 'a', 'B': 'b'}, 'A')
+    trainee_id = exam['trainees'][0]
+    exams_taken = "SELECT exams_taken FROM trainees WHERE id = ?"
+
+    db.submit_exam_result(trainee_id, exam['exam_id'], _answers(exam['questions'], 'DDD'), 60)
+    db.submit_exam_result(trainee_id, exam['exam_id'], _answers(exam['questions'], 'ABD'), 60)
+    assert rows(exams_taken, (trainee_id,)) == [(1,)]
+
+    db.finalize_attempt(trainee_id, second_exam, {question_id: 'B'}, 60)
+    assert rows(exams_taken, (trainee_id,)) == [(2,)]
+
+    db.save_question(second_exam, 'Only question', {'A': 'a', 'B': 'b'}, 'B', question_id=question_id)
+    db.rescore_exam(second_exam)
+    assert rows(exams_taken, (trainee_id,)) == [(2,)]
+
+
+def test_draft_save_and_restore(db, exam):
+    trainee_id, exam_id = exam['trainees'][0], exam['exam_id']
+    questions = exam['questions']
+    assert db.get_attempt_draft(trainee_id, exam_id) is None
+
+    db.save_attempt_draft(trainee_id, exam_id, {questions[0]: 'B'}, 30)
+    db.save_attempt_draft(trainee_id, exam_id, {questions[0]: 'A', questions[2]: 'D'}, 95)
+    draft = db.get_attempt_draft(trainee_id, exam_id)
+
+    # Each save replaces the whole answer set; question ids come back as ints
+    assert draft.answers == {questions[0]: 'A', questions[2]: 'D'}
+    assert draft.elapsed_seconds == 95
+    assert db.get_attempt_draft(exam['trainees'][1], exam_id) is None
+
+
+def test_resumed_attempt_keeps_its_deadline(db, exam):
+    trainee_id, exam_id = exam['trainees'][0], exam['exam_id']
+
+    started = db.start_attempt(trainee_id, exam_id)
+    db.save_attempt_draft(trainee_id, exam_id, {exam['questions'][0]: 'A'}, 60)
+    resumed = db.start_attempt(trainee_id, exam_id)
+
+    assert started.expires_at == resumed.expires_at
+    assert 0 < resumed.seconds_left <= exam['time_limit'] * 60
+    assert resumed.answers == {exam['questions'][0]: 'A'}
+
+
+def test_draft_saved_without_a_deadline_gets_one_from_its_elapsed_time(db, exam):
+    trainee_id, exam_id = exam['trainees'][0], exam['exam_id']
+    db.save_attempt_draft(trainee_id, exam_id, {}, 600)
+
+    draft = db.start_attempt(trainee_id, exam_id)
+
+    assert draft.seconds_left == pytest.approx(exam['time_limit'] * 60 - 600, abs=5)
+
+
+def test_draft_is_frozen_after_the_deadline(db, execute, exam):
+    trainee_id, exam_id = exam['trainees'][0], exam['exam_id']
+    db.start_attempt(trainee_id, exam_id)
+    db.save_attempt_draft(trainee_id, exam_id, {exam['questions'][0]: 'A'}, 60)
+    execute("UPDATE attempt_drafts SET expires_at = datetime('now', '-1 hour')")
+
+    db.save_attempt_draft(trainee_id, exam_id, {exam['questions'][0]: 'D'}, 4000)
+
+    assert db.get_attempt_draft(trainee_id, exam_id).answers == {exam['questions'][0]: 'A'}
+
+
+def test_expired_attempt_records_autosaved_answers(db, rows, execute, exam):
+    trainee_id = exam['trainees'][0]
+    questions = exam['questions']
+    db.start_attempt(trainee_id, exam['exam_id'])
+    db.save_attempt_draft(trainee_id, exam['exam_id'], _answers(questions, 'ABC'), 120)
+    execute("UPDATE attempt_drafts SET expires_at = datetime('now', '-1 hour')")
+
+    result = db.submit_exam_result(trainee_id, exam['exam_id'], _answers(questions, 'DDD'), 60)
+
+    assert result['expired']
+    assert result['percentage'] == 100
+    assert rows("SELECT time_spent FROM results") == [(exam['time_limit'] * 60,)]
+    assert db.get_attempt_draft(trainee_id, exam['exam_id']) is None
+
+
+def test_time_spent_is_capped_without_an_attempt(db, rows, exam):
+    result = db.submit_exam_result(exam['trainees'][0], exam['exam_id'],
+                                   _answers(exam['questions'], 'ABC'), 10 ** 6)
+
+    assert not result['expired']
+    assert rows("SELECT time_spent FROM results") == [(exam['time_limit'] * 60,)]
+
+
+def test_submission_within_the_grace_period_is_accepted(db, rows, execute, exam):
+    trainee_id = exam['trainees'][0]
+    db.start_attempt(trainee_id, exam['exam_id'])
+    db.save_attempt_draft(trainee_id, exam['exam_id'], {}, 60)
+    # Past the deadline but inside the default 30 second grace
+    execute("UPDATE attempt_drafts SET expires_at = datetime('now', '-10 seconds')")
+
+    result = db.submit_exam_result(trainee_id, exam['exam_id'], _answers(exam['questions'], 'ABC'), 1790)
+
+    assert not result['expired']
+    assert result['percentage'] == 100
+    assert rows("SELECT time_spent FROM results") == [(1790,)]
+
+
+def test_negative_time_spent_is_recorded_as_zero(db, rows, exam):
+    db.submit_exam_result(exam['trainees'][0], exam['exam_id'], _answers(exam['questions'], 'ABC'), -5)
+
+    assert rows("SELECT time_spent FROM results") == [(0,)]
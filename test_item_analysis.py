@@ -0,0 +1,95 @@
+"""Tests for classical item analysis"""
+import math
+
+import numpy as np
+import pytest
+
+from answer_keys import NO_ANSWER
+from item_analysis import NOT_PRESENTED, analyze_matrix, response_matrix
+
+# Four attempts at three items keyed at positions 0, 1 and 0. Item 1 has a
+# fifth option and item 2 skips a letter, so its position 1 is labelled C.
+QUESTION_IDS = [11, 12, 13]
+CORRECT = [0, 1, 0]
+LABELS = [('A', 'B', 'C', 'D', 'E'), ('A', 'C', 'D'), ('A', 'B', 'C', 'D')]
+MATRIX = [
+    [0, 1, 0],          # right, right, right: total 3
+    [0, 1, 1],          # right, right, wrong: total 2
+    [1, 1, NO_ANSWER],  # wrong, right, omitted: total 1
+    [4, 0, 1],          # wrong, wrong, wrong: total 0
+]
+
+
+def _analyze(matrix):
+    return analyze_matrix(np.array(matrix, dtype=np.int8), QUESTION_IDS, CORRECT, LABELS)
+
+
+def test_statistics_match_hand_computed_values():
+    analysis = _analyze(MATRIX)
+
+    # Totals 3, 2, 1, 0: mean 1.5, population variance 1.25
+    assert analysis.attempts == 4
+    assert analysis.mean_score == pytest.approx(1.5)
+    assert analysis.score_sd == pytest.approx(math.sqrt(1.25))
+    # KR-20 = 3/2 * (1 - (.25 + .1875 + .1875) / 1.25)
+    assert analysis.kr20 == pytest.approx(0.75)
+
+    first, second, third = analysis.items
+    assert [item.difficulty for item in analysis.items] == pytest.approx([0.5, 0.75, 0.25])
+    # Point-biserial against the rest score (total minus the item):
+    # item 1 rest scores 2, 1, 1, 0; items 2 and 3 share cov / var ratio 3/11
+    assert first.discrimination == pytest.approx(1 / math.sqrt(2))
+    assert second.discrimination == pytest.approx(math.sqrt(3 / 11))
+    assert third.discrimination == pytest.approx(math.sqrt(3 / 11))
+
+
+def test_option_counts_follow_each_questions_labels():
+    first, second, third = _analyze(MATRIX).items
+
+    assert (first.option_labels, first.option_counts) == (LABELS[0], (2, 1, 0, 0, 1))
+    assert (second.option_labels, second.option_counts) == (LABELS[1], (1, 3, 0))
+    assert (third.option_counts, third.omitted) == ((1, 2, 0, 0), 1)
+    assert [item.correct_label for item in (first, second, third)] == ['A', 'C', 'A']
+
+
+def test_attempts_missing_an_item_are_left_out_of_its_statistics():
+    analysis = _analyze(MATRIX + [[0, NOT_PRESENTED, 0]])
+    baseline = _analyze(MATRIX)
+
+    assert analysis.attempts == 5
+    assert analysis.items[1] == baseline.items[1]
+    assert analysis.items[0].responses == 5
+    # Test statistics only count attempts that saw every item
+    assert (analysis.mean_score, analysis.kr20) == (baseline.mean_score, baseline.kr20)
+
+
+def test_items_everyone_gets_right_have_no_discrimination():
+    analysis = analyze_matrix(np.array([[0, 0], [0, 1]], dtype=np.int8), [1, 2], [0, 0],
+                              [('A', 'B'), ('A', 'B')])
+
+    assert analysis.items[0].difficulty == 1.0
+    assert analysis.items[0].discrimination is None
+
+
+def test_response_matrix_drops_unknown_questions_and_marks_unseen_ones():
+    row_ids, matrix = response_matrix(
+        [(7, 11, 2), (5, 12, NO_ANSWER), (7, 99, 1), (5, 11, 0)], [11, 12]
+    )
+
+    assert row_ids.tolist() == [5, 7]
+    assert matrix.tolist() == [[0, NO_ANSWER], [2, NOT_PRESENTED]]
+
+
+def test_exam_analysis_counts_every_stored_option(db, exam):
+    question_id = db.save_question(exam['exam_id'], 'Five options',
+                                   {'A': 'a', 'B': 'b', 'C': 'c', 'D': 'd', 'E': 'e'}, 'E')
+    answers = dict(zip(exam['questions'], 'ABC'))
+    for trainee_id, choice in zip(exam['trainees'], 'EEA'):
+        db.submit_exam_result(trainee_id, exam['exam_id'], {**answers, question_id: choice}, 60)
+
+    item = db.get_item_analysis(exam['exam_id']).items[-1]
+
+    assert item.question_id == question_id
+    assert item.option_counts == (1, 0, 0, 0, 2)
+    assert item.correct_label == 'E'
+    assert item.difficulty == pytest.approx(2 / 3)
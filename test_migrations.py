@@ -0,0 +1,58 @@
+"""Tests for the versioned schema migrations"""
+import shutil
+import sqlite3
+
+import pytest
+
+import migrations
+from database_manager import DatabaseManager
+from migrations import LATEST_VERSION, apply_migrations, get_schema_version
+
+LEGACY_DATABASE = 'exam_management.db'
+
+
+def test_legacy_database_migrates_to_latest_schema(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    shutil.copyfile(LEGACY_DATABASE, path)
+    conn = sqlite3.connect(path)
+    trainees = conn.execute("SELECT id, name FROM trainees ORDER BY id").fetchall()
+    conn.close()
+
+    DatabaseManager(path).close_all()
+
+    conn = sqlite3.connect(path)
+    try:
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert conn.execute("SELECT id, name FROM trainees ORDER BY id").fetchall() == trainees
+        tables = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {'question_options', 'responses', 'exam_stats', 'batch_stats',
+                'trainee_exam_progress', 'attempt_drafts'} <= tables
+    finally:
+        conn.close()
+
+
+def test_up_to_date_database_is_left_alone(db, db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        schema = conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall()
+        assert apply_migrations(conn) == LATEST_VERSION
+        assert conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall() == schema
+    finally:
+        conn.close()
+
+
+def test_failed_migration_rolls_back_and_keeps_version(db_path, monkeypatch):
+    def broken(cursor):
+        cursor.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("boom")
+
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS + [(LATEST_VERSION + 1, "Broken", broken)])
+    monkeypatch.setattr(migrations, 'LATEST_VERSION', LATEST_VERSION + 1)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            apply_migrations(conn)
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+    finally:
+        conn.close()
@@ -0,0 +1,71 @@
+"""Tests for vectorized re-scoring"""
+from answer_keys import NO_ANSWER, AnswerKey
+from rescoring import regrade
+
+
+def test_regrade_against_hand_computed_scores():
+    # Question 10 (1 point) is now keyed B, question 20 (3 points) is keyed
+    # A, and question 30 was removed from the exam
+    key = AnswerKey(1, 2, [(10, 1, 1), (20, 0, 3)], {10: ['A', 'B'], 20: ['A', 'B']})
+    results = [
+        (1, 100, 4, 4, 100.0, 'Passed'),  # answered A, A: loses question 10
+        (2, 200, 0, 4, 0.0, 'Failed'),    # answered B, A: gains question 10
+        (3, 300, 1, 4, 25.0, 'Failed'),   # nothing stored to regrade
+    ]
+    responses = [
+        (1, 10, 0, 1, 1), (1, 20, 0, 1, 3),
+        (2, 10, 1, 0, 0), (2, 20, 0, 0, 0), (2, 30, 1, 1, 1),
+    ]
+
+    response_updates, result_updates, report = regrade(key, responses, results)
+
+    assert sorted(response_updates, key=lambda row: row[2:]) == [
+        (0, 0, 1, 10), (1, 1, 2, 10), (1, 3, 2, 20), (0, 0, 2, 30)
+    ]
+    assert result_updates == [(3, 4, 75.0, 'Passed', 1), (4, 4, 100.0, 'Passed', 2)]
+    assert report['results_checked'] == 2
+    assert report['results_changed'] == 2
+    assert report['responses_changed'] == 4
+    assert (report['now_passed'], report['now_failed']) == (1, 0)
+    assert report['results_without_responses'] == 1
+    assert [change['trainee_id'] for change in report['changes']] == [100, 200]
+
+
+def test_regrade_leaves_unanswered_questions_wrong():
+    key = AnswerKey(1, 1, [(10, 0, 1)], {10: ['A', 'B']})
+
+    response_updates, result_updates, report = regrade(
+        key, [(1, 10, NO_ANSWER, 0, 0)], [(1, 100, 0, 1, 0.0, 'Failed')]
+    )
+
+    assert (response_updates, result_updates) == ([], [])
+    assert report['results_changed'] == 0
+
+
+def test_rescore_updates_trainee_status(db, rows, exam):
+    trainee_id = exam['trainees'][0]
+    questions = exam['questions']
+    assert db.finalize_attempt(trainee_id, exam['exam_id'], dict(zip(questions, 'ABD')), 600)['percentage'] < 75
+    assert rows("SELECT status FROM trainees WHERE id = ?", (trainee_id,)) == [('Active',)]
+
+    db.save_question(exam['exam_id'], 'Question 2', {'A': 'a', 'B': 'b', 'C': 'c', 'D': 'd'}, 'D',
+                     question_id=questions[2])
+    report = db.rescore_exam(exam['exam_id'], dry_run=True)
+    assert report['changes']
+    assert rows("SELECT status FROM results") == [('Failed',)]
+    assert rows("SELECT status FROM trainees WHERE id = ?", (trainee_id,)) == [('Active',)]
+
+    db.rescore_exam(exam['exam_id'])
+    assert rows("SELECT status FROM results") == [('Passed',)]
+    assert rows("SELECT is_correct FROM responses ORDER BY question_id") == [(1,), (1,), (1,)]
+    assert rows("SELECT status FROM trainees WHERE id = ?", (trainee_id,)) == [('Completed',)]
+
+
+def test_rescore_against_an_unchanged_key_changes_nothing(db, rows, exam):
+    db.finalize_attempt(exam['trainees'][0], exam['exam_id'], dict(zip(exam['questions'], 'ABD')), 600)
+    before = rows("SELECT * FROM results")
+
+    report = db.rescore_exam(exam['exam_id'])
+
+    assert (report['results_changed'], report['responses_changed'], report['changes']) == (0, 0, [])
+    assert rows("SELECT * FROM results") == before
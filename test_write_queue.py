@@ -0,0 +1,70 @@
+"""Tests for the group-commit write queue"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from write_queue import GroupCommitQueue
+
+
+def _insert_trainer(cursor, name):
+    cursor.execute("INSERT INTO trainers (name, hire_date) VALUES (?, '2024-01-01')", (name,))
+    return cursor.lastrowid
+
+
+def _insert_then_fail(cursor, name):
+    _insert_trainer(cursor, name)
+    raise ValueError(f"rejected {name}")
+
+
+@pytest.fixture
+def write_queue(db):
+    # A long delay keeps everything submitted by one test in the same group
+    write_queue = GroupCommitQueue(db, max_batch=64, max_delay=0.2)
+    yield write_queue
+    write_queue.stop()
+
+
+def test_concurrent_submissions_are_all_committed(db, rows, exam):
+    db.enable_write_queue(max_batch=8, max_delay=0.05)
+    answers = dict(zip(exam['questions'], 'ABC'))
+
+    def submit(n):
+        trainee_id = exam['trainees'][n % len(exam['trainees'])]
+        return db.submit_exam_result_async(trainee_id, exam['exam_id'], answers, 60)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = list(pool.map(submit, range(24)))
+    results = [future.result(timeout=10) for future in futures]
+    db.disable_write_queue()
+
+    assert len({result['result_id'] for result in results}) == 24
+    assert all(result['percentage'] == 100 for result in results)
+    assert rows("SELECT COUNT(*) FROM results") == [(24,)]
+    assert rows("SELECT COUNT(*) FROM responses") == [(24 * 3,)]
+
+
+def test_failing_write_rolls_back_only_its_own_work(write_queue, rows):
+    kept = write_queue.submit(_insert_trainer, 'kept 1')
+    rejected = write_queue.submit(_insert_then_fail, 'rejected')
+    also_kept = write_queue.submit(_insert_trainer, 'kept 2')
+
+    assert kept.result(timeout=10) and also_kept.result(timeout=10)
+    with pytest.raises(ValueError):
+        rejected.result(timeout=10)
+    assert rows("SELECT name FROM trainers ORDER BY id") == [('kept 1',), ('kept 2',)]
+
+
+def test_writer_survives_a_failed_write(write_queue, rows):
+    with pytest.raises(ValueError):
+        write_queue.submit(_insert_then_fail, 'rejected').result(timeout=10)
+
+    assert write_queue.submit(_insert_trainer, 'later').result(timeout=10)
+    assert rows("SELECT name FROM trainers") == [('later',)]
+
+
+def test_stopped_queue_fails_new_writes(write_queue, rows):
+    write_queue.stop()
+
+    with pytest.raises(RuntimeError):
+        write_queue.submit(_insert_trainer, 'too late').result(timeout=10)
+    assert rows("SELECT COUNT(*) FROM trainers") == [(0,)]
@@ -4,15 +4,25 @@ from tkinter import ttk, messagebox
 from datetime import datetime
 from config import THEME, BUTTON_COLORS
 from exam_manager import ExamManager
-from components import LoadingIndicator
+from exam_prefetch import ExamPrefetcher
+from components import BackgroundTaskRunner, LoadingIndicator
 
 class TraineeDashboard:
-    def __init__(self, master, db_manager, trainee_id, logout_callback):
+    def __init__(self, master, db_manager, trainee_id, logout_callback, async_bridge):
+        """
+        Args:
+            async_bridge: TkAsyncBridge every view and exam is loaded
+                through; nothing is read on the Tk thread
+        """
         self.master = master
         self.db_manager = db_manager
         self.trainee_id = trainee_id
         self.logout_callback = logout_callback
+        self.task_runner = BackgroundTaskRunner(async_bridge)
         self.exam_manager = ExamManager(db_manager)
+        self.prefetcher = ExamPrefetcher(self.task_runner, self.exam_manager, trainee_id)
+        self._view_token = 0
+        self._exam_load = None  # BackgroundTask of the exam being opened
         
         # Create main container
         self.main_container = ctk.CTkFrame(master, fg_color="#f5f5f5")
@@ -109,17 +119,28 @@ class TraineeDashboard:
 
     def clear_content(self):
         """Clear current content"""
+        # Invalidate results still loading for the previous view
+        self._view_token += 1
         for widget in self.content_frame.winfo_children():
             widget.destroy()
 
+    def _load_view(self, load, render, what):
+        """Load a view's data off the Tk thread; render it if still on that view"""
+        token = self._view_token
+        self.task_runner.run(
+            lambda task: load(self.trainee_id),
+            on_done=lambda data: token == self._view_token and render(data),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load {what}: {str(e)}")
+        )
+
     def show_overview(self):
         """Show trainee overview with progress summary"""
         self.clear_content()
-        
+        self._load_view(self.db_manager.get_trainee_progress, self._render_overview, "overview")
+
+    def _render_overview(self, progress):
+        """Render the overview for loaded trainee progress"""
         try:
-            # Get trainee progress
-            progress = self.db_manager.get_trainee_progress(self.trainee_id)
-            
             # Create overview container
             overview = ctk.CTkFrame(
                 self.content_frame,
@@ -238,11 +259,11 @@ class TraineeDashboard:
     def show_available_exams(self):
         """Show available exams for the trainee"""
         self.clear_content()
-        
+        self._load_view(self.db_manager.get_available_exams, self._render_available_exams, "exams")
+
+    def _render_available_exams(self, exams):
+        """Render the exam cards for loaded available exams"""
         try:
-            # Get available exams
-            exams = self.db_manager.get_available_exams(self.trainee_id)
-            
             # Create container
             container = ctk.CTkFrame(
                 self.content_frame,
@@ -261,6 +282,11 @@ class TraineeDashboard:
             # Create exam cards
             for exam in exams:
                 self._create_exam_card(container, exam)
+
+            # Load the untaken exams while the trainee reads the list
+            self.prefetcher.prefetch(
+                [exam.id for exam in exams if exam.status == 'Not Taken']
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load exams: {str(e)}")
@@ -279,14 +305,14 @@ class TraineeDashboard:
         # Title and module
         ctk.CTkLabel(
             card,
-            text=exam['title'],
+            text=exam.title,
             font=THEME["fonts"]["subheading"],
             text_color=THEME["colors"]["text"]
         ).pack(anchor="w", padx=15, pady=(10, 5))
         
         ctk.CTkLabel(
             card,
-            text=f"Module {exam['module_no']} • {exam['num_items']} Items • {exam['time_limit']} Minutes",
+            text=f"Module {exam.module_no} • {exam.num_items} Items • {exam.time_limit} Minutes",
             font=THEME["fonts"]["body"],
             text_color=THEME["colors"]["text_secondary"]
         ).pack(anchor="w", padx=15, pady=(0, 10))
@@ -297,42 +323,75 @@ class TraineeDashboard:
         
         status_label = ctk.CTkLabel(
             button_frame,
-            text=f"Status: {exam['status']}",
+            text=f"Status: {exam.status}",
             font=THEME["fonts"]["body"],
             text_color=THEME["colors"]["text_secondary"]
         )
         status_label.pack(side="left")
         
-        if exam['status'] == 'Not Taken':
+        if exam.status == 'Not Taken':
             take_btn = ctk.CTkButton(
                 button_frame,
                 text="Take Exam",
                 font=THEME["fonts"]["body"],
-                command=lambda: self.start_exam(exam['id'])
+                command=lambda: self.start_exam(exam.id)
             )
             take_btn.pack(side="right")
 
     def start_exam(self, exam_id):
         """Start an exam session"""
-        if self.exam_manager.start_exam(exam_id, self.trainee_id):
-            exam_window = self.exam_manager.create_exam_window(
-                self.master,
-                self.trainee_id,
-                self.on_exam_complete
+        # A second click while an exam loads would open a second window
+        if self._exam_load is not None:
+            return
+
+        # Open prefetched content from memory, only starting the attempt;
+        # otherwise load the exam concurrently off the Tk thread
+        content = self.prefetcher.take(exam_id)
+        if content:
+            loading = self.exam_manager.start_attempt_async(
+                self.task_runner.db, content, exam_id, self.trainee_id
+            )
+        else:
+            loading = self.exam_manager.load_exam_async(
+                self.task_runner.db, exam_id, self.trainee_id
             )
+        self._exam_load = self.task_runner.run(
+            loading,
+            on_done=lambda loaded: self._open_exam(*loaded),
+            on_error=self._exam_load_failed
+        )
+
+    def _exam_load_failed(self, error):
+        self._exam_load = None
+        messagebox.showerror("Error", f"Failed to load exam: {str(error)}")
+
+    def _open_exam(self, validation, exam_details, questions, draft=None):
+        """Open the exam window for exam data loaded in the background"""
+        self._exam_load = None
+        if self.exam_manager.begin_exam(validation, exam_details, questions, draft=draft):
+            self._create_exam_window()
+
+    def _create_exam_window(self):
+        self.exam_manager.create_exam_window(
+            self.master,
+            self.trainee_id,
+            self.on_exam_complete
+        )
 
     def on_exam_complete(self, result=None):
         """Handle exam completion"""
+        # A new result changes which exams may be taken
+        self.prefetcher.invalidate()
         self.show_overview()  # Refresh overview
 
     def show_results(self):
         """Show exam results with export options"""
         self.clear_content()
-        
+        self._load_view(self.db_manager.get_trainee_exam_history, self._render_results, "results")
+
+    def _render_results(self, history):
+        """Render the exam results view for loaded exam history"""
         try:
-            # Get exam history
-            history = self.db_manager.get_trainee_exam_history(self.trainee_id)
-            
             # Create container
             container = ctk.CTkFrame(
                 self.content_frame,
@@ -421,56 +480,46 @@ class TraineeDashboard:
             messagebox.showerror("Error", f"Failed to load results: {str(e)}")
 
     def _export_results(self, format):
-        """Handle exporting results with loading indicator"""
-        try:
-            # Create and show loading indicator
-            loading = LoadingIndicator(self.content_frame, "Preparing export...")
-            loading.show()
-            
-            # Update UI and process in chunks
-            def process_export():
-                try:
-                    # Get export data
-                    export_data = self.db_manager.export_trainee_results(self.trainee_id, format)
-                    
-                    # Ask user where to save the file
-                    from tkinter import filedialog
-                    file_types = [('CSV files', '*.csv')] if format == 'csv' else [('JSON files', '*.json')]
-                    filename = filedialog.asksaveasfilename(
-                        defaultextension=f".{format}",
-                        filetypes=file_types,
-                        title="Save Export As"
-                    )
-                    
-                    if filename:  # User didn't cancel
-                        loading.update_text("Saving file...")
-                        with open(filename, 'w', encoding='utf-8') as f:
-                            f.write(export_data)
-                        messagebox.showinfo(
-                            "Export Complete",
-                            f"Results exported successfully to {filename}"
-                        )
-                finally:
-                    loading.hide()
-            
-            # Schedule the export process
-            self.master.after(100, process_export)
-                
-        except Exception as e:
-            loading.hide()
-            messagebox.showerror(
+        """Export results on a worker thread behind a loading indicator"""
+        from tkinter import filedialog
+        file_types = [('CSV files', '*.csv')] if format == 'csv' else [('JSON files', '*.json')]
+        filename = filedialog.asksaveasfilename(
+            defaultextension=f".{format}",
+            filetypes=file_types,
+            title="Save Export As"
+        )
+        if not filename:  # User cancelled
+            return
+
+        def export(task):
+            export_data = self.db_manager.export_trainee_results(self.trainee_id, format)
+            task.check()
+            task.report("Saving file...")
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(export_data)
+            return filename
+
+        self.task_runner.run(
+            export,
+            loading=LoadingIndicator(self.content_frame, "Preparing export..."),
+            on_done=lambda filename: messagebox.showinfo(
+                "Export Complete",
+                f"Results exported successfully to {filename}"
+            ),
+            on_error=lambda e: messagebox.showerror(
                 "Export Error",
                 f"Failed to export results: {str(e)}"
             )
+        )
 
     def show_progress(self):
         """Show detailed progress report with export options"""
         self.clear_content()
-        
+        self._load_view(self.db_manager.get_trainee_progress, self._render_progress, "progress")
+
+    def _render_progress(self, progress):
+        """Render the progress report for loaded trainee progress"""
         try:
-            # Get trainee progress
-            progress = self.db_manager.get_trainee_progress(self.trainee_id)
-            
             # Create container
             container = ctk.CTkFrame(
                 self.content_frame,
@@ -547,59 +596,50 @@ class TraineeDashboard:
             messagebox.showerror("Error", f"Failed to load progress: {str(e)}")
             
     def _export_progress(self):
-        """Handle exporting progress report with loading indicator"""
-        try:
-            # Create and show loading indicator
-            loading = LoadingIndicator(self.content_frame, "Preparing progress report...")
-            loading.show()
-            
-            def process_export():
-                try:
-                    # Get batch ID for the trainee
-                    self.db_manager.connect()
-                    self.db_manager.cursor.execute(
-                        "SELECT batch_id FROM trainees WHERE id = ?",
-                        (self.trainee_id,)
-                    )
-                    batch_id = self.db_manager.cursor.fetchone()[0]
-                    self.db_manager.close()
-                    
-                    if not batch_id:
-                        raise ValueError("Could not determine batch ID")
-                    
-                    loading.update_text("Generating report...")
-                    # Get export data
-                    export_data = self.db_manager.export_batch_report(batch_id)
-                    
-                    # Ask user where to save the file
-                    from tkinter import filedialog
-                    filename = filedialog.asksaveasfilename(
-                        defaultextension=".csv",
-                        filetypes=[('CSV files', '*.csv')],
-                        title="Save Progress Report As"
-                    )
-                    
-                    if filename:  # User didn't cancel
-                        loading.update_text("Saving report...")
-                        with open(filename, 'w', encoding='utf-8') as f:
-                            f.write(export_data)
-                        messagebox.showinfo(
-                            "Export Complete",
-                            f"Progress report exported successfully to {filename}"
-                        )
-                finally:
-                    loading.hide()
-            
-            # Schedule the export process
-            self.master.after(100, process_export)
-                
-        except Exception as e:
-            if 'loading' in locals():
-                loading.hide()
-            messagebox.showerror(
+        """Export the batch progress report on a worker thread"""
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[('CSV files', '*.csv')],
+            title="Save Progress Report As"
+        )
+        if not filename:  # User cancelled
+            return
+
+        def export(task):
+            # Get batch ID for the trainee
+            with self.db_manager.connection() as cursor:
+                cursor.execute(
+                    "SELECT batch_id FROM trainees WHERE id = ?",
+                    (self.trainee_id,)
+                )
+                batch_id = cursor.fetchone()[0]
+
+            if not batch_id:
+                raise ValueError("Could not determine batch ID")
+
+            task.check()
+            task.report("Generating report...")
+            export_data = self.db_manager.export_batch_report(batch_id)
+
+            task.check()
+            task.report("Saving report...")
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(export_data)
+            return filename
+
+        self.task_runner.run(
+            export,
+            loading=LoadingIndicator(self.content_frame, "Preparing progress report..."),
+            on_done=lambda filename: messagebox.showinfo(
+                "Export Complete",
+                f"Progress report exported successfully to {filename}"
+            ),
+            on_error=lambda e: messagebox.showerror(
                 "Export Error",
                 f"Failed to export progress report: {str(e)}"
             )
+        )
 
     def _create_progress_bar(self, parent, label, value):
         """Create a progress bar"""
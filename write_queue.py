@@ -0,0 +1,133 @@
+"""Group-commit write queue for bursts of small writes.
+
+Writes submitted from many threads are collected by a single writer thread
+and committed together in one transaction, so a burst of exam submissions
+takes the SQLite write lock once per group instead of once per submission.
+Each write runs inside its own savepoint, so one failing submission does not
+undo the rest of its group. Errors are reported to the writer through the
+Future of every write they affect.
+"""
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class GroupCommitQueue:
+    def __init__(self, db_manager, max_batch=32, max_delay=0.005):
+        """
+        Args:
+            db_manager: The DatabaseManager whose connection the writer uses
+            max_batch: Most writes committed in a single transaction
+            max_delay: Seconds to wait for more writes after the first arrives
+        """
+        self.db_manager = db_manager
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="db-group-commit",
+            daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, operation, *args):
+        """Queue operation(cursor, *args) and return a Future for its result
+
+        Once the writer has stopped, the Future fails straight away.
+        """
+        future = Future()
+        if not self._thread.is_alive():
+            future.set_exception(RuntimeError("Write queue is stopped"))
+            return future
+        self._queue.put((operation, args, future))
+        return future
+
+    def stop(self):
+        """Commit everything already queued, then stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        # Writes that raced the stop would otherwise wait forever
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item[2].set_running_or_notify_cancel():
+                item[2].set_exception(RuntimeError("Write queue is stopped"))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    timeout = deadline - time.monotonic()
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._commit_batch(batch)
+            except Exception as e:
+                # The writer must outlive any one group, or every later
+                # write would wait forever on its Future
+                self._fail(batch, e)
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, _, future in batch:
+            if future.running() or (not future.done() and future.set_running_or_notify_cancel()):
+                future.set_exception(error)
+
+    def _commit_batch(self, batch):
+        """Run a group of writes in one transaction and resolve their futures"""
+        outcomes = []
+        self.db_manager.connect()
+        conn = self.db_manager.conn
+        cursor = self.db_manager.cursor
+        try:
+            self.db_manager._begin(conn)
+            for operation, args, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cursor.execute("SAVEPOINT queued_write")
+                try:
+                    result = operation(cursor, *args)
+                    cursor.execute("RELEASE queued_write")
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO queued_write")
+                    cursor.execute("RELEASE queued_write")
+                    outcomes.append((future, None, e))
+            conn.commit()
+        except Exception as e:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass  # Nothing was started
+            self._fail(batch, e)
+            return
+        finally:
+            self.db_manager.close()
+
+        # Only report success once the group is durable
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)